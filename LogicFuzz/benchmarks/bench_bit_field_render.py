@@ -0,0 +1,139 @@
+#! /usr/bin/python
+"""Benchmark BitField rendering on the CODESYS message definitions of LogicFuzz-codesys-sessionConstruction.py.
+
+Defines the s_byte/s_word/s_dword-heavy CODESYS requests, renders every test case of every request and reports the
+time taken with the int.to_bytes/struct renderers and with the former bit string renderer.
+
+USAGE: bench_bit_field_render.py [repeat]
+"""
+
+import struct
+import sys
+import timeit
+
+from boofuzz import *
+from boofuzz.mutation_context import MutationContext
+from boofuzz.primitives import bit_field
+
+
+def define_codesys_requests():
+    """Define one request per CODESYS service, as in LogicFuzz-codesys-sessionConstruction.py, without sending."""
+    blocks.REQUESTS = {}
+    blocks.CURRENT = None
+    bodies = {
+        "rts_define_trace": lambda: (
+            s_byte(0x0),
+            s_byte(0x1),
+            [s_word(0x0, endian=BIG_ENDIAN) for _ in range(4)],
+            s_dword(0xFFFFFFFF, endian=BIG_ENDIAN),
+            s_dword(0x0, endian=BIG_ENDIAN),
+        ),
+        "rts_define_config": lambda: (
+            s_byte(0x0),
+            [s_byte(0x0, fuzzable=False) for _ in range(21)],
+            s_word(0x0),
+            [s_byte(value) for value in (0x43, 0x41, 0x4E, 0x0)],
+            [s_byte(0x0, fuzzable=False) for _ in range(8)],
+            s_word(0x0),
+        ),
+        "rts_file_read_start": lambda: (
+            s_word(0x0, endian=BIG_ENDIAN),
+            s_byte(0x2),
+            s_word(0x3100, endian=BIG_ENDIAN),
+        ),
+        "rts_write_var": lambda: (
+            s_static(b"\x20"),
+            s_dword(0x1, endian=BIG_ENDIAN, fuzzable=False),
+            [s_word(value, endian=BIG_ENDIAN) for value in (0x0, 0x0, 0x7D08, 0x0, 0x0)],
+            s_byte(0x1),
+        ),
+        "rts_step_out": lambda: (
+            s_static(b"\x0b"),
+            s_word(0x0001, endian=BIG_ENDIAN),
+            s_word(0x0000, endian=BIG_ENDIAN),
+            s_dword(0x0040FFFF, endian=BIG_ENDIAN),
+            s_word(0xFFFF, endian=BIG_ENDIAN),
+            s_dword(0x1ED800BF, endian=BIG_ENDIAN),
+        ),
+        "rts_monitoring": lambda: (
+            s_static(b"\x02"),
+            s_byte(0x0),
+            s_byte(0x0),
+            s_word(0x0),
+            s_word(0x0),
+            [s_dword(0x0) for _ in range(10)],
+        ),
+    }
+    requests = []
+    for name, body in bodies.items():
+        s_initialize(name)
+        with s_block("header"):
+            s_static(b"\xbb\xbb")
+            s_dword(0, endian=BIG_ENDIAN, fuzzable=False, name="length")
+        with s_block("command"):
+            body()
+        requests.append(s_get(name))
+    return requests
+
+
+def render_all(requests):
+    for request in requests:
+        request.render()
+        for mutations in request.get_mutations():
+            request.render(MutationContext(mutations=mutations))
+
+
+def encode_all(requests):
+    for request in requests:
+        for element in request.walk():
+            if isinstance(element, BitField):
+                for value in element.mutations(element.original_value()):
+                    element.encode(value, None)
+
+
+def _bit_string_renderer(output_format, bit_width, endian, signed):
+    """The former bit string rendering of BitField._render_int."""
+
+    def render(value):
+        if output_format == "binary":
+            bit_stream = "0" * (-bit_width % 8) + bit_field.int_to_binary_string(value, bit_width)
+            rendered = b""
+            for i in range(len(bit_stream) // 8):
+                rendered += struct.pack("B", bit_field.binary_string_to_int(bit_stream[8 * i : 8 * i + 8]))
+            return rendered[::-1] if endian == LITTLE_ENDIAN else rendered
+        if signed and bit_field.int_to_binary_string(value, bit_width)[0] == "1":
+            sign_bit = bit_field.binary_string_to_int("1" + "0" * (bit_width - 1))
+            return b"%d" % ~(sign_bit - (value & (sign_bit - 1)) - 1)
+        return b"%d" % value
+
+    return render
+
+
+def main(repeat):
+    requests = define_codesys_requests()
+    num_cases = sum(request.get_num_mutations() + 1 for request in requests)
+
+    def measure():
+        return (
+            min(timeit.repeat(lambda: render_all(define_codesys_requests()), number=1, repeat=repeat)),
+            min(timeit.repeat(lambda: encode_all(requests), number=1, repeat=repeat)),
+        )
+
+    fast = measure()
+    renderer = bit_field._get_renderer
+    bit_field._get_renderer = _bit_string_renderer
+    try:
+        slow = measure()
+    finally:
+        bit_field._get_renderer = renderer
+
+    print("{0} requests, {1} test cases".format(len(requests), num_cases))
+    print("{0:30}{1:>14}{2:>14}{3:>10}".format("", "bit string", "to_bytes", "speedup"))
+    for i, label in enumerate(("define and render all cases", "encode BitField mutations")):
+        print(
+            "{0:30}{1:11.1f} ms{2:11.1f} ms{3:9.1f}x".format(label, slow[i] * 1000, fast[i] * 1000, slow[i] / fast[i])
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -1,3 +1,4 @@
+from ..fuzzable import Fuzzable
 from ..fuzzable_block import FuzzableBlock
 
 
@@ -24,6 +25,15 @@ class Aligned(FuzzableBlock):
 
     def encode(self, value, mutation_context):
         child_data = self.get_child_data(mutation_context=mutation_context)
-        padding_length = self._modulus - (len(child_data) % self._modulus)
+        return child_data + self._padding(len(child_data))
+
+    def render_segments(self, mutation_context=None):
+        if type(self).render is not Fuzzable.render or type(self).encode is not Aligned.encode:
+            return [self.render(mutation_context=mutation_context)]
+        segments = self.get_child_segments(mutation_context=mutation_context)
+        return segments + [self._padding(sum(len(segment) for segment in segments))]
+
+    def _padding(self, child_data_length):
+        padding_length = self._modulus - (child_data_length % self._modulus)
         a, b = divmod(padding_length, len(self._pattern))
-        return child_data + self._pattern * a + self._pattern[:b]
+        return self._pattern * a + self._pattern[:b]
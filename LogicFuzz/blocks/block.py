@@ -1,3 +1,4 @@
+from ..fuzzable import Fuzzable
 from ..fuzzable_block import FuzzableBlock
 from typing import List
 
@@ -115,6 +116,13 @@ class Block(FuzzableBlock):
                 return False
         return True
 
+    def render_segments(self, mutation_context=None):
+        if self.encoder or type(self).render is not Fuzzable.render or type(self).encode is not Block.encode:
+            return [self.render(mutation_context=mutation_context)]
+        if not self._do_dependencies_allow_render(mutation_context=mutation_context):
+            return []
+        return self.get_child_segments(mutation_context=mutation_context)
+
     def encode(self, value, mutation_context):
         if self._do_dependencies_allow_render(mutation_context=mutation_context):
             child_data = super(Block, self).get_child_data(mutation_context=mutation_context)
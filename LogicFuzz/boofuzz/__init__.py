@@ -28,7 +28,9 @@ from .exception import BoofuzzFailure, MustImplementException, SizerNotUtilizedE
 from .fuzz_logger import FuzzLogger
 from .fuzz_logger_csv import FuzzLoggerCsv
 from .fuzz_logger_curses import FuzzLoggerCurses
+from .fuzz_logger_queue import FuzzLoggerQueue
 from .fuzz_logger_text import FuzzLoggerText
+from .fuzz_logger_trace import FuzzLoggerTrace
 from .fuzzable import Fuzzable
 from .fuzzable_block import FuzzableBlock
 from .ifuzz_logger import IFuzzLogger
@@ -57,6 +59,7 @@ from .repeater import CountRepeater, Repeater, TimeRepeater
 from .sessions import open_test_run, Session, Target
 from .protocol_session import ProtocolSession
 from .protocol_session_reference import ProtocolSessionReference
+from .render_cache import get_render_cache, RenderCache
 
 # workaround to make Tornado work in Python 3.8
 # https://github.com/tornadoweb/tornado/issues/2608
@@ -94,7 +97,9 @@ __all__ = [
     "FuzzLogger",
     "FuzzLoggerCsv",
     "FuzzLoggerCurses",
+    "FuzzLoggerQueue",
     "FuzzLoggerText",
+    "FuzzLoggerTrace",
     "Group",
     "IFuzzLogger",
     "IFuzzLoggerBackend",
@@ -117,6 +122,7 @@ __all__ = [
     "RandomData",
     "RawL2SocketConnection",
     "RawL3SocketConnection",
+    "RenderCache",
     "Repeat",
     "Repeater",
     "Request",
@@ -555,6 +561,7 @@ def s_update(name, value):
         raise exception.SullyRuntimeError("NO OBJECT WITH NAME '%s' FOUND IN CURRENT REQUEST" % name)
 
     blocks.CURRENT.names[name]._default_value = value
+    get_render_cache(blocks.CURRENT).invalidate()
 
 
 # PRIMITIVES
@@ -181,12 +181,18 @@ def fuzz(
     type=str,
     default="localhost",
 )
+@click.option(
+    "--pool-size",
+    help="Serve requests on this many threads, each reading the database through a read-only connection",
+    type=int,
+    default=None,
+)
 @click.argument("filename")
-def open_file(debug, filename, ui_port, ui_addr):
+def open_file(debug, filename, ui_port, ui_addr, pool_size):
     if debug:
         logging.basicConfig(level=logging.DEBUG)
 
-    sessions.open_test_run(db_filename=filename, port=ui_port, address=ui_addr)
+    sessions.open_test_run(db_filename=filename, port=ui_port, address=ui_addr, pool_size=pool_size)
 
     print("Serving web page at http://{0}:{1}. Hit Ctrl+C to quit.".format(ui_addr, ui_port))
     while True:
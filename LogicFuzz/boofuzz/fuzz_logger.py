@@ -1,5 +1,6 @@
 from typing import Union  # noqa: F401
 
+from .fuzz_logger_queue import FuzzLoggerQueue
 from .ifuzz_logger import IFuzzLogger
 
 
@@ -12,11 +13,25 @@ class FuzzLogger(IFuzzLogger):
     Args:
         fuzz_loggers (:obj:`list` of :obj:`IFuzzLogger`): IFuzzLogger objects
                                                           to which to send log data.
+        threaded (bool): Give each logger its own queue and worker thread (see FuzzLoggerQueue), so logging only
+                         costs an enqueue per logger. Loggers that already are a FuzzLoggerQueue keep their own
+                         settings. Default False.
+        queue_size (int): Maximum number of queued events per logger if threaded. Default 10000.
+        overflow (str): What to do when a queue is full if threaded, "block" or "drop". Default "block".
     """
 
-    def __init__(self, fuzz_loggers=None):
+    def __init__(self, fuzz_loggers=None, threaded=False, queue_size=10000, overflow="block"):
         if fuzz_loggers is None:
             fuzz_loggers = []
+        if threaded:
+            fuzz_loggers = [
+                (
+                    fuzz_logger
+                    if isinstance(fuzz_logger, FuzzLoggerQueue)
+                    else FuzzLoggerQueue(fuzz_logger, queue_size=queue_size, overflow=overflow)
+                )
+                for fuzz_logger in fuzz_loggers
+            ]
         self._fuzz_loggers = fuzz_loggers
 
         self._cur_test_case_id = ""  # type: Union[int, str]
@@ -26,6 +41,15 @@ class FuzzLogger(IFuzzLogger):
         self._last_passed_id = ""  # helps avoid duplicates
         self.test_case_count = 0
 
+    @property
+    def queue_stats(self):
+        """Counters of the loggers with a queue, see FuzzLoggerQueue.stats.
+
+        Returns:
+            list of dict: One entry per queued logger, in logger order.
+        """
+        return [fuzz_logger.stats for fuzz_logger in self._fuzz_loggers if isinstance(fuzz_logger, FuzzLoggerQueue)]
+
     @property
     def most_recent_test_id(self):
         """Return a value (e.g. string) representing the most recent test case."""
@@ -0,0 +1,64 @@
+import threading
+
+from . import ifuzz_logger_backend
+
+
+class FuzzLoggerBuffer(ifuzz_logger_backend.IFuzzLoggerBackend):
+    """
+    Records log events and forwards them to another logger one whole test case at a time.
+
+    Used by Session when several targets are fuzzed in parallel: each worker thread logs into its own buffer, so the
+    test cases of different workers do not interleave in the shared loggers.
+
+    Args:
+        fuzz_logger (ifuzz_logger.IFuzzLogger): Logger to forward the buffered events to.
+        lock (threading.Lock): Lock shared by all buffers that forward to the same logger. Default: a new lock.
+    """
+
+    def __init__(self, fuzz_logger, lock=None):
+        self._fuzz_logger = fuzz_logger
+        self._lock = lock if lock is not None else threading.Lock()
+        self._events = []
+
+    def open_test_case(self, test_case_id, name, index, *args, **kwargs):
+        self._events.append(("open_test_case", (test_case_id, name, index) + args, kwargs))
+
+    def open_test_step(self, description):
+        self._events.append(("open_test_step", (description,), {}))
+
+    def log_send(self, data):
+        self._events.append(("log_send", (data,), {}))
+
+    def log_recv(self, data):
+        self._events.append(("log_recv", (data,), {}))
+
+    def log_check(self, description):
+        self._events.append(("log_check", (description,), {}))
+
+    def log_pass(self, description=""):
+        self._events.append(("log_pass", (description,), {}))
+
+    def log_fail(self, description=""):
+        self._events.append(("log_fail", (description,), {}))
+
+    def log_info(self, description):
+        self._events.append(("log_info", (description,), {}))
+
+    def log_error(self, description):
+        self._events.append(("log_error", (description,), {}))
+
+    def close_test_case(self):
+        self._events.append(("close_test_case", (), {}))
+        self.flush()
+
+    def close_test(self):
+        self.flush()
+
+    def flush(self):
+        """Forward all buffered events to the wrapped logger."""
+        events, self._events = self._events, []
+        if not events:
+            return
+        with self._lock:
+            for method, args, kwargs in events:
+                getattr(self._fuzz_logger, method)(*args, **kwargs)
@@ -1,6 +1,9 @@
 import csv
 import datetime
+import io
+import logging
 import sys
+import time
 
 from . import helpers, ifuzz_logger_backend
 
@@ -31,49 +34,95 @@ class FuzzLoggerCsv(ifuzz_logger_backend.IFuzzLoggerBackend):
     configured to output to a named file.
     """
 
-    def __init__(self, file_handle=sys.stdout, bytes_to_str=DEFAULT_HEX_TO_STR):
+    def __init__(
+        self,
+        file_handle=sys.stdout,
+        bytes_to_str=DEFAULT_HEX_TO_STR,
+        log_level=logging.DEBUG,
+        max_data_bytes=None,
+        flush_interval=None,
+    ):
         """
         Args:
             file_handle (io.BinaryIO): Open file handle for logging. Defaults to sys.stdout.
             bytes_to_str (function): Function that converts sent/received bytes data to string for logging.
+            log_level (int): Minimum level of logged rows, using the levels of the logging module. Sent and received
+                data is logged at DEBUG, failures and errors at ERROR, everything else at INFO. Rows below the level
+                are not formatted at all. Defaults to logging.DEBUG.
+            max_data_bytes (int): Render at most this many bytes of sent and received data. The length column still
+                holds the full length. Defaults to None (all).
+            flush_interval (float): Collect rows and write them at most every flush_interval seconds, and on
+                close_test. Rows at ERROR and above, i.e. failures and errors, are written right away along with the
+                collected ones. Defaults to None, which writes every row right away.
         """
         self._file_handle = file_handle
         self._format_raw_bytes = bytes_to_str
-        self._csv_handle = csv.writer(self._file_handle)
+        self._log_level = log_level
+        self._max_data_bytes = max_data_bytes
+        self._flush_interval = flush_interval
+        self._last_flush = time.time()
+        if flush_interval is None:
+            self._buffer = None
+            self._csv_handle = csv.writer(self._file_handle)
+        else:
+            self._buffer = io.StringIO()
+            self._csv_handle = csv.writer(self._buffer)
 
     def open_test_step(self, description):
-        self._print_log_msg(["open step", "", "", description])
+        self._print_log_msg("step", ["open step", "", "", description])
 
     def log_check(self, description):
-        self._print_log_msg(["check", "", "", description])
+        self._print_log_msg("check", ["check", "", "", description])
 
     def log_error(self, description):
-        self._print_log_msg(["error", "", "", description])
+        self._print_log_msg("error", ["error", "", "", description])
 
     def log_recv(self, data):
-        self._print_log_msg(["recv", len(data), self._format_raw_bytes(data), repr(data)])
+        self._print_data_msg("receive", "recv", data)
 
     def log_send(self, data):
-        self._print_log_msg(["send", len(data), self._format_raw_bytes(data), repr(data)])
+        self._print_data_msg("send", "send", data)
 
     def log_info(self, description):
-        self._print_log_msg(["info", "", "", description])
+        self._print_log_msg("info", ["info", "", "", description])
 
     def open_test_case(self, test_case_id, name, index, *args, **kwargs):
-        self._print_log_msg(["open test case", "", "", "Test case " + str(test_case_id)])
+        self._print_log_msg("test_case", ["open test case", "", "", "Test case " + str(test_case_id)])
 
     def log_fail(self, description=""):
-        self._print_log_msg(["fail", "", "", description])
+        self._print_log_msg("fail", ["fail", "", "", description])
 
     def log_pass(self, description=""):
-        self._print_log_msg(["pass", "", "", description])
+        self._print_log_msg("pass", ["pass", "", "", description])
 
     def close_test_case(self):
         pass
 
     def close_test(self):
-        pass
-
-    def _print_log_msg(self, msg):
+        self.flush()
+
+    def flush(self):
+        """Write the collected rows."""
+        if self._buffer is not None and self._buffer.tell() > 0:
+            self._file_handle.write(self._buffer.getvalue())
+            self._buffer.seek(0)
+            self._buffer.truncate()
+        self._file_handle.flush()
+        self._last_flush = time.time()
+
+    def _print_data_msg(self, msg_type, name, data):
+        if helpers.test_step_info[msg_type]["level"] < self._log_level:
+            return
+        rendered = data[: self._max_data_bytes]
+        self._print_log_msg(msg_type, [name, len(data), self._format_raw_bytes(rendered), repr(rendered)])
+
+    def _print_log_msg(self, msg_type, msg):
+        level = helpers.test_step_info[msg_type]["level"]
+        if level < self._log_level:
+            return
         time_stamp = get_time_stamp()
         self._csv_handle.writerow([time_stamp] + msg)
+        if self._buffer is not None and (
+            level >= logging.ERROR or time.time() - self._last_flush >= self._flush_interval
+        ):
+            self.flush()
@@ -1,4 +1,5 @@
 import atexit
+import collections
 import sys
 import time
 import warnings
@@ -33,6 +34,72 @@ STATUS_PAUSED = 1
 STATUS_DONE = 2
 
 
+class _LogState:
+    """
+    Log events and counters as recorded by the logging calls of FuzzLoggerCurses, for the draw thread to read.
+
+    Only the fuzzing thread writes. Events are stored unformatted in ring buffers of the last max_lines events; deque
+    appends and attribute assignments are atomic, so neither side takes a lock. The event counters tell the draw thread
+    whether a window has to be redrawn.
+    """
+
+    def __init__(self, max_lines):
+        self.max_lines = max_lines
+        self.case_events = collections.deque(maxlen=max_lines)  # (msg_type, timestamp, description, data)
+        self.fail_events = collections.deque(maxlen=max_lines)  # (test case index, description, color pair)
+        self.num_case_events = 0
+        self.num_fail_events = 0
+
+        self.total_index = 0
+        self.total_num_mutations = 0
+        self.current_name = ""
+        self.current_index = 0
+        self.current_num_mutations = 0
+        self.num_closed_cases = 0
+
+    def open_test_case(self, test_case_id):
+        # a new deque instead of clear(), so a snapshot never mixes two test cases
+        self.case_events = collections.deque(maxlen=self.max_lines)
+        self.add("test_case", description=test_case_id)
+
+    def add(self, msg_type, description=None, data=None):
+        self.case_events.append((msg_type, time.time(), description, data))
+        self.num_case_events += 1
+
+    def add_failure(self, description, color):
+        self.fail_events.append((self.total_index, description, color))
+        self.num_fail_events += 1
+
+    @property
+    def status(self):
+        return self.current_index, self.current_num_mutations, self.total_index, self.total_num_mutations
+
+
+def _format_case_events(events, max_data_bytes):
+    """Format test case log events as [line, color pair] for _render_pad."""
+    return [
+        helpers.format_log_msg(
+            msg_type=msg_type,
+            description=description,
+            data=data,
+            timestamp=helpers.get_time_stamp(timestamp),
+            format_type="curses",
+            max_data_bytes=max_data_bytes,
+        )
+        for msg_type, timestamp, description, data in events
+    ]
+
+
+def _format_failures(events, indent_size):
+    """Format failure events as [line, color pair] for _render_pad."""
+    lines = []
+    for index, description, color in events:
+        # TODO: Why do some fail messages have a trailing whitespace?
+        fail_msg = "#" + str(index) + (4 * indent_size + 1 - len(str(index))) * " " + description.strip()
+        lines.append([fail_msg.replace("\n", " "), color])
+    return lines
+
+
 class FuzzLoggerCurses(ifuzz_logger_backend.IFuzzLoggerBackend):
     """
     This class formats FuzzLogger data for a console GUI using curses. This hasn't been tested on Windows.
@@ -51,6 +118,8 @@ class FuzzLoggerCurses(ifuzz_logger_backend.IFuzzLoggerBackend):
         wait_on_quit=True,
         min_refresh_rate=1000,
         bytes_to_str=helpers.hex_to_hexstr,
+        frame_rate=10,
+        max_data_bytes=1024,
     ):
         """
         :type web_port: int
@@ -67,8 +136,8 @@ class FuzzLoggerCurses(ifuzz_logger_backend.IFuzzLoggerBackend):
                             there are too many lines to display all of them. Default True
 
         :type max_log_lines: int
-        :param max_log_lines: Maximum log lines to keep in the internal storage. Additional lines exceeding this limit
-                              will not be displayed. Default 500
+        :param max_log_lines: Maximum log lines to keep in the internal storage. Only the last max_log_lines events of
+                              the current test case and the last max_log_lines failures are kept. Default 500
 
         :type wait_on_quit: bool
         :param wait_on_quit: Whether to keep the GUI open and wait for user-input when the main thread is about to exit.
@@ -80,6 +149,13 @@ class FuzzLoggerCurses(ifuzz_logger_backend.IFuzzLoggerBackend):
 
         :type bytes_to_str: function
         :param bytes_to_str: Function that converts sent/received bytes data to string for logging.
+
+        :type frame_rate: float
+        :param frame_rate: Number of times per second the screen is updated from the logged events. Logging calls only
+                           record events; all formatting happens when drawing. Default 10
+
+        :type max_data_bytes: int
+        :param max_data_bytes: Render at most this many bytes of sent and received data. Default 1024
         """
 
         self._title = "boofuzz"
@@ -87,23 +163,14 @@ class FuzzLoggerCurses(ifuzz_logger_backend.IFuzzLoggerBackend):
         self._web_address = web_address
         self._max_log_lines = max_log_lines
         self._auto_scroll = auto_scroll
-        self._current_data = None
-        self._log_storage = []
-        self._fail_storage = []
+        self._state = _LogState(max_log_lines)
+        self._max_data_bytes = max_data_bytes
+        self._frame_interval = 1.0 / frame_rate
         self._wait_on_quit = wait_on_quit
         self._quit = False
         self._status = STATUS_RUNNING
         self._refresh_interval = min_refresh_rate
         self._event_resize = True
-        self._event_log = False
-        self._event_case_close = False
-        self._event_crash = False
-
-        self._total_index = 0
-        self._total_num_mutations = 0
-        self._current_name = ""
-        self._current_index = 0
-        self._current_num_mutations = 0
 
         self._format_raw_bytes = bytes_to_str
         self._version = helpers.get_boofuzz_version()
@@ -152,76 +219,45 @@ class FuzzLoggerCurses(ifuzz_logger_backend.IFuzzLoggerBackend):
         self._std_buffer.close()
 
     def open_test_case(self, test_case_id, name, index, *args, **kwargs):
-        self._log_storage = []
-        self._current_name = name
-        self._total_index = index
+        state = self._state
+        state.current_name = name
+        state.total_index = index
         if "current_index" in kwargs:
-            self._current_index = kwargs["current_index"]
+            state.current_index = kwargs["current_index"]
         if "current_num_mutations" in kwargs:
-            self._current_num_mutations = kwargs["current_num_mutations"]
+            state.current_num_mutations = kwargs["current_num_mutations"]
         if "num_mutations" in kwargs:
-            self._total_num_mutations = kwargs["num_mutations"]
-
-        self._log_storage.append(
-            helpers.format_log_msg(msg_type="test_case", description=test_case_id, format_type="curses")
-        )
-        self._event_log = True
+            state.total_num_mutations = kwargs["num_mutations"]
+        state.open_test_case(test_case_id)
 
     def open_test_step(self, description):
-        self._log_storage.append(helpers.format_log_msg(msg_type="step", description=description, format_type="curses"))
-        self._event_log = True
+        self._state.add("step", description=description)
 
     def log_info(self, description):
-        self._log_storage.append(helpers.format_log_msg(msg_type="info", description=description, format_type="curses"))
-        self._event_log = True
+        self._state.add("info", description=description)
 
     def log_check(self, description):
-        self._log_storage.append(
-            helpers.format_log_msg(msg_type="check", description=description, format_type="curses")
-        )
-        self._event_log = True
+        self._state.add("check", description=description)
 
     def log_pass(self, description=""):
-        self._log_storage.append(helpers.format_log_msg(msg_type="pass", description=description, format_type="curses"))
-        self._event_log = True
+        self._state.add("pass", description=description)
 
-    def log_fail(self, description="", indent_size=INDENT_SIZE):
-        # TODO: Why do some fail messages have a trailing whitespace?
-        fail_msg = (
-            "#"
-            + str(self._total_index)
-            + (4 * indent_size + 1 - len(str(self._total_index))) * " "
-            + description.strip()
-        )
-        self._fail_storage.append([fail_msg.replace("\n", " "), COLOR_PAIR_WHITE])
-        self._log_storage.append(helpers.format_log_msg(msg_type="fail", description=description, format_type="curses"))
-        self._event_crash = True
-        self._event_log = True
-
-    def log_error(self, description="", indent_size=INDENT_SIZE):
-        fail_msg = (
-            "#"
-            + str(self._total_index)
-            + (4 * indent_size + 1 - len(str(self._total_index))) * " "
-            + description.strip()
-        )
-        self._fail_storage.append([fail_msg.replace("\n", " "), COLOR_PAIR_RED])
-        self._log_storage.append(
-            helpers.format_log_msg(msg_type="error", description=description, format_type="curses")
-        )
-        self._event_crash = True
-        self._event_log = True
+    def log_fail(self, description=""):
+        self._state.add_failure(description, COLOR_PAIR_WHITE)
+        self._state.add("fail", description=description)
+
+    def log_error(self, description=""):
+        self._state.add_failure(description, COLOR_PAIR_RED)
+        self._state.add("error", description=description)
 
     def log_recv(self, data):
-        self._log_storage.append(helpers.format_log_msg(msg_type="receive", data=data, format_type="curses"))
-        self._event_log = True
+        self._state.add("receive", data=data)
 
     def log_send(self, data):
-        self._log_storage.append(helpers.format_log_msg(msg_type="send", data=data, format_type="curses"))
-        self._event_log = True
+        self._state.add("send", data=data)
 
     def close_test_case(self):
-        self._event_case_close = True
+        self._state.num_closed_cases += 1
 
     def close_test(self):
         self._status = STATUS_DONE
@@ -305,7 +341,7 @@ class FuzzLoggerCurses(ifuzz_logger_backend.IFuzzLoggerBackend):
         total_indent_size = indent_size * 2 + 1 + 25
 
         _render_pad(
-            lines=self._log_storage[: self._max_log_lines],
+            lines=_format_case_events(list(self._state.case_events), self._max_data_bytes),
             pad=self._casescr,
             y_min=2,
             x_min=1,
@@ -321,7 +357,7 @@ class FuzzLoggerCurses(ifuzz_logger_backend.IFuzzLoggerBackend):
         total_indent_size = indent_size * 5
 
         _render_pad(
-            lines=self._fail_storage[: self._max_log_lines],
+            lines=_format_failures(list(self._state.fail_events), indent_size),
             pad=self._crashescr,
             y_min=self._height - 16,
             x_min=1,
@@ -340,12 +376,13 @@ class FuzzLoggerCurses(ifuzz_logger_backend.IFuzzLoggerBackend):
         self._statscr.addstr(1, self._indent_size, "{}:{}".format(self._web_address, self._web_port))
         self._statscr.addstr(2, 1, "Case:")
         # fmt: off
-        self._statscr.addstr(2, self._indent_size, _progess_bar(self._current_index,
-                                                                self._current_num_mutations,
+        current_index, current_num_mutations, total_index, total_num_mutations = self._state.status
+        self._statscr.addstr(2, self._indent_size, _progess_bar(current_index,
+                                                                current_num_mutations,
                                                                 self._width - self._indent_size))
         self._statscr.addstr(3, 1, "Total:")
-        self._statscr.addstr(3, self._indent_size, _progess_bar(self._total_index,
-                                                                self._total_num_mutations,
+        self._statscr.addstr(3, self._indent_size, _progess_bar(total_index,
+                                                                total_num_mutations,
                                                                 self._width - self._indent_size))
         # fmt: on
         # TODO: Get paused flag from sessions
@@ -366,6 +403,7 @@ class FuzzLoggerCurses(ifuzz_logger_backend.IFuzzLoggerBackend):
         ms_since_refresh = 0
         key = 0
         wait_for_key = False
+        drawn_case_events = drawn_fail_events = drawn_closed_cases = None
         try:
             while not ((key == ord("q") or not self._wait_on_quit) and self._quit):
                 try:
@@ -379,23 +417,24 @@ class FuzzLoggerCurses(ifuzz_logger_backend.IFuzzLoggerBackend):
                         wait_for_key = True
 
                     if self._min_size_ok:
-                        if self._event_log:
+                        # redraw from a snapshot of whatever was logged since the last frame
+                        if self._state.num_case_events != drawn_case_events:
+                            drawn_case_events = self._state.num_case_events
                             self._draw_case()
-                            self._event_log = False
 
-                        if self._event_crash:
+                        if self._state.num_fail_events != drawn_fail_events:
+                            drawn_fail_events = self._state.num_fail_events
                             self._draw_crash()
-                            self._event_crash = False
 
-                        if self._event_case_close:
+                        if self._state.num_closed_cases != drawn_closed_cases:
+                            drawn_closed_cases = self._state.num_closed_cases
                             self._draw_stat()
-                            self._event_case_close = False
 
                     key = self._stdscr.getch()
                     curses.flushinp()
 
-                    time.sleep(0.1)
-                    ms_since_refresh += 100
+                    time.sleep(self._frame_interval)
+                    ms_since_refresh += self._frame_interval * 1000
                     error_counter = 0
                 except curses.error:
                     error_counter += 1
@@ -1,10 +1,23 @@
 import collections
+import contextlib
 import datetime
+import hashlib
+import os
+import queue
 import sqlite3
 import sys
+import threading
+import time
+import urllib.request
+import zlib
 
 from . import data_test_case, data_test_step, exception, helpers, ifuzz_logger_backend
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 # fixup for buffer in python 3
 if sys.version_info.major > 2:
     buffer = memoryview
@@ -24,6 +37,345 @@ def hex_to_hexstr(input_bytes):
 
 DEFAULT_HEX_TO_STR = hex_to_hexstr
 
+# Version of the database schema, stored in PRAGMA user_version. Databases without a version (0) have the unindexed
+# cases and steps tables of boofuzz 0.4.2 and earlier. Version 1 stored the step data in test_steps, version 2 had no
+# run_statistics table, version 3 no failures table.
+SCHEMA_VERSION = 4
+
+# Step types, stored as ids into the step_types table.
+STEP_TYPES = ("step", "check", "error", "receive", "send", "info", "fail", "pass")
+
+# Blob compression methods, stored in blobs.compression.
+BLOB_COMPRESSIONS = (None, "zlib", "zstd")
+
+# Counts of all test cases of the run, including the ones that were not stored.
+_RUN_STATISTICS = """
+CREATE TABLE run_statistics (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    num_cases INTEGER NOT NULL,
+    num_dropped_cases INTEGER NOT NULL,
+    num_failed_cases INTEGER NOT NULL
+);
+INSERT INTO run_statistics VALUES (1, 0, 0, 0);
+"""
+
+# One row per failed test case, for filtering and paginating failures without reading all steps. node is the
+# request that was fuzzed and element the qualified name of its (first) mutated element.
+_FAILURES = """
+CREATE TABLE failures (
+    id INTEGER PRIMARY KEY,
+    test_case_index INTEGER NOT NULL,
+    node TEXT,
+    element TEXT,
+    synopsis TEXT NOT NULL,
+    synopsis_hash TEXT NOT NULL,
+    timestamp TEXT
+);
+CREATE INDEX failures_test_case_index ON failures (test_case_index);
+CREATE INDEX failures_node ON failures (node, test_case_index);
+CREATE INDEX failures_element ON failures (element, test_case_index);
+CREATE INDEX failures_synopsis_hash ON failures (synopsis_hash, test_case_index);
+CREATE INDEX failures_timestamp ON failures (timestamp, test_case_index);
+"""
+
+_SCHEMA = """
+CREATE TABLE step_types (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE, num_steps INTEGER NOT NULL DEFAULT 0);
+CREATE TABLE test_cases (id INTEGER PRIMARY KEY, name TEXT, number INTEGER, timestamp TEXT);
+CREATE TABLE blobs (id INTEGER PRIMARY KEY, hash BLOB NOT NULL UNIQUE, compression INTEGER NOT NULL, data BLOB);
+CREATE TABLE test_steps (
+    id INTEGER PRIMARY KEY,
+    test_case_index INTEGER,
+    type_id INTEGER REFERENCES step_types(id),
+    description TEXT,
+    blob_id INTEGER REFERENCES blobs(id),
+    timestamp TEXT,
+    is_truncated BOOLEAN
+);
+CREATE INDEX test_cases_number ON test_cases (number);
+CREATE INDEX test_steps_test_case_index ON test_steps (test_case_index);
+CREATE INDEX test_steps_type ON test_steps (type_id, test_case_index);
+
+CREATE TABLE summary (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    num_cases INTEGER NOT NULL,
+    num_steps INTEGER NOT NULL,
+    last_case_number INTEGER
+);
+INSERT INTO summary VALUES (1, 0, 0, NULL);
+CREATE TRIGGER test_cases_summary AFTER INSERT ON test_cases BEGIN
+    UPDATE summary SET num_cases = num_cases + 1,
+        last_case_number = max(coalesce(last_case_number, NEW.number), NEW.number);
+END;
+CREATE TRIGGER test_steps_summary AFTER INSERT ON test_steps BEGIN
+    UPDATE summary SET num_steps = num_steps + 1;
+    UPDATE step_types SET num_steps = num_steps + 1 WHERE id = NEW.type_id;
+END;
+
+-- the tables of schema version 0, for existing queries. data is compressed if data_compression is not 0.
+CREATE VIEW cases AS SELECT name, number, timestamp FROM test_cases;
+CREATE VIEW steps AS
+    SELECT test_case_index, step_types.name AS type, description, coalesce(blobs.data, X'') AS data, timestamp,
+        is_truncated, coalesce(blobs.compression, 0) AS data_compression
+    FROM test_steps JOIN step_types ON test_steps.type_id = step_types.id
+        LEFT JOIN blobs ON test_steps.blob_id = blobs.id;
+"""
+_SCHEMA += _RUN_STATISTICS + _FAILURES
+
+# Tables of older schema versions, renamed to "legacy_<name>" before migrating, the views, triggers and indexes to
+# drop before creating the current schema, and the statements copying the rows into the current schema.
+_LEGACY_TABLES = {0: ("cases", "steps"), 1: ("step_types", "test_cases", "test_steps", "summary")}
+_LEGACY_DROPS = {
+    0: "",
+    1: """
+DROP VIEW IF EXISTS cases;
+DROP VIEW IF EXISTS steps;
+DROP TRIGGER IF EXISTS test_cases_summary;
+DROP TRIGGER IF EXISTS test_steps_summary;
+DROP INDEX IF EXISTS test_cases_number;
+DROP INDEX IF EXISTS test_steps_test_case_index;
+DROP INDEX IF EXISTS test_steps_type;
+""",
+}
+_MIGRATIONS = {
+    0: """
+INSERT OR IGNORE INTO step_types (name) SELECT DISTINCT type FROM legacy_steps WHERE type IS NOT NULL;
+INSERT INTO test_cases (name, number, timestamp) SELECT name, number, timestamp FROM legacy_cases ORDER BY rowid;
+INSERT OR IGNORE INTO blobs (hash, compression, data)
+    SELECT boofuzz_blob_hash(data), 0, data FROM legacy_steps WHERE length(data) > 0;
+INSERT INTO test_steps (test_case_index, type_id, description, blob_id, timestamp, is_truncated)
+    SELECT test_case_index, step_types.id, description, blobs.id, timestamp, is_truncated
+    FROM legacy_steps LEFT JOIN step_types ON legacy_steps.type = step_types.name
+        LEFT JOIN blobs ON blobs.hash = boofuzz_blob_hash(legacy_steps.data)
+    ORDER BY legacy_steps.rowid;
+""",
+    1: """
+INSERT OR IGNORE INTO step_types (id, name) SELECT id, name FROM legacy_step_types;
+INSERT INTO test_cases (id, name, number, timestamp) SELECT id, name, number, timestamp FROM legacy_test_cases;
+INSERT OR IGNORE INTO blobs (hash, compression, data)
+    SELECT boofuzz_blob_hash(data), 0, data FROM legacy_test_steps WHERE length(data) > 0;
+INSERT INTO test_steps (id, test_case_index, type_id, description, blob_id, timestamp, is_truncated)
+    SELECT legacy_test_steps.id, test_case_index, type_id, description, blobs.id, timestamp, is_truncated
+    FROM legacy_test_steps LEFT JOIN blobs ON blobs.hash = boofuzz_blob_hash(legacy_test_steps.data);
+""",
+}
+
+# Statements upgrading a database of a schema version to the next one in place.
+_UPGRADES = {2: _RUN_STATISTICS, 3: _FAILURES}
+
+# Initial run statistics of a migrated or upgraded database, which only knows the stored test cases.
+_RUN_STATISTICS_FROM_STORED_CASES = """
+UPDATE run_statistics SET num_cases = (SELECT num_cases FROM summary),
+    num_failed_cases = (SELECT count(DISTINCT test_case_index) FROM test_steps
+        WHERE type_id IN (SELECT id FROM step_types WHERE name IN ('fail', 'error')));
+"""
+
+# Initial failures of a migrated or upgraded database.
+_FAILURES_FROM_STORED_CASES = """
+INSERT INTO failures (test_case_index, node, element, synopsis, synopsis_hash, timestamp)
+    SELECT failed.test_case_index, boofuzz_test_case_node(test_cases.name), boofuzz_test_case_element(test_cases.name),
+        failed.synopsis, boofuzz_synopsis_hash(failed.synopsis), test_cases.timestamp
+    FROM (
+        SELECT test_case_index, group_concat(description, char(10)) AS synopsis
+        FROM (SELECT test_case_index, description FROM test_steps
+            WHERE type_id = (SELECT id FROM step_types WHERE name = 'fail') ORDER BY id)
+        GROUP BY test_case_index
+    ) AS failed LEFT JOIN test_cases ON test_cases.id = (
+        SELECT max(id) FROM test_cases WHERE number = failed.test_case_index
+    )
+    ORDER BY failed.test_case_index;
+"""
+
+# Statements filling the tables added in a schema version, for databases migrated or upgraded from an older version.
+_ROWS_FROM_STORED_CASES = {3: _RUN_STATISTICS_FROM_STORED_CASES, 4: _FAILURES_FROM_STORED_CASES}
+
+_INSERT_CASE = "INSERT INTO test_cases (name, number, timestamp) VALUES (?, ?, ?);"
+_INSERT_STEP = (
+    "INSERT INTO test_steps (test_case_index, type_id, description, blob_id, timestamp, is_truncated)"
+    " VALUES (?, (SELECT id FROM step_types WHERE name = ?), ?, (SELECT id FROM blobs WHERE hash = ?), ?, ?);"
+)
+_INSERT_BLOB = "INSERT OR IGNORE INTO blobs (hash, compression, data) VALUES (?, ?, ?);"
+_INSERT_FAILURE = (
+    "INSERT INTO failures (test_case_index, node, element, synopsis, synopsis_hash, timestamp)"
+    " VALUES (?, ?, ?, ?, ?, ?);"
+)
+_SELECT_FAILURES = (
+    "SELECT test_case_index, node, element, synopsis, synopsis_hash, timestamp FROM failures"
+    " WHERE test_case_index > ?{0} ORDER BY test_case_index LIMIT ?;"
+)
+_SELECT_FAILURE_SYNOPSES = (
+    "SELECT synopsis_hash, min(synopsis), count(*), min(test_case_index) FROM failures{0}"
+    " GROUP BY synopsis_hash ORDER BY count(*) DESC, synopsis_hash;"
+)
+_UPDATE_RUN_STATISTICS = (
+    "UPDATE run_statistics SET num_cases = num_cases + ?, num_dropped_cases = num_dropped_cases + ?,"
+    " num_failed_cases = num_failed_cases + ?;"
+)
+
+
+def blob_hash(data):
+    """
+    Content address of step data in the blobs table.
+
+    :param data: Step data.
+
+    :return: Hash of data, or None if data is empty.
+    """
+    if not data:
+        return None
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def synopsis_hash(synopsis):
+    """
+    Hash of a failure synopsis, grouping the test cases that failed with the same descriptions.
+
+    :param synopsis: Failure descriptions of a test case, joined by newlines.
+
+    :return: Hex string.
+    """
+    return hashlib.blake2b(synopsis.encode("utf-8", "replace"), digest_size=8).hexdigest()
+
+
+def test_case_node(name):
+    """
+    Request that was fuzzed in a test case.
+
+    :param name: Test case name as built by Session, e.g. "login->cmd:[cmd.arg.value:3]".
+
+    :return: Name of the last request of the message path, or None.
+    """
+    if name is None:
+        return None
+    return name.split(":[", 1)[0].rsplit("->", 1)[-1]
+
+
+def test_case_element(name):
+    """
+    Element that was mutated in a test case.
+
+    :param name: Test case name as built by Session, e.g. "login->cmd:[cmd.arg.value:3]".
+
+    :return: Qualified name of the first mutated element, or None for test cases without mutations.
+    """
+    if name is None or ":[" not in name:
+        return None
+    mutation = name.split(":[", 1)[1].split(", ", 1)[0].rstrip("]")
+    return mutation.rsplit(":", 1)[0] or None
+
+
+def failure_row(index, name, timestamp, descriptions):
+    """
+    Parameters of a row of the failures table.
+
+    :param index: Test case index.
+    :param name: Test case name.
+    :param timestamp: Test case time stamp.
+    :param descriptions: Failure descriptions of the test case.
+
+    :return: Tuple for the failures of insert_rows.
+    """
+    synopsis = "\n".join(descriptions)
+    return index, test_case_node(name), test_case_element(name), synopsis, synopsis_hash(synopsis), timestamp
+
+
+def insert_rows(connection, blobs=(), cases=(), steps=(), failures=(), run_statistics=None):
+    """
+    Insert rows into a database created by ensure_schema, without committing.
+
+    :param connection: sqlite3 connection or cursor.
+    :param blobs: (hash, compression id, data) of each blob, see blob_hash. Blobs already stored are skipped.
+    :param cases: (name, index, time stamp) of each test case.
+    :param steps: (test case index, step type name, description, blob hash, time stamp, is truncated) of each step.
+    :param failures: Failure rows, see failure_row.
+    :param run_statistics: Numbers of cases, dropped cases and failed cases to add to run_statistics. Default None.
+    """
+    connection.executemany(_INSERT_BLOB, blobs)
+    connection.executemany(_INSERT_CASE, cases)
+    connection.executemany(_INSERT_STEP, steps)
+    connection.executemany(_INSERT_FAILURE, failures)
+    if run_statistics is not None:
+        connection.execute(_UPDATE_RUN_STATISTICS, run_statistics)
+
+
+def compress_blob(data, compression):
+    """
+    Compress step data for the blobs table.
+
+    :param data: Step data.
+    :param compression: Compression method, one of BLOB_COMPRESSIONS.
+
+    :return: Compressed data.
+    """
+    if compression == "zlib":
+        return zlib.compress(data)
+    if compression == "zstd":
+        return zstandard.ZstdCompressor().compress(data)
+    return data
+
+
+def decompress_blob(data, compression_id):
+    """
+    Decompress data read from the blobs table, or the data column of the steps view.
+
+    :param data: Stored data.
+    :param compression_id: Index into BLOB_COMPRESSIONS, as stored in blobs.compression.
+
+    :return: Step data.
+    """
+    if not compression_id:
+        return data
+    if BLOB_COMPRESSIONS[compression_id] == "zlib":
+        return zlib.decompress(data)
+    if zstandard is None:
+        raise ValueError("Reading zstd compressed step data requires the zstandard package")
+    return zstandard.ZstdDecompressor().decompress(data)
+
+
+def ensure_schema(connection):
+    """
+    Create the current schema in a new database, or migrate the tables of an older schema version to it.
+
+    The migration copies all rows into new tables in one transaction, which takes a while for large databases, but
+    only happens once per database. Migrated step data is deduplicated, but not compressed. Databases of a newer
+    schema version are left alone.
+
+    :param connection: sqlite3 connection to the database.
+
+    :return: Schema version of the database after the call.
+    """
+    version = connection.execute("PRAGMA user_version").fetchone()[0]
+    if version >= SCHEMA_VERSION:
+        return version
+    script = "BEGIN;\n"
+    if version in _UPGRADES:
+        script += "".join(_UPGRADES[v] for v in range(version, SCHEMA_VERSION))
+    else:
+        tables = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        legacy_tables = [table for table in _LEGACY_TABLES[version] if table in tables]
+        script += _LEGACY_DROPS[version]
+        script += "".join("ALTER TABLE {0} RENAME TO legacy_{0};\n".format(table) for table in legacy_tables)
+        script += _SCHEMA
+        script += "".join(
+            "INSERT INTO step_types (id, name) VALUES ({0}, '{1}');\n".format(i, name)
+            for i, name in enumerate(STEP_TYPES, start=1)
+        )
+        if legacy_tables == list(_LEGACY_TABLES[version]):
+            script += _MIGRATIONS[version]
+        script += "".join("DROP TABLE legacy_{0};\n".format(table) for table in legacy_tables)
+    script += "".join(statements for v, statements in sorted(_ROWS_FROM_STORED_CASES.items()) if v > version)
+    script += "PRAGMA user_version = {0};\nCOMMIT;\n".format(SCHEMA_VERSION)
+
+    connection.create_function("boofuzz_blob_hash", 1, blob_hash)
+    connection.create_function("boofuzz_synopsis_hash", 1, synopsis_hash)
+    connection.create_function("boofuzz_test_case_node", 1, test_case_node)
+    connection.create_function("boofuzz_test_case_element", 1, test_case_element)
+    try:
+        connection.executescript(script)
+    except sqlite3.Error:
+        connection.rollback()
+        raise
+    return SCHEMA_VERSION
+
 
 def get_time_stamp():
     s = datetime.datetime.utcnow().isoformat()
@@ -34,39 +386,108 @@ class FuzzLoggerDb(ifuzz_logger_backend.IFuzzLoggerBackend):
     """
     Log fuzz data in a sqlite database file.
     Using an existing database requires more graceful exits to prevent case number duplication.
+
+    Rows are written by a background thread, so the fuzzing thread does not wait for the disk. Rows that are due for
+    writing are handed to a bounded queue; the writer thread drains everything that is queued into one transaction
+    (``executemany`` per table) in WAL journal mode. If the writer falls more than ``queue_size`` test cases behind,
+    logging blocks until it catches up. :meth:`close_test` and :meth:`flush` wait until all rows are committed.
+
+    Sent and received data is stored once per distinct payload in the blobs table, keyed by its hash, so payloads
+    repeated in every test case (e.g. login messages) take no space after their first occurrence. Payloads of at least
+    ``compression_threshold`` bytes can additionally be compressed.
+
+    Test cases with a failure or error are always stored. By default, so are all passing test cases. With
+    ``num_log_cases``, only the passing test cases among the last n test cases up to a failure are stored, plus the
+    passing test cases selected by the ``keep_*`` retention policies; a test case is stored if any policy selects it.
+    All decisions take constant time per test case. The run_statistics table counts all test cases of the run,
+    including the dropped ones.
+
+    Args:
+        db_filename (str): Name of database file.
+        num_log_cases (int): Keep only the last n test cases up to and including a failure; 0 keeps all, or none if
+            a retention policy is set. Default 0.
+        queue_size (int): Maximum number of test cases waiting for the writer thread. Default 1000.
+        compression (str): Compress large payloads with "zlib" or "zstd" (requires the zstandard package). Compressed
+            payloads are decompressed by FuzzLoggerDbReader; other readers see the compressed bytes in the data column
+            of the steps view. Default None.
+        compression_threshold (int): Minimum payload length to compress. Default 1024.
+        keep_every_nth_pass (int): Retention policy: keep every nth passing test case. Default 0 (off).
+        keep_changed_responses (bool): Retention policy: keep passing test cases whose received data differs from
+            the data received in the first test case. Default False.
+        keep_pass_interval (float): Retention policy: keep the first passing test case of every keep_pass_interval
+            seconds. Default None (off).
     """
 
-    def __init__(self, db_filename, num_log_cases=0):
-        # Check if a db exists before the connect leaves an "empty" file behind.
-        db_already_exist = helpers.path_exists(db_filename)
+    def __init__(
+        self,
+        db_filename,
+        num_log_cases=0,
+        queue_size=1000,
+        compression=None,
+        compression_threshold=1024,
+        keep_every_nth_pass=0,
+        keep_changed_responses=False,
+        keep_pass_interval=None,
+    ):
+        if compression not in BLOB_COMPRESSIONS:
+            raise ValueError("Unknown compression {0!r}, use one of {1}".format(compression, BLOB_COMPRESSIONS))
+        if compression == "zstd" and zstandard is None:
+            raise ValueError("zstd compression requires the zstandard package")
+        self._compression = compression
+        self._compression_threshold = compression_threshold
+        self._stored_blobs = set()  # hashes of the blobs known to be in the database
+
         self._database_connection = sqlite3.connect(db_filename, check_same_thread=False)
+        self._database_connection.execute("PRAGMA journal_mode=WAL")
+        self._database_connection.execute("PRAGMA synchronous=NORMAL")
+        ensure_schema(self._database_connection)
         self._db_cursor = self._database_connection.cursor()
-
-        if not db_already_exist:
-            self._db_cursor.execute("""CREATE TABLE cases (name text, number integer, timestamp TEXT)""")
-            self._db_cursor.execute(
-                """CREATE TABLE steps (test_case_index integer, type text, description text, data blob,
-                                    timestamp TEXT, is_truncated BOOLEAN)"""
-            )
+        self._db_lock = threading.Lock()
 
         self._current_test_case_index = 0
+        self._current_test_case_name = None
+        self._current_test_case_timestamp = None
+        self._current_failures = []
 
-        self._queue = collections.deque([])  # Queue that holds last n test cases before commiting
-        self._queue_max_len = num_log_cases
+        self._current_case = []  # rows of the open test case, or of steps logged outside of a test case
+        self._case_open = False
+        self._current_case_written = False  # the open test case had an error and is written as it goes
         self._fail_detected = False
         self._log_first_case = True
         self._data_truncate_length = 512
 
+        self._keep_every_nth_pass = keep_every_nth_pass
+        self._keep_changed_responses = keep_changed_responses
+        self._keep_pass_interval = keep_pass_interval
+        self._keep_all = num_log_cases == 0 and not (
+            keep_every_nth_pass or keep_changed_responses or keep_pass_interval is not None
+        )
+        # closed test cases that were not written, the last n - 1 of them are kept for a failure
+        self._unwritten_cases = collections.deque(maxlen=max(num_log_cases - 1, 0))
+        self._num_passed_cases = 0
+        self._pass_interval_number = None
+        self._response_hash = None
+        self._baseline_response = None
+        self._run_statistics = [0, 0, 0]  # unwritten test case, dropped test case and failed test case counts
+
+        self._write_queue = queue.Queue(maxsize=queue_size)
+        self._writer_error = None
+        self._writer_thread = threading.Thread(target=self._run_writer, name="boofuzz-db-writer")
+        self._writer_thread.daemon = True
+        self._writer_thread.start()
+
     def get_test_case_data(self, index):
-        c = self._database_connection.cursor()
-        try:
-            test_case_row = next(c.execute("""SELECT * FROM cases WHERE number=?""", [index]))
-        except StopIteration:
-            return None
-        rows = c.execute("""SELECT * FROM steps WHERE test_case_index=?""", [index])
+        self.flush()
+        with self._db_lock:
+            c = self._database_connection.cursor()
+            try:
+                test_case_row = next(c.execute("""SELECT * FROM cases WHERE number=?""", [index]))
+            except StopIteration:
+                return None
+            rows = c.execute("""SELECT * FROM steps WHERE test_case_index=?""", [index]).fetchall()
         steps = []
         for row in rows:
-            data = row[3]
+            data = decompress_blob(row[3], row[6] if len(row) > 6 else 0)
             # Little hack since BLOB becomes type buffer in py2 and bytes in py3
             # At the end, data will be equivalent types: bytes in py3 and str in py2
             try:
@@ -87,13 +508,21 @@ class FuzzLoggerDb(ifuzz_logger_backend.IFuzzLoggerBackend):
         )
 
     def open_test_case(self, test_case_id, name, index, *args, **kwargs):
-        self._queue.append(["INSERT INTO cases VALUES(?, ?, ?);\n", name, index, helpers.get_time_stamp()])
+        if self._case_open:
+            self.close_test_case()
+        timestamp = helpers.get_time_stamp()
+        self._current_case.append([_INSERT_CASE, name, index, timestamp])
+        self._case_open = True
         self._current_test_case_index = index
+        self._current_test_case_name = name
+        self._current_test_case_timestamp = timestamp
+        if self._keep_changed_responses:
+            self._response_hash = hashlib.blake2b(digest_size=16)
 
     def open_test_step(self, description):
-        self._queue.append(
+        self._current_case.append(
             [
-                "INSERT INTO steps VALUES(?, ?, ?, ?, ?, ?);\n",
+                _INSERT_STEP,
                 self._current_test_case_index,
                 "step",
                 description,
@@ -104,9 +533,9 @@ class FuzzLoggerDb(ifuzz_logger_backend.IFuzzLoggerBackend):
         )
 
     def log_check(self, description):
-        self._queue.append(
+        self._current_case.append(
             [
-                "INSERT INTO steps VALUES(?, ?, ?, ?, ?, ?);\n",
+                _INSERT_STEP,
                 self._current_test_case_index,
                 "check",
                 description,
@@ -117,9 +546,9 @@ class FuzzLoggerDb(ifuzz_logger_backend.IFuzzLoggerBackend):
         )
 
     def log_error(self, description):
-        self._queue.append(
+        self._current_case.append(
             [
-                "INSERT INTO steps VALUES(?, ?, ?, ?, ?, ?);\n",
+                _INSERT_STEP,
                 self._current_test_case_index,
                 "error",
                 description,
@@ -129,12 +558,17 @@ class FuzzLoggerDb(ifuzz_logger_backend.IFuzzLoggerBackend):
             ]
         )
         self._fail_detected = True
-        self._write_log()
+        # write right away, in case the error is followed by a crash of the fuzzer
+        self._write(self._take_unwritten_cases() + self._current_case, truncate=False)
+        self._current_case = []
+        self._current_case_written = True
 
     def log_recv(self, data):
-        self._queue.append(
+        if self._response_hash is not None:
+            self._response_hash.update(data)
+        self._current_case.append(
             [
-                "INSERT INTO steps VALUES(?, ?, ?, ?, ?, ?);\n",
+                _INSERT_STEP,
                 self._current_test_case_index,
                 "receive",
                 "",
@@ -145,9 +579,9 @@ class FuzzLoggerDb(ifuzz_logger_backend.IFuzzLoggerBackend):
         )
 
     def log_send(self, data):
-        self._queue.append(
+        self._current_case.append(
             [
-                "INSERT INTO steps VALUES(?, ?, ?, ?, ?, ?);\n",
+                _INSERT_STEP,
                 self._current_test_case_index,
                 "send",
                 "",
@@ -158,9 +592,9 @@ class FuzzLoggerDb(ifuzz_logger_backend.IFuzzLoggerBackend):
         )
 
     def log_info(self, description):
-        self._queue.append(
+        self._current_case.append(
             [
-                "INSERT INTO steps VALUES(?, ?, ?, ?, ?, ?);\n",
+                _INSERT_STEP,
                 self._current_test_case_index,
                 "info",
                 description,
@@ -171,9 +605,9 @@ class FuzzLoggerDb(ifuzz_logger_backend.IFuzzLoggerBackend):
         )
 
     def log_fail(self, description=""):
-        self._queue.append(
+        self._current_case.append(
             [
-                "INSERT INTO steps VALUES(?, ?, ?, ?, ?, ?);\n",
+                _INSERT_STEP,
                 self._current_test_case_index,
                 "fail",
                 description,
@@ -183,11 +617,13 @@ class FuzzLoggerDb(ifuzz_logger_backend.IFuzzLoggerBackend):
             ]
         )
         self._fail_detected = True
+        if self._case_open:
+            self._current_failures.append(description)
 
     def log_pass(self, description=""):
-        self._queue.append(
+        self._current_case.append(
             [
-                "INSERT INTO steps VALUES(?, ?, ?, ?, ?, ?);\n",
+                _INSERT_STEP,
                 self._current_test_case_index,
                 "pass",
                 description,
@@ -198,31 +634,157 @@ class FuzzLoggerDb(ifuzz_logger_backend.IFuzzLoggerBackend):
         )
 
     def close_test_case(self):
-        self._write_log(force=False)
+        if not self._case_open:
+            return
+        rows = self._current_case
+        self._current_case = []
+        self._case_open = False
+        self._run_statistics[0] += 1
+        if self._fail_detected:
+            self._run_statistics[2] += 1
+        if self._current_failures:
+            failure = failure_row(
+                self._current_test_case_index,
+                self._current_test_case_name,
+                self._current_test_case_timestamp,
+                self._current_failures,
+            )
+            rows.append([_INSERT_FAILURE, *failure])
+            self._current_failures = []
+        keep = self._keep_pass_case() if not self._fail_detected else False
+
+        if self._fail_detected or self._current_case_written or self._log_first_case:
+            self._write(self._take_unwritten_cases() + rows, truncate=not self._fail_detected)
+        elif keep or self._keep_all:
+            self._write(rows, truncate=True)
+        else:
+            if self._unwritten_cases.maxlen == len(self._unwritten_cases):
+                self._run_statistics[1] += 1
+            self._unwritten_cases.append(rows)
+            if self._run_statistics[0] >= 1000:
+                self._write([], truncate=False)
+        self._current_case_written = False
+        self._fail_detected = False
+        self._log_first_case = False
 
     def close_test(self):
-        self._write_log(force=True)
-
-    def _write_log(self, force=False):
-        if len(self._queue) > 0:
-            if self._queue_max_len > 0:
-                while (
-                    self._current_test_case_index - next(x for x in self._queue[0] if isinstance(x, int))
-                ) >= self._queue_max_len:
-                    self._queue.popleft()
-            else:
-                force = True
-
-            if force or self._fail_detected or self._log_first_case:
-                for query in self._queue:
-                    # abbreviate long entries first
-                    if not self._fail_detected:
-                        self._truncate_send_recv(query)
-                    self._db_cursor.execute(query[0], query[1:])
-                self._queue.clear()
+        self.close_test_case()
+        self._write(self._take_unwritten_cases() + self._current_case, truncate=True)
+        self._current_case = []
+        self.flush()
+
+    def flush(self):
+        """Block until all rows handed to the writer thread are committed.
+
+        Raises:
+            Exception: The error of the writer thread if it failed to write rows, usually a sqlite3.Error.
+        """
+        done = threading.Event()
+        self._write_queue.put(done)
+        while not done.wait(timeout=0.1):
+            if not self._writer_thread.is_alive():
+                break
+        if self._writer_error is not None:
+            error, self._writer_error = self._writer_error, None
+            raise error
+
+    def _keep_pass_case(self):
+        """Apply the retention policies to the passing test case that is being closed."""
+        keep = False
+        self._num_passed_cases += 1
+        if self._keep_every_nth_pass and self._num_passed_cases % self._keep_every_nth_pass == 0:
+            keep = True
+        if self._keep_pass_interval is not None:
+            interval_number = int(time.time() // self._keep_pass_interval)
+            if interval_number != self._pass_interval_number:
+                self._pass_interval_number = interval_number
+                keep = True
+        if self._response_hash is not None:
+            response = self._response_hash.digest()
+            if self._baseline_response is None:
+                self._baseline_response = response
+            elif response != self._baseline_response:
+                keep = True
+        return keep
+
+    def _take_unwritten_cases(self):
+        rows = [row for case in self._unwritten_cases for row in case]
+        self._unwritten_cases.clear()
+        return rows
+
+    def _write(self, rows, truncate):
+        """Hand rows and the run statistics since the last call to the writer thread."""
+        if truncate:
+            # abbreviate long entries first
+            for query in rows:
+                self._truncate_send_recv(query)
+        rows.append([_UPDATE_RUN_STATISTICS] + self._run_statistics)
+        self._run_statistics = [0, 0, 0]
+        # blocks if the writer thread is too far behind
+        self._write_queue.put(rows)
+
+    def _run_writer(self):
+        """Writer thread: commit the queued rows, one transaction for everything queued at a time."""
+        while True:
+            items = [self._write_queue.get()]
+            while True:
+                try:
+                    items.append(self._write_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            rows = collections.OrderedDict()  # statement -> list of parameters
+            for item in items:
+                if isinstance(item, list):
+                    for query in item:
+                        rows.setdefault(query[0], []).append(query[1:])
+            if rows:
+                # any error is kept for flush, the thread must keep taking rows or the fuzzing loop blocks on the queue
+                try:
+                    self._commit_rows(rows)
+                except Exception as e:
+                    self._writer_error = e
+
+            for item in items:
+                if isinstance(item, threading.Event):
+                    item.set()
+
+    def _commit_rows(self, rows):
+        """Insert rows, a map of statements to lists of parameters, in one transaction."""
+        blobs = self._replace_data_by_hash(rows.get(_INSERT_STEP, []))
+        with self._db_lock:
+            try:
+                self._db_cursor.executemany(_INSERT_BLOB, blobs)
+                for statement, parameters in rows.items():
+                    self._db_cursor.executemany(statement, parameters)
                 self._database_connection.commit()
-                self._log_first_case = False
-                self._fail_detected = False
+            except Exception:
+                self._database_connection.rollback()
+                raise
+        if len(self._stored_blobs) > 100000:
+            self._stored_blobs.clear()
+        self._stored_blobs.update(blob[0] for blob in blobs)
+
+    def _replace_data_by_hash(self, steps):
+        """Replace the data of step parameters by its hash.
+
+        Returns:
+            list: Parameters of the blob rows to insert for data not known to be stored.
+        """
+        blobs = {}
+        for i, step in enumerate(steps):
+            digest = blob_hash(step[3])
+            if digest is not None and digest not in self._stored_blobs and digest not in blobs:
+                blobs[digest] = self._blob_row(digest, bytes(step[3]))
+            steps[i] = step[:3] + [digest] + step[4:]
+        return list(blobs.values())
+
+    def _blob_row(self, digest, data):
+        if self._compression is not None and len(data) >= self._compression_threshold:
+            compressed = compress_blob(data, self._compression)
+            if len(compressed) < len(data):
+                return digest, BLOB_COMPRESSIONS.index(self._compression), compressed
+        return digest, 0, data
 
     def _truncate_send_recv(self, query):
         if query[2] in ["send", "recv"] and len(query[4]) > self._data_truncate_length:
@@ -233,25 +795,55 @@ class FuzzLoggerDb(ifuzz_logger_backend.IFuzzLoggerBackend):
 class FuzzLoggerDbReader:
     """Read fuzz data saved using FuzzLoggerDb
 
+    Databases of an older schema version are migrated to the current one. Read-only databases that cannot be migrated
+    are read as they are, without the benefit of indexes.
+
+    With ``pool_size``, the database is opened read-only through a pool of that many connections, so several threads
+    (e.g. the web server's) can read at the same time. It is neither migrated nor written to; migrate it by opening it
+    once without ``pool_size``.
+
     Args:
         db_filename (str): Name of database file to read.
+        pool_size (int): Number of read-only connections. Default None (one read-write connection).
     """
 
-    def __init__(self, db_filename):
+    def __init__(self, db_filename, pool_size=None):
+        self._pool = None
+        if pool_size is not None:
+            uri = "file:{0}?mode=ro".format(urllib.request.pathname2url(os.path.abspath(db_filename)))
+            self._pool = queue.Queue()
+            for _ in range(pool_size):
+                self._pool.put(sqlite3.connect(uri, uri=True, check_same_thread=False))
+            return
         self._database_connection = sqlite3.connect(db_filename, check_same_thread=False)
+        try:
+            ensure_schema(self._database_connection)
+        except sqlite3.OperationalError:
+            pass
         self._db_cursor = self._database_connection.cursor()
 
-    def get_test_case_data(self, index):
-        c = self._db_cursor
+    @contextlib.contextmanager
+    def _cursor(self):
+        if self._pool is None:
+            yield self._db_cursor
+            return
+        connection = self._pool.get()
         try:
-            test_case_row = next(c.execute("""SELECT * FROM cases WHERE number=?""", [index]))
-        except StopIteration:
-            raise exception.BoofuzzNoSuchTestCase()
+            yield connection.cursor()
+        finally:
+            self._pool.put(connection)
 
-        rows = c.execute("""SELECT * FROM steps WHERE test_case_index=?""", [index])
+    def get_test_case_data(self, index):
+        with self._cursor() as c:
+            try:
+                test_case_row = next(c.execute("""SELECT * FROM cases WHERE number=?""", [index]))
+            except StopIteration:
+                raise exception.BoofuzzNoSuchTestCase()
+
+            rows = c.execute("""SELECT * FROM steps WHERE test_case_index=?""", [index]).fetchall()
         steps = []
         for row in rows:
-            data = row[3]
+            data = decompress_blob(row[3], row[6] if len(row) > 6 else 0)
             # Little hack since BLOB becomes type buffer in py2 and bytes in py3
             # At the end, data will be equivalent types: bytes in py3 and str in py2
             try:
@@ -272,17 +864,100 @@ class FuzzLoggerDbReader:
         )
 
     def query(self, query, params=None):
+        """Run a query. With a connection pool, the rows are returned as a list, otherwise as a cursor."""
         if params is None:
             params = []
-        c = self._db_cursor
-        return c.execute(query, params)
+        with self._cursor() as c:
+            if self._pool is not None:
+                return c.execute(query, params).fetchall()
+            return c.execute(query, params)
+
+    @property
+    def num_test_cases(self):
+        """Number of logged test cases, from the summary table if the database has one."""
+        with self._cursor() as c:
+            try:
+                return c.execute("SELECT num_cases FROM summary").fetchone()[0]
+            except sqlite3.OperationalError:
+                return c.execute("SELECT COUNT(*) FROM cases").fetchone()[0]
+
+    @property
+    def run_statistics(self):
+        """Counts of all test cases of the run, including the ones dropped by the retention policies.
+
+        Returns:
+            dict: ``num_cases``, ``num_dropped_cases`` and ``num_failed_cases``.
+        """
+        try:
+            with self._cursor() as c:
+                row = c.execute("SELECT num_cases, num_dropped_cases, num_failed_cases FROM run_statistics").fetchone()
+        except sqlite3.OperationalError:
+            row = (self.num_test_cases, 0, len(self.failure_map))
+        return dict(zip(("num_cases", "num_dropped_cases", "num_failed_cases"), row))
 
     @property
     def failure_map(self):
-        c = self._db_cursor
-        failure_steps = c.execute('''SELECT * FROM steps WHERE type="fail"''')
+        with self._cursor() as c:
+            failure_steps = c.execute("SELECT test_case_index, description FROM steps WHERE type = 'fail'").fetchall()
 
         failure_map = collections.defaultdict(list)
         for step in failure_steps:
-            failure_map[step[0]].append(step[2])
+            failure_map[step[0]].append(step[1])
         return failure_map
+
+    def failures(self, after=0, limit=100, node=None, element=None, synopsis_hash=None, since=None, until=None):
+        """Failed test cases in order of their index, one page at a time.
+
+        Pages are selected by index rather than by offset, so any page is read through an index in the same time. Pass
+        the index of the last failure of a page as ``after`` to get the next one.
+
+        Args:
+            after (int): Only return test cases with a greater index. Default 0.
+            limit (int): Maximum number of test cases to return. Default 100.
+            node (str): Only return test cases fuzzing this request. Default None.
+            element (str): Only return test cases mutating the element of this qualified name. Default None.
+            synopsis_hash (str): Only return test cases whose failure synopsis has this hash. Default None.
+            since (float): Only return test cases started at or after this time (seconds since the epoch).
+            until (float): Only return test cases started before this time (seconds since the epoch).
+
+        Returns:
+            list of dict: ``index``, ``node``, ``element``, ``synopsis``, ``synopsis_hash`` and ``timestamp``.
+        """
+        conditions = []
+        params = [after]
+        for column, value in (("node", node), ("element", element), ("synopsis_hash", synopsis_hash)):
+            if value is not None:
+                conditions.append(" AND {0} = ?".format(column))
+                params.append(value)
+        if since is not None:
+            conditions.append(" AND timestamp >= ?")
+            params.append(helpers.get_time_stamp(since))
+        if until is not None:
+            conditions.append(" AND timestamp < ?")
+            params.append(helpers.get_time_stamp(until))
+        params.append(limit)
+        with self._cursor() as c:
+            rows = c.execute(_SELECT_FAILURES.format("".join(conditions)), params).fetchall()
+        return [dict(zip(("index", "node", "element", "synopsis", "synopsis_hash", "timestamp"), row)) for row in rows]
+
+    def failure_synopses(self, node=None, element=None):
+        """Distinct failure synopses, most frequent first.
+
+        Args:
+            node (str): Only count test cases fuzzing this request. Default None.
+            element (str): Only count test cases mutating the element of this qualified name. Default None.
+
+        Returns:
+            list of dict: ``synopsis_hash``, ``synopsis``, ``count`` and ``first_index``, the index of the first test
+            case with the synopsis.
+        """
+        conditions = []
+        params = []
+        for column, value in (("node", node), ("element", element)):
+            if value is not None:
+                conditions.append("{0} = ?".format(column))
+                params.append(value)
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+        with self._cursor() as c:
+            rows = c.execute(_SELECT_FAILURE_SYNOPSES.format(where), params).fetchall()
+        return [dict(zip(("synopsis_hash", "synopsis", "count", "first_index"), row)) for row in rows]
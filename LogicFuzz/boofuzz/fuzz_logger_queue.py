@@ -0,0 +1,162 @@
+import queue
+import threading
+import time
+
+from . import ifuzz_logger_backend
+
+
+class FuzzLoggerQueue(ifuzz_logger_backend.IFuzzLoggerBackend):
+    """
+    Forwards log events to another logger on a worker thread of its own.
+
+    Used by FuzzLogger with ``threaded=True``, so a slow logger (e.g. a curses redraw or a CSV file on a slow disk)
+    neither holds up the other loggers nor the fuzzing loop, which only pays for putting the event into a queue. Events
+    reach the wrapped logger in the order they were logged.
+
+    When the queue is full, the "block" policy waits for the worker to catch up. The "drop" policy drops events
+    instead, until an open_test_case fits into the queue again. The close_test_case of a test case whose
+    open_test_case was passed on is never dropped, so the wrapped logger still sees complete test cases, some of them
+    without (some of) their steps, and the queue may hold one event more than queue_size. Drop is meant for display
+    loggers, whose output is allowed to have gaps.
+
+    Errors raised by the wrapped logger are raised by the next :meth:`flush` or :meth:`close_test`.
+
+    Args:
+        fuzz_logger (ifuzz_logger.IFuzzLogger): Logger to forward the events to.
+        queue_size (int): Maximum number of queued events. Default 10000.
+        overflow (str): What to do when the queue is full, "block" or "drop". Default "block".
+    """
+
+    OVERFLOW_POLICIES = ("block", "drop")
+
+    def __init__(self, fuzz_logger, queue_size=10000, overflow="block"):
+        if overflow not in self.OVERFLOW_POLICIES:
+            raise ValueError("Unknown overflow policy {0!r}, use one of {1}".format(overflow, self.OVERFLOW_POLICIES))
+        self.fuzz_logger = fuzz_logger
+        self._overflow = overflow
+        self._queue_size = queue_size
+        # with the drop policy, _put keeps to queue_size itself, so close_test_case can always be put without blocking
+        self._queue = queue.Queue(maxsize=queue_size if overflow == "block" else 0)
+        self._dropping = False
+        self._test_case_open = False
+        self._error = None
+
+        self._num_queued = 0
+        self._num_dropped = 0
+        self._num_processed = 0
+        self._max_depth = 0
+        self._total_latency = 0.0
+        self._max_latency = 0.0
+
+        self._thread = threading.Thread(target=self._run, name="boofuzz-logger-{0}".format(type(fuzz_logger).__name__))
+        self._thread.daemon = True
+        self._thread.start()
+
+    @property
+    def stats(self):
+        """Queue counters.
+
+        Returns:
+            dict: ``logger`` (class name of the wrapped logger), ``depth`` (events in the queue), ``max_depth``,
+            ``queued``, ``dropped`` and ``processed`` (event counts), and ``mean_latency`` and ``max_latency``
+            (seconds from queuing an event until the wrapped logger returned).
+        """
+        return {
+            "logger": type(self.fuzz_logger).__name__,
+            "depth": self._queue.qsize(),
+            "max_depth": self._max_depth,
+            "queued": self._num_queued,
+            "dropped": self._num_dropped,
+            "processed": self._num_processed,
+            "mean_latency": self._total_latency / self._num_processed if self._num_processed else 0.0,
+            "max_latency": self._max_latency,
+        }
+
+    def open_test_case(self, test_case_id, name, index, *args, **kwargs):
+        self._put("open_test_case", (test_case_id, name, index) + args, kwargs)
+
+    def open_test_step(self, description):
+        self._put("open_test_step", (description,))
+
+    def log_send(self, data):
+        self._put("log_send", (data,))
+
+    def log_recv(self, data):
+        self._put("log_recv", (data,))
+
+    def log_check(self, description):
+        self._put("log_check", (description,))
+
+    def log_pass(self, description=""):
+        self._put("log_pass", (description,))
+
+    def log_fail(self, description=""):
+        self._put("log_fail", (description,))
+
+    def log_info(self, description):
+        self._put("log_info", (description,))
+
+    def log_error(self, description):
+        self._put("log_error", (description,))
+
+    def close_test_case(self):
+        self._put("close_test_case", ())
+
+    def close_test(self):
+        self._put("close_test", ())
+        self.flush()
+
+    def flush(self):
+        """Block until the wrapped logger has processed all queued events, and flushed them if it has a flush method.
+
+        Raises:
+            Exception: The first error raised by the wrapped logger since the last flush.
+        """
+        if hasattr(self.fuzz_logger, "flush"):
+            self._put("flush", ())
+        done = threading.Event()
+        self._queue.put(done)
+        while not done.wait(timeout=0.1):
+            if not self._thread.is_alive():
+                break
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _put(self, method, args, kwargs=None):
+        if self._overflow == "drop" and not (
+            method in ("close_test", "flush") or (method == "close_test_case" and self._test_case_open)
+        ):
+            if (self._dropping and method != "open_test_case") or self._queue.qsize() >= self._queue_size:
+                self._dropping = True
+                self._num_dropped += 1
+                return
+            self._dropping = False
+        self._queue.put((method, args, kwargs or {}, time.perf_counter()))
+
+        if method == "open_test_case":
+            self._test_case_open = True
+        elif method == "close_test_case":
+            self._test_case_open = False
+        self._num_queued += 1
+        depth = self._queue.qsize()
+        if depth > self._max_depth:
+            self._max_depth = depth
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if isinstance(item, threading.Event):
+                item.set()
+                continue
+            method, args, kwargs, queued = item
+            try:
+                getattr(self.fuzz_logger, method)(*args, **kwargs)
+            except Exception as e:
+                if self._error is None:
+                    self._error = e
+            latency = time.perf_counter() - queued
+            self._num_processed += 1
+            self._total_latency += latency
+            if latency > self._max_latency:
+                self._max_latency = latency
@@ -1,4 +1,6 @@
+import logging
 import sys
+import time
 
 from colorama import init
 
@@ -20,16 +22,41 @@ class FuzzLoggerText(ifuzz_logger_backend.IFuzzLoggerBackend):
 
     INDENT_SIZE = 2
 
-    def __init__(self, file_handle=sys.stdout, bytes_to_str=DEFAULT_HEX_TO_STR):
+    def __init__(
+        self,
+        file_handle=sys.stdout,
+        bytes_to_str=DEFAULT_HEX_TO_STR,
+        log_level=logging.DEBUG,
+        max_data_bytes=None,
+        flush_interval=None,
+    ):
         """
         :type file_handle: io.BinaryIO
         :param file_handle: Open file handle for logging. Defaults to sys.stdout.
 
         :type bytes_to_str: function
         :param bytes_to_str: Function that converts sent/received bytes data to string for logging.
+
+        :type log_level: int
+        :param log_level: Minimum level of logged messages, using the levels of the logging module. Sent and received
+            data is logged at DEBUG, failures and errors at ERROR, everything else at INFO. Messages below the level
+            are not formatted at all. Defaults to logging.DEBUG.
+
+        :type max_data_bytes: int
+        :param max_data_bytes: Render at most this many bytes of sent and received data. Defaults to None (all).
+
+        :type flush_interval: float
+        :param flush_interval: Collect messages and write them at most every flush_interval seconds, and on
+            close_test. Messages at ERROR and above, i.e. failures and errors, are written right away along with the
+            collected ones. Defaults to None, which writes every message right away.
         """
         self._file_handle = file_handle
         self._format_raw_bytes = bytes_to_str
+        self._log_level = log_level
+        self._max_data_bytes = max_data_bytes
+        self._flush_interval = flush_interval
+        self._buffer = []
+        self._last_flush = time.time()
 
     def open_test_step(self, description):
         self._print_log_msg(msg=description, msg_type="step")
@@ -62,10 +89,30 @@ class FuzzLoggerText(ifuzz_logger_backend.IFuzzLoggerBackend):
         pass
 
     def close_test(self):
-        pass
+        self.flush()
+
+    def flush(self):
+        """Write the collected messages."""
+        if self._buffer:
+            self._file_handle.write("\n".join(self._buffer) + "\n")
+            del self._buffer[:]
+        self._file_handle.flush()
+        self._last_flush = time.time()
 
     def _print_log_msg(self, msg_type, msg=None, data=None):
-        print(
-            helpers.format_log_msg(msg_type=msg_type, description=msg, data=data, indent_size=self.INDENT_SIZE),
-            file=self._file_handle,
+        level = helpers.test_step_info[msg_type]["level"]
+        if level < self._log_level:
+            return
+        line = helpers.format_log_msg(
+            msg_type=msg_type,
+            description=msg,
+            data=data,
+            indent_size=self.INDENT_SIZE,
+            max_data_bytes=self._max_data_bytes,
         )
+        if self._flush_interval is None:
+            print(line, file=self._file_handle)
+            return
+        self._buffer.append(line)
+        if level >= logging.ERROR or time.time() - self._last_flush >= self._flush_interval:
+            self.flush()
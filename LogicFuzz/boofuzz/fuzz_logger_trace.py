@@ -0,0 +1,300 @@
+import mmap
+import os
+import sqlite3
+import struct
+import time
+
+from . import data_test_case, data_test_step, exception, fuzz_logger_db, helpers, ifuzz_logger_backend
+
+# Record header: total record length, record type, time.time() timestamp, and the test case number for test case
+# records or the length of the description for step records. The header is followed by the test case name, or by the
+# step description and data. A zero length marks the end of the records in a segment.
+_RECORD = struct.Struct("<IBdq")
+
+# Index entry: test case number, segment number and offset of the test case record.
+_INDEX_ENTRY = struct.Struct("<qIQ")
+
+# Record types: 0 for test cases, 1 + the index into fuzz_logger_db.STEP_TYPES for steps.
+_TEST_CASE = 0
+_STEP_RECORD_TYPES = {name: i for i, name in enumerate(fuzz_logger_db.STEP_TYPES, start=1)}
+
+
+def segment_filename(filename, segment_number):
+    """
+    Name of a segment file of a trace.
+
+    :param filename: Trace file name passed to FuzzLoggerTrace.
+    :param segment_number: Number of the segment, starting at 0.
+
+    :return: Segment file name.
+    """
+    return "{0}.{1:04d}".format(filename, segment_number)
+
+
+def index_filename(filename):
+    """
+    Name of the offset index file of a trace.
+
+    :param filename: Trace file name passed to FuzzLoggerTrace.
+
+    :return: Index file name.
+    """
+    return filename + ".idx"
+
+
+class FuzzLoggerTrace(ifuzz_logger_backend.IFuzzLoggerBackend):
+    """
+    Log fuzz data in an append-only binary trace.
+
+    Each test case and step is one length-prefixed record, copied into a memory-mapped segment file of
+    ``segment_size`` bytes. When a segment is full, it is cut to its used length and logging continues in the next
+    segment. Every test case additionally gets an entry in a sidecar offset index, so FuzzLoggerTraceReader can read
+    single test cases without scanning the trace. No data is truncated, and nothing is formatted or encoded while
+    fuzzing except descriptions, so logging a test case costs a few microseconds.
+
+    Records are in the page cache as soon as they are logged, so a trace survives a crash of the fuzzing process. The
+    index is flushed by :meth:`close_test` and :meth:`flush`. FuzzLoggerTraceReader can import a trace into a
+    FuzzLoggerDb database for the web interface and other tools.
+
+    Args:
+        filename (str): Name of the trace. Segments are written to "<filename>.0000", "<filename>.0001" and so on,
+            the index to "<filename>.idx". Logging to an existing trace continues after its last segment.
+        segment_size (int): Size of a segment file in bytes. Default 64 MiB.
+    """
+
+    def __init__(self, filename, segment_size=64 * 1024 * 1024):
+        self._filename = filename
+        self._segment_size = segment_size
+        self._segment_number = 0
+        while os.path.exists(segment_filename(filename, self._segment_number)):
+            self._segment_number += 1
+        self._segment_file = None
+        self._segment = None
+        self._offset = 0
+        self._index_file = open(index_filename(filename), "ab")
+
+    def open_test_case(self, test_case_id, name, index, *args, **kwargs):
+        self._append(_TEST_CASE, name, index_number=index)
+
+    def open_test_step(self, description):
+        self._append(_STEP_RECORD_TYPES["step"], description)
+
+    def log_check(self, description):
+        self._append(_STEP_RECORD_TYPES["check"], description)
+
+    def log_error(self, description):
+        self._append(_STEP_RECORD_TYPES["error"], description)
+
+    def log_recv(self, data):
+        self._append(_STEP_RECORD_TYPES["receive"], "", data)
+
+    def log_send(self, data):
+        self._append(_STEP_RECORD_TYPES["send"], "", data)
+
+    def log_info(self, description):
+        self._append(_STEP_RECORD_TYPES["info"], description)
+
+    def log_fail(self, description=""):
+        self._append(_STEP_RECORD_TYPES["fail"], description)
+
+    def log_pass(self, description=""):
+        self._append(_STEP_RECORD_TYPES["pass"], description)
+
+    def close_test_case(self):
+        pass
+
+    def close_test(self):
+        self._close_segment()
+        self.flush()
+
+    def flush(self):
+        """Write the buffered index entries, so readers find all logged test cases."""
+        self._index_file.flush()
+
+    def _append(self, record_type, text, data=b"", index_number=None):
+        text = text.encode("utf-8")
+        length = _RECORD.size + len(text) + len(data)
+        if self._segment is None or self._offset + length > len(self._segment):
+            self._open_segment(length)
+        if index_number is not None:
+            self._index_file.write(_INDEX_ENTRY.pack(index_number, self._segment_number, self._offset))
+        else:
+            index_number = len(text)
+
+        start = self._offset
+        _RECORD.pack_into(self._segment, start, length, record_type, time.time(), index_number)
+        start += _RECORD.size
+        self._segment[start : start + len(text)] = text
+        start += len(text)
+        self._segment[start : start + len(data)] = data
+        self._offset += length
+
+    def _open_segment(self, min_size):
+        """Continue in a new segment of at least min_size bytes, for records larger than segment_size."""
+        self._close_segment()
+        size = max(self._segment_size, min_size)
+        self._segment_file = open(segment_filename(self._filename, self._segment_number), "w+b")
+        self._segment_file.truncate(size)
+        self._segment = mmap.mmap(self._segment_file.fileno(), size)
+        self._offset = 0
+
+    def _close_segment(self):
+        """Unmap the current segment and cut it to the length of its records."""
+        if self._segment is None:
+            return
+        self._segment.close()
+        self._segment_file.truncate(self._offset)
+        self._segment_file.close()
+        self._segment = None
+        self._segment_file = None
+        self._segment_number += 1
+
+
+class FuzzLoggerTraceReader:
+    """Read fuzz data saved using FuzzLoggerTrace.
+
+    Test cases are looked up through the offset index of the trace. The index is reread when a test case is not
+    found, so traces can be read while they are being written.
+
+    Args:
+        filename (str): Name of the trace, as passed to FuzzLoggerTrace.
+    """
+
+    def __init__(self, filename):
+        self._filename = filename
+        self._index = {}
+        self._index_offset = 0
+        self._read_index()
+
+    def get_test_case_data(self, index):
+        if index not in self._index:
+            self._read_index()
+        if index not in self._index:
+            raise exception.BoofuzzNoSuchTestCase()
+        return next(self._test_cases(*self._index[index]))
+
+    def iter_test_cases(self):
+        """Read all test cases of the trace in the order they were logged.
+
+        Yields:
+            DataTestCase: Test cases, with all their steps.
+        """
+        return self._test_cases(0, 0)
+
+    @property
+    def num_test_cases(self):
+        """Number of logged test cases, according to the index."""
+        self._read_index()
+        return len(self._index)
+
+    @property
+    def failure_map(self):
+        """Map of test case numbers to failure descriptions. Reads the whole trace."""
+        failure_map = {}
+        for test_case in self.iter_test_cases():
+            failures = [step.description for step in test_case.steps if step.type == "fail"]
+            if failures:
+                failure_map.setdefault(test_case.index, []).extend(failures)
+        return failure_map
+
+    def import_to_db(self, db_filename, batch_size=10000):
+        """Import the trace into a FuzzLoggerDb database, creating or migrating its schema as needed.
+
+        Test cases are appended to existing ones, and their failures and counts are added to the failures and
+        run_statistics tables. Step data is deduplicated, but not compressed or truncated.
+
+        Args:
+            db_filename (str): Name of the database file.
+            batch_size (int): Number of test cases to insert per executemany call.
+
+        Returns:
+            int: Number of imported test cases.
+        """
+        connection = sqlite3.connect(db_filename)
+        fuzz_logger_db.ensure_schema(connection)
+        num_test_cases = 0
+        num_failed_cases = 0
+        cases, steps, blobs, failures = [], [], {}, []
+        with connection:
+            for test_case in self.iter_test_cases():
+                cases.append((test_case.name, test_case.index, test_case.timestamp))
+                for step in test_case.steps:
+                    digest = fuzz_logger_db.blob_hash(step.data)
+                    if digest is not None:
+                        blobs[digest] = (digest, 0, step.data)
+                    steps.append((test_case.index, step.type, step.description, digest, step.timestamp, False))
+                descriptions = [step.description for step in test_case.steps if step.type == "fail"]
+                if descriptions:
+                    failures.append(
+                        fuzz_logger_db.failure_row(test_case.index, test_case.name, test_case.timestamp, descriptions)
+                    )
+                if any(step.type in ("fail", "error") for step in test_case.steps):
+                    num_failed_cases += 1
+                if len(cases) >= batch_size:
+                    num_test_cases += self._insert(connection, cases, steps, blobs, failures)
+            num_test_cases += self._insert(connection, cases, steps, blobs, failures)
+            fuzz_logger_db.insert_rows(connection, run_statistics=(num_test_cases, 0, num_failed_cases))
+        connection.close()
+        return num_test_cases
+
+    @staticmethod
+    def _insert(connection, cases, steps, blobs, failures):
+        fuzz_logger_db.insert_rows(connection, blobs=blobs.values(), cases=cases, steps=steps, failures=failures)
+        num_test_cases = len(cases)
+        del cases[:], steps[:], failures[:]
+        blobs.clear()
+        return num_test_cases
+
+    def _read_index(self):
+        try:
+            with open(index_filename(self._filename), "rb") as f:
+                f.seek(self._index_offset)
+                entries = f.read()
+        except FileNotFoundError:
+            return
+        entries = entries[: len(entries) - len(entries) % _INDEX_ENTRY.size]
+        self._index_offset += len(entries)
+        for number, segment_number, offset in _INDEX_ENTRY.iter_unpack(entries):
+            self._index.setdefault(number, (segment_number, offset))
+
+    def _test_cases(self, segment_number, offset):
+        test_case = None
+        for record_type, timestamp, number, text, data in self._records(segment_number, offset):
+            if record_type == _TEST_CASE:
+                if test_case is not None:
+                    yield test_case
+                test_case = data_test_case.DataTestCase(
+                    name=text, index=number, timestamp=helpers.get_time_stamp(timestamp), steps=[]
+                )
+            elif test_case is not None:
+                test_case.steps.append(
+                    data_test_step.DataTestStep(
+                        type=fuzz_logger_db.STEP_TYPES[record_type - 1],
+                        description=text,
+                        data=data,
+                        timestamp=helpers.get_time_stamp(timestamp),
+                        truncated=False,
+                    )
+                )
+        if test_case is not None:
+            yield test_case
+
+    def _records(self, segment_number, offset):
+        """Read records starting at offset in segment_number, continuing in the following segments."""
+        while os.path.exists(segment_filename(self._filename, segment_number)):
+            with open(segment_filename(self._filename, segment_number), "rb") as f:
+                f.seek(offset)
+                while True:
+                    header = f.read(_RECORD.size)
+                    if len(header) < _RECORD.size:
+                        break
+                    length, record_type, timestamp, number = _RECORD.unpack(header)
+                    if length == 0:
+                        break
+                    body = f.read(length - _RECORD.size)
+                    if record_type == _TEST_CASE:
+                        yield record_type, timestamp, number, body.decode("utf-8"), b""
+                    else:
+                        yield record_type, timestamp, None, body[:number].decode("utf-8"), body[number:]
+            segment_number += 1
+            offset = 0
@@ -121,9 +121,13 @@ class Fuzzable:
         else:
             return self._default_value
 
-    def get_mutations(self):
+    def get_mutations(self, start=0):
         """Iterate mutations. Used by boofuzz framework.
 
+        Args:
+            start (int): Index of the first mutation to yield. The mutations before it are skipped using
+                :meth:`mutations_from`.
+
         Yields:
             list of Mutation: Mutations
 
@@ -131,8 +135,17 @@ class Fuzzable:
         try:
             if not self.fuzzable:
                 return
-            index = 0
-            for value in itertools.chain(self.mutations(self.original_value()), self._fuzz_values):
+            default_value = self.original_value()
+            if start > 0:
+                num_mutations = self.num_mutations(default_value=default_value)
+                values = itertools.chain(
+                    self.mutations_from(default_value, min(start, num_mutations)),
+                    itertools.islice(self._fuzz_values, max(0, start - num_mutations), None),
+                )
+            else:
+                values = itertools.chain(self.mutations(default_value), self._fuzz_values)
+            index = start
+            for value in values:
                 if self._halt_mutations:
                     self._halt_mutations = False
                     return
@@ -152,6 +165,17 @@ class Fuzzable:
         """
         return self.encode(value=self.get_value(mutation_context=mutation_context), mutation_context=mutation_context)
 
+    def render_segments(self, mutation_context=None):
+        """Render after applying mutation, if applicable, as a list of bytes-like segments.
+
+        Concatenated, the segments equal :meth:`render`. Sending the segments with scatter/gather I/O avoids copying
+        large values into the enclosing block at every nesting level. Default: A single segment from :meth:`render`.
+
+        :type mutation_context: MutationContext
+        :rtype: list
+        """
+        return [self.render(mutation_context=mutation_context)]
+
     def get_num_mutations(self):
         return self.num_mutations(default_value=self.original_value(test_case_context=None)) + len(self._fuzz_values)
 
@@ -196,6 +220,18 @@ class Fuzzable:
         return
         yield
 
+    def mutations_from(self, default_value, start):
+        """Generator to yield the mutation values of :meth:`mutations` from index start on.
+
+        Default: Exhaust the first start values of :meth:`mutations`. Override if the element can generate a mutation
+        from its index, so seeking to a test case does not generate all earlier values.
+
+        Args:
+            default_value:
+            start (int): Index of the first mutation to yield.
+        """
+        return itertools.islice(self.mutations(default_value), start, None)
+
     def encode(self, value, mutation_context):
         """Takes a value and encodes/renders/serializes it to a bytes (byte string).
 
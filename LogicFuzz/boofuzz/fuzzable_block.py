@@ -1,4 +1,5 @@
 from .fuzzable import Fuzzable
+from .render_cache import get_render_cache
 
 
 class FuzzableBlock(Fuzzable):
@@ -13,7 +14,8 @@ class FuzzableBlock(Fuzzable):
     FuzzableBlock adds the following methods:
 
     1. :meth:`get_child_data` Render and concatenate all child nodes.
-    2. :meth:`push` Add an additional child node; generally used only internally.
+    2. :meth:`get_child_segments` Render all child nodes as a list of segments, without concatenating them.
+    3. :meth:`push` Add an additional child node; generally used only internally.
 
     :param name: Name, for referencing later. Names should always be provided, but if not, a default name will be given,
         defaults to None
@@ -63,17 +65,43 @@ class FuzzableBlock(Fuzzable):
         Args:
             mutation_context (MutationContext): Mutation context.
 
+        Children that are not affected by the mutations of mutation_context are taken from the request's RenderCache.
+
         Returns:
             bytes: Child data.
         """
-        rendered = b""
+        render_cache = get_render_cache(self.request)
+        if render_cache is None:
+            return b"".join(item.render(mutation_context=mutation_context) for item in self.stack)
+        return b"".join(render_cache.render(item, mutation_context=mutation_context) for item in self.stack)
+
+    def get_child_segments(self, mutation_context):
+        """Get child data as a list of bytes-like segments. Concatenated, they equal :meth:`get_child_data`.
+
+        Args:
+            mutation_context (MutationContext): Mutation context.
+
+        Returns:
+            list: Segments (bytes or memoryview) of child data.
+        """
+        render_cache = get_render_cache(self.request)
+        segments = []
         for item in self.stack:
-            rendered += item.render(mutation_context=mutation_context)
-        return rendered
+            if render_cache is None:
+                segments.extend(item.render_segments(mutation_context=mutation_context))
+            else:
+                segments.extend(render_cache.render_segments(item, mutation_context=mutation_context))
+        return segments
 
     def encode(self, value, mutation_context):
         return self.get_child_data(mutation_context=mutation_context)
 
+    def render_segments(self, mutation_context=None):
+        if type(self).encode is not FuzzableBlock.encode:
+            # subclass transforms the child data
+            return super(FuzzableBlock, self).render_segments(mutation_context=mutation_context)
+        return self.get_child_segments(mutation_context=mutation_context)
+
     def push(self, item):
         """Push a child element onto this block's stack.
 
@@ -1,5 +1,6 @@
 import errno
 import importlib.metadata
+import logging
 import os
 import re
 import signal
@@ -28,6 +29,7 @@ COLOR_PAIR_BLACK = 7
 
 test_step_info = {
     "test_case": {
+        "level": logging.INFO,
         "indent": 0,
         "title": "Test Case",
         "html": "Test Case: {msg}",
@@ -36,6 +38,7 @@ test_step_info = {
         "curses": COLOR_PAIR_YELLOW,
     },
     "step": {
+        "level": logging.INFO,
         "indent": 1,
         "title": "Test Step",
         "html": " Test Step: {msg}",
@@ -44,6 +47,7 @@ test_step_info = {
         "curses": COLOR_PAIR_MAGENTA,
     },
     "info": {
+        "level": logging.INFO,
         "indent": 2,
         "title": "Info",
         "html": "Info: {msg}",
@@ -52,6 +56,7 @@ test_step_info = {
         "curses": COLOR_PAIR_WHITE,
     },
     "error": {
+        "level": logging.ERROR,
         "indent": 2,
         "title": "Error",
         "html": "Error!!!! {msg}",
@@ -60,6 +65,7 @@ test_step_info = {
         "curses": COLOR_PAIR_RED,
     },
     "send": {
+        "level": logging.DEBUG,
         "indent": 2,
         "title": "Transmitted",
         "html": "Transmitted {n} bytes{note}: {msg}",
@@ -68,6 +74,7 @@ test_step_info = {
         "curses": COLOR_PAIR_CYAN,
     },
     "receive": {
+        "level": logging.DEBUG,
         "indent": 2,
         "title": "Received",
         "html": "Received{note}: {msg}",
@@ -76,6 +83,7 @@ test_step_info = {
         "curses": COLOR_PAIR_CYAN,
     },
     "check": {
+        "level": logging.INFO,
         "indent": 2,
         "title": "Check",
         "html": "Check: {msg}",
@@ -84,6 +92,7 @@ test_step_info = {
         "curses": COLOR_PAIR_WHITE,
     },
     "fail": {
+        "level": logging.ERROR,
         "indent": 3,
         "title": "Check Failed",
         "html": "Check Failed: {msg}",
@@ -92,6 +101,7 @@ test_step_info = {
         "curses": COLOR_PAIR_RED,
     },
     "pass": {
+        "level": logging.INFO,
         "indent": 3,
         "title": "Check OK",
         "html": "Check OK: {msg}",
@@ -339,8 +349,9 @@ def pause_for_signal():
             time.sleep(0.001)
 
 
-def get_time_stamp():
-    t = time.time()
+def get_time_stamp(t=None):
+    if t is None:
+        t = time.time()
     s = time.strftime("[%Y-%m-%d %H:%M:%S", time.localtime(t))
     s += ",%03d]" % (t * 1000 % 1000)
     return s
@@ -357,7 +368,14 @@ def _indent_after_first_line(lines, amount, ch=" "):
 
 
 def format_log_msg(
-    msg_type, description=None, data=None, indent_size=2, timestamp=None, truncated=False, format_type="terminal"
+    msg_type,
+    description=None,
+    data=None,
+    indent_size=2,
+    timestamp=None,
+    truncated=False,
+    format_type="terminal",
+    max_data_bytes=None,
 ):
     curses_mode = False
     if data is None:
@@ -371,7 +389,9 @@ def format_log_msg(
     if description is not None and description != "":
         msg = description
     elif data is not None and len(data) > 0:
-        msg = hex_to_hexstr(input_bytes=data)
+        msg = hex_to_hexstr(input_bytes=data[:max_data_bytes])
+        if max_data_bytes is not None and len(data) > max_data_bytes:
+            msg += " ... ({0} more bytes)".format(len(data) - max_data_bytes)
     else:
         msg = ""
 
@@ -0,0 +1,88 @@
+import bisect
+
+from .blocks.block import Block
+from .fuzzable_block import FuzzableBlock
+
+# FuzzableBlock types whose mutations are exactly the mutations of their children (plus group repetitions).
+_CHILD_MUTATIONS = (FuzzableBlock.mutations, Block.mutations)
+
+
+class MutationIndex:
+    """Offset index over the mutations of a Request.
+
+    Request.get_mutations() yields the mutations of one element after another, recursing into blocks and repeating
+    the children of blocks tied to a group once per group value. MutationIndex flattens this walk into segments of
+    consecutive mutations of a single element, keyed by the index of their first mutation. Finding the element behind
+    a request-level mutation index is then a bisection instead of exhausting all earlier mutations.
+
+    Args:
+        request (Request): Request to index. The index is only valid as long as the request is not modified.
+    """
+
+    def __init__(self, request):
+        self.request = request
+        self.num_mutations = 0
+        self._starts = []
+        self._segments = []  # (element, number of mutations, tuple of (group, group mutation index))
+
+        self._add_children(request, prefix=())
+
+    def _add_children(self, block, prefix):
+        for item in block.stack:
+            self._add_element(item, prefix)
+
+    def _add_element(self, item, prefix):
+        if not item.fuzzable:
+            return
+        if isinstance(item, FuzzableBlock) and type(item).mutations in _CHILD_MUTATIONS and not item._fuzz_values:
+            self._add_children(item, prefix)
+            if getattr(item, "group", None) is not None:
+                group = item.request.resolve_name(item.context_path, item.group)
+                for group_index in range(group.get_num_mutations()):
+                    self._add_children(item, prefix + ((group, group_index),))
+        else:
+            num_mutations = item.get_num_mutations()
+            if num_mutations > 0:
+                self._starts.append(self.num_mutations)
+                self._segments.append((item, num_mutations, prefix))
+                self.num_mutations += num_mutations
+
+    def locate(self, index):
+        """Find the element mutated by the request-level mutation index.
+
+        Args:
+            index (int): Zero-based index into the mutations yielded by Request.get_mutations().
+
+        Returns:
+            tuple: (qualified name of the element, index of the mutation within the element)
+
+        Raises:
+            IndexError: If index is out of range.
+        """
+        segment, element_index = self._find(index)
+        return self._segments[segment][0].qualified_name, element_index
+
+    def iter_from(self, index):
+        """Yield the same mutations as Request.get_mutations(), starting at the given mutation index.
+
+        Args:
+            index (int): Zero-based index of the first mutation to yield.
+
+        Yields:
+            list of Mutation: Mutations
+        """
+        segment, element_index = self._find(index)
+        for element, _, prefix in self._segments[segment:]:
+            prefix_mutations = []
+            for group, group_index in prefix:
+                prefix_mutations += next(group.get_mutations(start=group_index))
+            self.request.mutant = element
+            for mutations in element.get_mutations(start=element_index):
+                yield prefix_mutations + mutations
+            element_index = 0
+
+    def _find(self, index):
+        if not 0 <= index < self.num_mutations:
+            raise IndexError("mutation index {0} out of range for {1}".format(index, self.request.name))
+        segment = bisect.bisect_right(self._starts, index) - 1
+        return segment, index - self._starts[segment]
@@ -0,0 +1,199 @@
+from . import blocks, exception, primitives
+from .protocol_session_reference import ProtocolSessionReference
+
+# Attributes that name other elements whose rendering the owning element reads, e.g. Size.block_name,
+# Checksum._block_name, Mirror._primitive_name, Repeat.block_name and Block.dep.
+_REFERENCE_ATTRIBUTES = (
+    "block_name",
+    "_block_name",
+    "_primitive_name",
+    "_ipv4_src_block_name",
+    "_ipv4_dst_block_name",
+    "dep",
+)
+
+
+def _cacheable_types():
+    return frozenset(
+        (
+            blocks.Aligned,
+            blocks.Block,
+            blocks.Checksum,
+            blocks.Repeat,
+            blocks.Request,
+            blocks.Size,
+            primitives.BitField,
+            primitives.Byte,
+            primitives.Bytes,
+            primitives.Delim,
+            primitives.DWord,
+            primitives.Float,
+            primitives.FromFile,
+            primitives.Group,
+            primitives.Mirror,
+            primitives.QWord,
+            primitives.RandomData,
+            primitives.Simple,
+            primitives.Static,
+            primitives.String,
+            primitives.Word,
+        )
+    )
+
+
+class RenderCache:
+    """Cache of the default rendering of the elements of a Request.
+
+    A test case usually mutates one or two elements, so most of a request renders exactly as it does without
+    mutations. For every element, RenderCache knows the qualified names whose mutation changes the element's rendering:
+    the element itself, its children and, through a dependency graph, the elements its rendering refers to (the block
+    of a Size or Checksum, the primitive of a Mirror, ...), recursively. :meth:`render` returns the cached default bytes
+    of an element unless the mutation context mutates one of these names, so a test case re-renders only the path from
+    the mutated elements up to the root and the elements referring to them.
+
+    Elements are never cached (volatile) if their rendering can change without a mutation: elements whose type is not
+    a built-in boofuzz type (and may therefore render anything), elements with a ProtocolSessionReference default
+    value, elements whose references form a cycle (these render differently while the cycle is being broken), and
+    everything that contains or refers to a volatile element.
+
+    Use :func:`get_render_cache` to obtain the cache of a request. The cache is rebuilt when elements are added to the
+    request; call :meth:`invalidate` after changing element attributes such as default values.
+
+    Args:
+        request (Request): Request to cache renderings for.
+    """
+
+    def __init__(self, request):
+        self.request = request
+        self._num_names = len(request.names)
+        self._cacheable_types = _cacheable_types()
+        self._influences = {}  # qualified name -> frozenset of qualified names, or None if volatile
+        self._rendered = {}  # qualified name -> default rendering
+        for element in list(request.names.values()):
+            self._add_influences(element, stack=[])
+
+    @property
+    def is_stale(self):
+        """bool: True if elements were added to the request since the cache was built."""
+        return len(self.request.names) != self._num_names
+
+    def invalidate(self):
+        """Drop all cached renderings, e.g. after changing the default value of an element."""
+        self._rendered = {}
+
+    def render(self, element, mutation_context=None):
+        """Render element, using its cached default rendering if mutation_context does not affect it.
+
+        Args:
+            element (Fuzzable): Element of the request.
+            mutation_context (MutationContext): Mutation context, if any.
+
+        Returns:
+            bytes: Rendered element.
+        """
+        influences = self._influences.get(element.qualified_name)
+        if influences is None or self.request.names.get(element.qualified_name) is not element:
+            return element.render(mutation_context=mutation_context)
+        if mutation_context is not None and not influences.isdisjoint(mutation_context.mutations):
+            return element.render(mutation_context=mutation_context)
+
+        rendered = self._rendered.get(element.qualified_name)
+        if rendered is None:
+            rendered = element.render(mutation_context=mutation_context)
+            self._rendered[element.qualified_name] = rendered
+        return rendered
+
+    def render_segments(self, element, mutation_context=None):
+        """Like :meth:`render`, but return the rendering as a list of bytes-like segments.
+
+        An unaffected element is a single memoryview of its cached rendering; affected elements are asked for their
+        own segments, so the mutated parts are not concatenated with the cached parts.
+
+        Args:
+            element (Fuzzable): Element of the request.
+            mutation_context (MutationContext): Mutation context, if any.
+
+        Returns:
+            list: Segments (bytes or memoryview) of the rendered element.
+        """
+        influences = self._influences.get(element.qualified_name)
+        if (
+            influences is None
+            or self.request.names.get(element.qualified_name) is not element
+            or (mutation_context is not None and not influences.isdisjoint(mutation_context.mutations))
+        ):
+            return element.render_segments(mutation_context=mutation_context)
+        return [memoryview(self.render(element, mutation_context=mutation_context))]
+
+    def _add_influences(self, element, stack):
+        """Compute the influences of element and everything it depends on; mark volatile elements with None.
+
+        Args:
+            element (Fuzzable): Element to compute.
+            stack (list of str): Qualified names of the elements whose computation is in progress, i.e. that depend on
+                element.
+
+        Returns:
+            frozenset: Influences of element, or None if element is volatile.
+        """
+        name = element.qualified_name
+        if name in self._influences:
+            return self._influences[name]
+        if name in stack:
+            # reference cycle: all elements on the cycle depend on themselves
+            for dependent in stack[stack.index(name) :]:
+                self._influences[dependent] = None
+            return None
+
+        volatile = type(element) not in self._cacheable_types or isinstance(
+            getattr(element, "_default_value", None), ProtocolSessionReference
+        )
+        influences = {name}
+        stack.append(name)
+        for dependency in self._dependencies(element):
+            if dependency is None:
+                volatile = True
+                continue
+            dependency_influences = self._add_influences(dependency, stack)
+            if dependency_influences is None:
+                volatile = True
+            else:
+                influences.update(dependency_influences)
+        stack.pop()
+
+        if volatile or self._influences.get(name, False) is None:
+            self._influences[name] = None
+            return None
+        self._influences[name] = frozenset(influences)
+        return self._influences[name]
+
+    def _dependencies(self, element):
+        """Yield the children and referenced elements of element, or None for references that cannot be resolved."""
+        for child in getattr(element, "stack", ()):
+            yield child
+        for attribute in _REFERENCE_ATTRIBUTES:
+            referenced_name = getattr(element, attribute, None)
+            if not isinstance(referenced_name, str):
+                continue
+            try:
+                yield self.request.resolve_name(element.context_path, referenced_name)
+            except exception.BoofuzzNameResolutionError:
+                yield None
+
+
+def get_render_cache(request):
+    """Get the render cache of a request, building it on first use or after elements were added.
+
+    Args:
+        request (Request): Request. May be None.
+
+    Returns:
+        RenderCache: Render cache, or None if there is no request.
+    """
+    if request is None or not hasattr(request, "names"):
+        return None
+    cache = getattr(request, "_render_cache", None)
+    if cache is None or cache.is_stale:
+        cache = RenderCache(request)
+        request._render_cache = cache
+    return cache
@@ -1,11 +1,20 @@
 import abc
+import errno
 import math
 import os
 import socket
+import ssl
 import struct
+import sys
 
+from boofuzz import exception
 from boofuzz.connections import itarget_connection
 
+try:
+    _IOV_MAX = os.sysconf("SC_IOV_MAX")
+except (AttributeError, ValueError, OSError):
+    _IOV_MAX = 1024
+
 
 def _seconds_to_sockopt_format(seconds):
     """Convert floating point seconds value to second/useconds struct used by UNIX socket library.
@@ -20,6 +29,20 @@ def _seconds_to_sockopt_format(seconds):
         return struct.pack("ll", whole_seconds, whole_microseconds)
 
 
+def _truncate_segments(segments, max_size):
+    """Cut a list of bytes-like segments down to max_size bytes in total, without copying."""
+    truncated = []
+    remaining = max_size
+    for segment in segments:
+        if remaining <= 0:
+            break
+        if len(segment) > remaining:
+            segment = memoryview(segment)[:remaining]
+        truncated.append(segment)
+        remaining -= len(segment)
+    return truncated
+
+
 class BaseSocketConnection(itarget_connection.ITargetConnection, metaclass=abc.ABCMeta):
     """This class serves as a base for a number of Connections over sockets.
 
@@ -55,3 +78,43 @@ class BaseSocketConnection(itarget_connection.ITargetConnection, metaclass=abc.A
         """
         self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDTIMEO, _seconds_to_sockopt_format(self._send_timeout))
         self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVTIMEO, _seconds_to_sockopt_format(self._recv_timeout))
+
+    def _send_segments(self, segments, max_size=None, address=None):
+        """
+        Send a list of bytes-like segments as one message using scatter/gather I/O (socket.sendmsg).
+
+        Falls back to concatenating the segments if sendmsg is not available (e.g. on Windows or for SSL sockets) or
+        there are more segments than the OS accepts in one call.
+
+        Args:
+            segments (list): Segments (bytes or memoryview) of the data to send.
+            max_size (int): Truncate the data to this many bytes. Default None.
+            address: Destination address for unconnected sockets (as for sendto). Default None.
+
+        Returns:
+            int: Number of bytes actually sent.
+        """
+        if max_size is not None:
+            segments = _truncate_segments(segments, max_size)
+
+        use_sendmsg = (
+            len(segments) <= _IOV_MAX and hasattr(self._sock, "sendmsg") and not isinstance(self._sock, ssl.SSLSocket)
+        )
+        try:
+            if not use_sendmsg:
+                data = b"".join(segments)
+                if address is None:
+                    return self._sock.send(data)
+                return self._sock.sendto(data, address)
+            if address is None:
+                return self._sock.sendmsg(segments)
+            return self._sock.sendmsg(segments, [], 0, address)
+        except socket.error as e:
+            if e.errno == errno.ECONNABORTED:
+                raise exception.BoofuzzTargetConnectionAborted(
+                    socket_errno=e.errno, socket_errmsg=e.strerror
+                ).with_traceback(sys.exc_info()[2])
+            elif e.errno in [errno.ECONNRESET, errno.ENETRESET, errno.ETIMEDOUT, errno.EPIPE]:
+                raise exception.BoofuzzTargetConnectionReset().with_traceback(sys.exc_info()[2])
+            else:
+                raise
@@ -56,6 +56,21 @@ class ITargetConnection(metaclass=abc.ABCMeta):
         """
         raise NotImplementedError
 
+    def send_segments(self, segments):
+        """
+        Send data given as a list of bytes-like segments, e.g. from Fuzzable.render_segments, to the target.
+
+        Override to transmit the segments without concatenating them first, e.g. with scatter/gather I/O.
+        Default: Concatenate the segments and call send.
+
+        :param segments: Segments (bytes or memoryview) of the data to send.
+        :type segments: list
+
+        :return: Number of bytes actually sent.
+        :rtype: int
+        """
+        return self.send(data=b"".join(segments))
+
     @property
     @abc.abstractmethod
     def info(self):
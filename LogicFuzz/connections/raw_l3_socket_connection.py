@@ -113,6 +113,22 @@ class RawL3SocketConnection(base_socket_connection.BaseSocketConnection):
 
         return num_sent
 
+    def send_segments(self, segments):
+        """
+        Send data given as a list of segments to the target with scatter/gather I/O. Only valid after calling open!
+        Data will be trunctated to self.packet_size (Default: 1500
+        bytes).
+
+        Args:
+            segments (list): Segments (bytes or memoryview) of the data to send.
+
+        Returns:
+            int: Number of bytes actually sent.
+        """
+        return self._send_segments(
+            segments, max_size=self.packet_size, address=(self.interface, self.ethernet_proto, 0, 0, self.l2_dst)
+        )
+
     @property
     def info(self):
         return "{0}, type 0x{1:04x}".format(self.interface, self.ethernet_proto)
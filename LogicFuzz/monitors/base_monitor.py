@@ -51,6 +51,31 @@ class BaseMonitor:
         """
         return True
 
+    def post_test_case(self, target=None, fuzz_data_logger=None, session=None, retrieve_data=False):
+        """
+        Called after the current fuzz node is transmitted instead of separate
+        calls to post_send, get_crash_synopsis and retrieve_data. Remote
+        monitors SHOULD override it to answer with a single round trip.
+
+        Returns a tuple (alive, synopsis, data):
+
+        - alive is the result of post_send.
+        - synopsis is the crash synopsis, or None if it was not asked for. The
+          session asks get_crash_synopsis for it if this or another monitor
+          detected a crash.
+        - data is the result of retrieve_data if retrieve_data is True, None
+          otherwise.
+
+        Defaults to call post_send, get_crash_synopsis if post_send reported
+        a crash, and retrieve_data.
+
+        :returns: tuple
+        """
+        alive = self.post_send(target=target, fuzz_data_logger=fuzz_data_logger, session=session)
+        synopsis = None if alive else self.get_crash_synopsis()
+        data = self.retrieve_data() if retrieve_data else None
+        return alive, synopsis, data
+
     def post_start_target(self, target=None, fuzz_data_logger=None, session=None):
         """Called after a target is started or restarted."""
         return
@@ -24,16 +24,19 @@ class NetworkMonitor(BaseMonitor, pedrpc.Client):
     this explicit proxy class has been introduced that
     fast-forwards all calls to the RPC partner.
 
+    Pass codec="struct" to only talk to agents that do not use pickle.
+
     .. versionadded:: 0.2.0
     """
 
-    def __init__(self, host, port):
+    def __init__(self, host, port, codec=None):
         BaseMonitor.__init__(self)
-        pedrpc.Client.__init__(self, host, port)
+        pedrpc.Client.__init__(self, host, port, codec=codec)
 
         self.server_options = {}
         self.host = host
         self.port = port
+        self._test_number = None  # test case of the last pre_send, the daemon keeps a pcap per test case
 
     def alive(self):
         """This method is forwarded to the RPC daemon."""
@@ -41,15 +44,33 @@ class NetworkMonitor(BaseMonitor, pedrpc.Client):
 
     def pre_send(self, target=None, fuzz_data_logger=None, session=None):
         """This method is forwarded to the RPC daemon."""
-        return self.__method_missing("pre_send", session.total_mutant_index)
+        self._test_number = session.total_mutant_index
+        return self.__method_missing("pre_send", self._test_number)
 
     def post_send(self, target=None, fuzz_data_logger=None, session=None):
         """This method is forwarded to the RPC daemon."""
         return self.__method_missing("post_send")
 
     def retrieve_data(self):
-        """This method is forwarded to the RPC daemon."""
-        return self.__method_missing("retrieve")
+        """This method is forwarded to the RPC daemon, for the test case of the last pre_send."""
+        if self._test_number is None:
+            return None
+        return self.__method_missing("retrieve", self._test_number)
+
+    def get_crash_synopsis(self):
+        """This method is forwarded to the RPC daemon, which saves the packets of the failed test case."""
+        return self.__method_missing("get_crash_synopsis")
+
+    def post_test_case(self, target=None, fuzz_data_logger=None, session=None, retrieve_data=False):
+        """post_send and retrieve are forwarded to the RPC daemon in one round trip.
+
+        The synopsis is left to get_crash_synopsis, so the daemon only saves packets of failed test cases.
+        """
+        calls = [("post_send", (), {})]
+        if retrieve_data:
+            calls.append(("retrieve", (session.total_mutant_index,), {}))
+        results = self.pipeline_calls(calls)
+        return results[0], None, results[1] if retrieve_data else None
 
     def set_options(self, *args, **kwargs):
         """
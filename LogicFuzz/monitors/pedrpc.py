@@ -1,22 +1,99 @@
+import asyncio
+import collections
 import errno
-import pickle
 import select
 import socket
 import struct
 import sys
+import threading
 import time
+import traceback
 import uuid
 
 from boofuzz import exception
+from . import pedrpc_codec
+
+# Version 1 opens a connection per call. Version 2 keeps the connection open and tags each call with a request id, so
+# calls can be pipelined. Servers of version 2 greet with (instance uuid, version) instead of the bare uuid; clients
+# speak version 2 only to those. Clients of version 3 announce their version after the greeting, and then get the
+# highest pickle protocol and StreamedBytes results in chunks.
+PROTOCOL_VERSION = 3
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class StreamedBytes:
+    """
+    Return value of a server method whose bytes are sent to clients of protocol version 3 in chunks, so the server
+    never holds all of them. Clients receive bytes, as from any other method.
+
+    Args:
+        chunks (iterable of bytes): The bytes, in chunks.
+    """
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    @classmethod
+    def from_file(cls, filename, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Stream the contents of a file, which is read while sending."""
+
+        def read_chunks():
+            with open(filename, "rb") as f:
+                for chunk in iter(lambda: f.read(chunk_size), b""):
+                    yield chunk
+
+        return cls(read_chunks())
+
+    def read_all(self):
+        """Join all chunks, for clients of protocol version 1 and 2."""
+        return b"".join(self.chunks)
+
+
+class Blocking:
+    """
+    Return value of a server method that has to wait, e.g. for another thread. The server calls function in a worker
+    thread and replies with its return value, while it keeps serving the other clients. function must not touch state
+    the other methods change without locking it.
+
+    Args:
+        function (callable): Takes no arguments and returns the result of the call.
+    """
+
+    def __init__(self, function):
+        self.function = function
 
 
 class Client:
-    def __init__(self, host, port):
+    """
+    PED-RPC client, calling any method it does not have on the server.
+
+    Against servers of protocol version 2, all calls go over one long-lived connection, which is reopened when the
+    server closed it between calls or a call could not be sent. A reply lost to a broken connection is returned as
+    None, as with version 1, since the server may have executed the call. Calls from several threads share the
+    connection one after the other.
+
+    Messages are encoded with the codec the server chose, see :mod:`pedrpc_codec`.
+
+    Args:
+        host (str): Server host.
+        port (int): Server port.
+        persistent (bool): Use a long-lived connection if the server supports it. Default True.
+        codec (str): Only talk to servers using this codec, e.g. "struct" to never unpickle anything. Default None
+            (any codec).
+    """
+
+    def __init__(self, host, port, persistent=True, codec=None):
         self.__host = host
         self.__port = port
         self.__dbg_flag = False
         self.__server_sock = None
         self.__retry = 0
+        self.__persistent = persistent
+        self.__required_codec = None if codec is None else pedrpc_codec.get_codec(codec)
+        self.__codec = pedrpc_codec.get_codec("pickle")  # codec of the current connection
+        self.__protocol = 1  # protocol version of the current connection
+        self.__request_id = 0
+        self.__lock = threading.RLock()
         self.NOLINGER = struct.pack("ii", 1, 0)
         self.known_server = None
 
@@ -113,33 +190,153 @@ class Client:
         if method_name.startswith("__"):
             return
 
-        # connect to the PED-RPC server.
+        return self.__call([(method_name, args, kwargs)])[0]
+
+    @property
+    def protocol_version(self):
+        """Protocol version of the last connection to the server, 1 before the first call."""
+        return self.__protocol
+
+    def pipeline_calls(self, calls):
+        """
+        Call several methods of the server in one round trip. The calls are sent together and executed in order.
+
+        Against servers of protocol version 1, the calls are made one by one.
+
+        @type  calls: list
+        @param calls: (method name, args tuple, kwargs dict) of each call.
+
+        @rtype:  list
+        @return: Return values of the calls.
+        """
+        return self.__call(list(calls))
+
+    def __call(self, calls):
+        with self.__lock:
+            if self.__server_sock is None or self.__connection_closed():
+                self.__open()
+            if self.__protocol < 2:
+                return [self.__legacy_call(*call) for call in calls]
+
+            requests = self.__requests(calls)
+            try:
+                self.__send_messages(requests)
+            except exception.BoofuzzRpcError:
+                # no reply was received, so the requests are sent again on a new connection
+                self.__open()
+                if self.__protocol < 2:
+                    return [self.__legacy_call(*call) for call in calls]
+                self.__send_messages(requests)
+            return self.__receive_replies([request[0] for request in requests])
+
+    def __open(self):
+        """
+        Connect to the PED-RPC server and negotiate the protocol version from its greeting.
+        """
         self.__connect()
+        payload = self.__recv_frame()
+        greeting = None
+        if payload is not None:
+            self.__codec = pedrpc_codec.codec_of_frame(payload)
+            if self.__required_codec not in (None, self.__codec):
+                self.__disconnect()
+                raise exception.BoofuzzRpcError(
+                    "PED-RPC> server {0}:{1} uses the {2} codec, not {3}".format(
+                        self.__host, self.__port, self.__codec.name, self.__required_codec.name
+                    )
+                )
+            greeting = self.__codec.decode(payload)
+        if isinstance(greeting, tuple) and len(greeting) == 2:
+            server_uuid, version = greeting
+        else:
+            server_uuid, version = greeting, 1
+        self.__protocol = min(version, PROTOCOL_VERSION) if self.__persistent else 1
+        self.__debug("connected to server {0}, protocol version {1}".format(server_uuid, self.__protocol))
+        if self.__protocol >= 3:
+            self.__send_messages([(self.__protocol,)])
 
-        server_uuid = self.__pickle_recv()
         if server_uuid != self.known_server:
             self.on_new_server(server_uuid)
             self.known_server = server_uuid
 
+    def __connection_closed(self):
+        """
+        Check whether the server closed the idle connection, e.g. because it was restarted.
+        """
+        if self.__protocol < 2:
+            return False
+        # the server never sends anything unasked, so a readable connection was closed or reset
+        readable, _, _ = select.select([self.__server_sock], [], [], 0)
+        if readable:
+            self.__disconnect()
+            return True
+        return False
+
+    def __legacy_call(self, method_name, args, kwargs):
+        if self.__server_sock is None:
+            self.__open()
+
         # transmit the method name and arguments.
-        self.__pickle_send((method_name, (args, kwargs)))
+        self.__send_messages([(method_name, (args, kwargs))])
 
         # snag the return value.
-        ret = self.__pickle_recv()
+        ret = self.__recv_message()
 
         # close the sock and return.
         self.__disconnect()
         return ret
 
+    def __requests(self, calls):
+        requests = []
+        for method_name, args, kwargs in calls:
+            self.__request_id += 1
+            requests.append((self.__request_id, method_name, tuple(args), dict(kwargs)))
+        return requests
+
+    def __receive_replies(self, request_ids):
+        replies = {}
+        for request_id in request_ids:
+            while request_id not in replies:
+                reply = self.__recv_message()
+                if reply is None:
+                    # connection lost, the server may have executed the calls whose replies are missing
+                    self.__disconnect()
+                    return [replies.get(i) for i in request_ids]
+                # (request id, None, True) announces a StreamedBytes result, sent in chunks
+                replies[reply[0]] = self.__recv_chunks() if len(reply) == 3 else reply[1]
+        return [replies[i] for i in request_ids]
+
+    def __recv_chunks(self):
+        """
+        Receive the chunks of a StreamedBytes result, which end with an empty chunk.
+        """
+        chunks = []
+        while True:
+            chunk = self.__recv_frame()
+            if chunk is None:
+                self.__disconnect()
+                raise exception.BoofuzzRpcError(
+                    "PED-RPC> connection to server {0}:{1} severed while streaming".format(self.__host, self.__port)
+                )
+            if not chunk:
+                return b"".join(chunks)
+            chunks.append(chunk)
+
     def __hot_transmit(self, data):
-        self.__pickle_send(data)
-        self.__pickle_recv()
+        if self.__protocol >= 2:
+            method_name, (args, kwargs) = data
+            requests = self.__requests([(method_name, args, kwargs)])
+            self.__send_messages(requests)
+            self.__receive_replies([requests[0][0]])
+            return
+        self.__send_messages([data])
+        self.__recv_message()
         self.__disconnect()
         self.__connect()
         # Grab the instance id. assume it hasn't changed, otherwise we're doomed.
-        self.__pickle_recv()
+        self.__recv_frame()
 
-    def __pickle_recv(self):
+    def __recv_message(self):
         """
         This routine is used for marshaling arbitrary data from the PyDbg server. We can send pretty much anything here.
         For example a tuple containing integers, strings, arbitrary objects and structures. Our "protocol" is a simple
@@ -150,49 +347,63 @@ class Client:
         @return:    Whatever is received over the socket.
         """
 
+        payload = self.__recv_frame()
+        if payload is None:
+            return None
+        return self.__codec.decode(payload)
+
+    def __recv_frame(self):
+        """
+        Receive the payload of one frame.
+
+        @raise pdx: An exception is raised if the connection was severed.
+        @rtype:     bytearray
+        @return:    The payload, None if its length could not be received.
+        """
+
         try:
             # TODO: this should NEVER fail, but alas, it does and for the time being i can't figure out why.
             #       it gets worse. you would think that simply returning here would break things, but it doesn't.
             #       gotta track this down at some point.
-            recvd = self.__server_sock.recv(4)
+            recvd = _recv_exactly(self.__server_sock, 4)
             length = struct.unpack("<L", recvd)[0]
         except Exception:
             return
 
         try:
-            received = b""
-
-            while length:
-                chunk = self.__server_sock.recv(length)
-                received += chunk
-                length -= len(chunk)
-        except socket.error as e:
+            received = _recv_exactly(self.__server_sock, length)
+        except (socket.error, EOFError) as e:
+            self.__disconnect()
             raise exception.BoofuzzRpcError(
                 "PED-RPC> unable to connect to server "
                 '{0}:{1}. Error message: "{2}"\n'.format(self.__host, self.__port, e)
             )
 
-        return pickle.loads(received)
+        return received
 
-    def __pickle_send(self, data):
+    def __send_messages(self, messages):
         """
         This routine is used for marshaling arbitrary data to the PyDbg server. We can send pretty much anything here.
         For example a tuple containing integers, strings, arbitrary objects and structures. Our "protocol" is a simple
         length-value protocol where each datagram is prefixed by a 4-byte length of the data to be received.
 
-        @type  data: Mixed
-        @param data: Data to marshal and transmit. Data can *pretty much* contain anything you throw at it.
+        @type  messages: list
+        @param messages: Data to marshal and transmit at once.
 
         @raise pdx: An exception is raised if the connection was severed.
         """
-
-        data = pickle.dumps(data, protocol=2)
+        frames = []
+        for message in messages:
+            data = self.__codec.encode(message, self.__protocol)
+            frames.append(struct.pack("<L", len(data)))
+            frames.append(data)
+        data = b"".join(frames)
         self.__debug("sending %d bytes" % len(data))
 
         try:
-            self.__server_sock.send(struct.pack("<L", len(data)))
-            self.__server_sock.send(data)
-        except socket.error as e:
+            self.__server_sock.sendall(data)
+        except (socket.error, AttributeError) as e:
+            self.__disconnect()
             raise exception.BoofuzzRpcError(
                 "PED-RPC> unable to connect to server "
                 '{0}:{1}. Error message: "{2}"\n'.format(self.__host, self.__port, e)
@@ -207,15 +418,30 @@ class Server:
     """
     The main PED-RPC Server class. To implement an RPC server, inherit from this class. Call ``serve_forever`` to start
     listening for RPC commands.
+
+    The server runs an asyncio event loop, which reads and answers the requests of all connected clients as soon as
+    they arrive. The methods are called one at a time in the thread of ``serve_forever``, so subclasses need no
+    locking. A method that has to wait returns a :class:`Blocking` result instead of holding up all clients. Clients of
+    protocol version 1 disconnect after each call, clients of version 2 and 3 keep their connection open.
+
+    Args:
+        host (str): Address to listen on.
+        port (int): Port to listen on.
+        codec (str): Codec of the messages, see :mod:`pedrpc_codec`. Clients older than version 3 only speak
+            "pickle". Use "struct" if untrusted hosts can connect, as unpickling a message can execute arbitrary code.
+            Default "pickle".
     """
 
-    def __init__(self, host, port):
+    def __init__(self, host, port, codec="pickle"):
         self.__host = host
         self.__port = port
         self.__dbg_flag = False
-        self.__client_sock = None
-        self.__client_address = None
+        self.__codec = pedrpc_codec.get_codec(codec)
+        self.__clients = set()  # _ServerSession of each connected client
         self.__running = True
+        self.__loop = None  # event loop of serve_forever, while it runs
+        self.__stopped = None  # asyncio.Event set by stop
+        self.__state_lock = threading.Lock()
 
         # This is a bad solution for a problem that should not even exist in the first place.
         # The Problem is that the client disconnects after each RPC call,
@@ -230,9 +456,8 @@ class Server:
         # to re-send any initialisation code. This is implemented by the server
         # generating a random uuid on startup and sending it to each new connection.
         #
-        # In a perfect world, this protocol wouldn't reconnect for every command
-        # and options were associated with a connection, but at the moment I don't
-        # feel like cleaning up this mess.
+        # Clients of protocol version 2 keep their connection, but a restarted
+        # server still closes it, so the uuid is sent all the same.
         self.__instance = uuid.uuid4()
 
         try:
@@ -241,125 +466,245 @@ class Server:
             self.__server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             self.__server.settimeout(None)
             self.__server.bind((host, port))
-            self.__server.listen(1)
+            self.__server.listen(5)
         except socket.error:
             sys.stderr.write("unable to bind to %s:%d\n" % (host, port))
             sys.exit(1)
 
-    def __disconnect(self):
-        """
-        Ensure the socket is torn down.
-        """
-
-        if self.__client_sock is not None:
-            self.__debug("closing client socket")
-            try:
-                self.__client_sock.shutdown(socket.SHUT_RDWR)
-            except socket.error as e:
-                if e.errno in [errno.ENOTCONN, errno.EBADF]:
-                    pass
-                else:
-                    raise
-            self.__client_sock.close()
-
     def __debug(self, msg):
         if self.__dbg_flag:
             print("PED-RPC> %s" % msg)
 
-    def __pickle_recv(self):
-        """
-        This routine is used for marshaling arbitrary data from the PyDbg server. We can send pretty much anything here.
-        For example a tuple containing integers, strings, arbitrary objects and structures. Our "protocol" is a simple
-        length-value protocol where each datagram is prefixed by a 4-byte length of the data to be received.
-
-        @raise pdx: An exception is raised if the connection was severed.
-        @rtype:     Mixed
-        @return:    Whatever is received over the socket.
-        """
-
+    def serve_forever(self):
+        self.__debug("serving up a storm")
+        asyncio.run(self.__serve())
+
+    async def __serve(self):
+        stopped = asyncio.Event()
+        with self.__state_lock:
+            if not self.__running:
+                return
+            self.__loop = asyncio.get_running_loop()
+            self.__stopped = stopped
+
+        # clients of version 1 take the greeting for the instance id, only the pickle codec keeps it a UUID
+        instance = self.__instance if self.__codec.name == "pickle" else str(self.__instance)
+        greeting = self.__codec.encode((instance, PROTOCOL_VERSION), 1)
         try:
-            length = struct.unpack("<L", self.__client_sock.recv(4))[0]
-            received = b""
+            server = await asyncio.get_running_loop().create_server(
+                lambda: _ServerSession(self.__call, self.__codec, greeting, self.__clients, self.__debug),
+                sock=self.__server,
+            )
+            async with server:
+                await stopped.wait()
+                for session in list(self.__clients):
+                    session.close()
+        finally:
+            with self.__state_lock:
+                self.__loop = None
 
-            while length:
-                chunk = self.__client_sock.recv(length)
-                received += chunk
-                length -= len(chunk)
-        except Exception:
-            sys.stderr.write("PED-RPC> connection client severed during recv()\n")
-            raise Exception
+    def __call(self, method_name, args, kwargs):
+        self.__debug("%s(args=%s, kwargs=%s)" % (method_name, args, kwargs))
 
-        return pickle.loads(received)
+        try:
+            method = getattr(self, method_name)
+        except AttributeError:
+            # if the method can't be found notify the user and raise an error
+            sys.stderr.write('PED-RPC> remote method "{0}" of {1} cannot be found\n'.format(method_name, self))
+            raise
+        return method(*args, **kwargs)
 
-    def __pickle_send(self, data):
+    def stop(self):
         """
-        This routine is used for marshaling arbitrary data to the PyDbg server. We can send pretty much anything here.
-        For example a tuple containing integers, strings, arbitrary objects and structures. Our "protocol" is a simple
-        length-value protocol where each datagram is prefixed by a 4-byte length of the data to be received.
-
-        @type  data: Mixed
-        @param data: Data to marshal and transmit. Data can *pretty much* contain anything you throw at it.
-
-        @raise pdx: An exception is raised if the connection was severed.
+        Stop serve_forever, from any thread, including from a method called by a client.
         """
-
-        data = pickle.dumps(data, protocol=2)
-        self.__debug("sending %d bytes" % len(data))
-
+        with self.__state_lock:
+            self.__running = False
+            loop, stopped = self.__loop, self.__stopped
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(stopped.set)
+            except RuntimeError:
+                pass  # the loop already closed
+            return
         try:
-            self.__client_sock.send(struct.pack("<L", len(data)))
-            self.__client_sock.send(data)
-        except Exception:
-            sys.stderr.write("PED-RPC> connection to client severed during send()\n")
-            raise Exception
-
-    def serve_forever(self):
-        self.__debug("serving up a storm")
-
-        while self.__running:
-            # close any pre-existing socket.
-            self.__disconnect()
-
-            # accept a client connection.
-            while self.__running:
-                readable, writeable, errored = select.select([self.__server], [], [], 0.1)
-                if len(readable) > 0:
-                    assert readable[0] == self.__server
-                    (self.__client_sock, self.__client_address) = self.__server.accept()
-                    break
+            self.__server.shutdown(socket.SHUT_RDWR)
+        except socket.error as e:
+            if e.errno == errno.ENOTCONN:
+                pass
+            else:
+                raise
+        self.__server.close()
 
-            self.__debug("accepted connection from %s:%d" % (self.__client_address[0], self.__client_address[1]))
 
-            self.__pickle_send(self.__instance)
+class _ServerSession(asyncio.Protocol):
+    """
+    Connection of one client to a Server. Decodes the requests as they arrive, calls the methods in order and writes
+    the replies.
+
+    Args:
+        call (callable): Takes method name, args and kwargs and returns the result of the method.
+        codec: Codec of the server, see :mod:`pedrpc_codec`.
+        greeting (bytes): Encoded greeting sent to the client on connect.
+        sessions (set): Sessions of the connected clients, this one adds itself while connected.
+        debug (callable): Logs debug messages.
+    """
 
-            # receive the method name and arguments, continue on socket disconnect.
+    def __init__(self, call, codec, greeting, sessions, debug):
+        self._call = call
+        self._codec = codec
+        self._greeting = greeting
+        self._sessions = sessions
+        self._debug = debug
+        self._transport = None
+        self._buffer = bytearray()
+        self._requests = collections.deque()
+        self._protocol_version = 1  # version announced by the client, 1 until it does
+        self._stream = None  # iterator over the chunks of the StreamedBytes result being sent
+        self._blocking = False  # the worker thread of a Blocking result has not returned yet
+        self._paused = False  # the transport's write buffer is full
+
+    def connection_made(self, transport):
+        self._transport = transport
+        self._sessions.add(self)
+        client_address = transport.get_extra_info("peername")
+        self._debug("accepted connection from %s:%d" % (client_address[0], client_address[1]))
+        # replies are written as soon as they are ready, don't let them wait for the acknowledgement of the last one
+        transport.get_extra_info("socket").setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._write_frame(self._greeting)
+
+    def connection_lost(self, exc):
+        self._debug("closing client socket")
+        self._sessions.discard(self)
+        self._requests.clear()
+        if self._stream is not None and hasattr(self._stream, "close"):
+            self._stream.close()
+        self._stream = None
+
+    def close(self):
+        self._transport.close()
+
+    def data_received(self, data):
+        self._buffer += data
+        while len(self._buffer) >= 4:
+            end = 4 + struct.unpack_from("<L", self._buffer)[0]
+            if len(self._buffer) < end:
+                break
+            payload = bytes(self._buffer[4:end])
+            del self._buffer[:end]
             try:
-                (method_name, (args, kwargs)) = self.__pickle_recv()
-                self.__debug("%s(args=%s, kwargs=%s)" % (method_name, args, kwargs))
+                self._requests.append(self._codec.decode(payload))
             except Exception:
+                sys.stderr.write("PED-RPC> connection client severed during recv()\n")
+                self.close()
+                return
+        self._process_requests()
+
+    def pause_writing(self):
+        self._paused = True
+
+    def resume_writing(self):
+        self._paused = False
+        if self._stream is not None:
+            self._send_chunks()
+
+    def _process_requests(self):
+        # replies go out in order, so the requests wait while a Blocking result runs or a StreamedBytes result is sent
+        while self._requests and self._stream is None and not self._blocking and not self._transport.is_closing():
+            request = self._requests.popleft()
+            if len(request) == 1:
+                # protocol version 3: the client announces its version after the greeting
+                self._protocol_version = min(request[0], PROTOCOL_VERSION)
                 continue
-
-            try:
-                method = getattr(self, method_name)
-            except AttributeError:
-                # if the method can't be found notify the user and raise an error
-                sys.stderr.write('PED-RPC> remote method "{0}" of {1} cannot be found\n'.format(method_name, self))
-                raise
-            ret = method(*args, **kwargs)
-            # transmit the return value to the client, continue on socket disconnect.
+            if len(request) == 2:
+                # protocol version 1: (method name, (args, kwargs)), the client disconnects after the reply
+                request_id = None
+                method_name, (args, kwargs) = request
+            else:
+                request_id, method_name, args, kwargs = request
+            # a method may also fail lazily through its StreamedBytes result, or return something the codec can't encode
             try:
-                self.__pickle_send(ret)
+                ret = self._call(method_name, args, kwargs)
+                if isinstance(ret, Blocking):
+                    self._blocking = True
+                    future = asyncio.get_running_loop().run_in_executor(None, ret.function)
+                    future.add_done_callback(lambda f, request_id=request_id: self._blocking_done(request_id, f))
+                    return
+                self._reply(request_id, ret)
             except Exception:
-                continue
+                self._drop_client()
+                return
 
-    def stop(self):
-        self.__running = False
-        self.__disconnect()
+    def _blocking_done(self, request_id, future):
+        """Reply with the result of a Blocking result's function and go on with the requests."""
+        self._blocking = False
         try:
-            self.__server.shutdown(socket.SHUT_RDWR)
-        except socket.error as e:
-            if e.errno == errno.ENOTCONN:
-                pass
-            else:
-                raise
-        self.__server.close()
+            ret = future.result()
+            if self._transport.is_closing():
+                return
+            self._reply(request_id, ret)
+        except Exception:
+            self._drop_client()
+            return
+        self._process_requests()
+
+    def _reply(self, request_id, ret):
+        if isinstance(ret, StreamedBytes):
+            if request_id is not None and self._protocol_version >= 3:
+                self._write_message((request_id, None, True))
+                self._stream = iter(ret.chunks)
+                self._send_chunks()
+                return
+            ret = ret.read_all()
+        # transmit the return value to the client.
+        self._write_message(ret if request_id is None else (request_id, ret))
+
+    def _send_chunks(self):
+        """
+        Send the chunks of a StreamedBytes result as frames of their own, followed by an empty frame. Pauses while the
+        write buffer of the transport is full.
+        """
+        while not self._paused and not self._transport.is_closing():
+            try:
+                chunk = next(self._stream, None)
+            except Exception:
+                self._stream = None
+                self._drop_client()
+                return
+            if chunk is None:
+                self._stream = None
+                self._write_frame(b"")
+                self._process_requests()
+                return
+            if chunk:
+                self._write_frame(chunk)
+
+    def _drop_client(self):
+        """Print the traceback of a failed call and close only this client's connection."""
+        traceback.print_exc()
+        self._requests.clear()
+        self.close()
+
+    def _write_message(self, message):
+        self._write_frame(self._codec.encode(message, self._protocol_version))
+
+    def _write_frame(self, payload):
+        self._debug("sending %d bytes" % len(payload))
+        self._transport.write(struct.pack("<L", len(payload)) + payload)
+
+
+def _recv_exactly(sock, length):
+    """
+    Receive exactly length bytes into a buffer allocated up front.
+
+    @raise EOFError: The connection was closed before.
+    """
+    received = bytearray(length)
+    view = memoryview(received)
+    position = 0
+    while position < length:
+        num_bytes = sock.recv_into(view[position:])
+        if not num_bytes:
+            raise EOFError("connection closed")
+        position += num_bytes
+    return received
@@ -0,0 +1,165 @@
+"""Serialization of PED-RPC messages.
+
+A codec turns a message into the payload of one length-prefixed frame and back. The server picks the codec and
+encodes its greeting with it, so the client can tell the codec of a connection from the first frame.
+"""
+
+import pickle
+import struct
+
+from boofuzz import exception
+
+
+class PickleCodec:
+    """
+    Pickles messages, which allows any picklable object. Only use it with peers you trust, as unpickling data can
+    execute arbitrary code.
+
+    Peers of protocol version 1 and 2 get pickle protocol 2, which stores bytes as latin-1 strings. Peers of
+    version 3 get the highest pickle protocol, which stores them as they are.
+    """
+
+    name = "pickle"
+
+    def encode(self, message, protocol_version=1):
+        protocol = pickle.HIGHEST_PROTOCOL if protocol_version >= 3 else 2
+        return pickle.dumps(message, protocol=protocol)
+
+    def decode(self, payload):
+        return pickle.loads(payload)
+
+
+class StructCodec:
+    """
+    Encodes None, bool, int, float, str, bytes and lists, tuples and dicts of these in a tagged length-prefixed
+    format. Decoding never creates other objects, so it is safe to use with untrusted peers.
+    """
+
+    name = "struct"
+
+    def encode(self, message, protocol_version=1):
+        parts = []
+        _encode(message, parts)
+        return b"".join(parts)
+
+    def decode(self, payload):
+        view = memoryview(payload)
+        try:
+            message, position = _decode(view, 0)
+        except (struct.error, UnicodeDecodeError, TypeError, RecursionError) as e:
+            raise exception.BoofuzzRpcError("PED-RPC> invalid message: {0}".format(e))
+        if position != len(view):
+            raise exception.BoofuzzRpcError("PED-RPC> {0} trailing bytes after message".format(len(view) - position))
+        return message
+
+
+CODECS = {codec.name: codec for codec in (PickleCodec(), StructCodec())}
+
+
+def get_codec(name):
+    """
+    Get a codec by name.
+
+    @type  name: str
+    @param name: "pickle" or "struct".
+
+    @raise BoofuzzRpcError: There is no codec of that name.
+    """
+    try:
+        return CODECS[name]
+    except KeyError:
+        raise exception.BoofuzzRpcError(
+            "PED-RPC> unknown codec {0!r}, choose one of {1}".format(name, ", ".join(sorted(CODECS)))
+        )
+
+
+def codec_of_frame(payload):
+    """
+    Tell the codec of a frame. Pickles of protocol 2 and higher start with the PROTO opcode, messages of the struct
+    codec with a type tag.
+    """
+    return CODECS["pickle"] if bytes(payload[:1]) == b"\x80" else CODECS["struct"]
+
+
+_INT = struct.Struct("<q")
+_FLOAT = struct.Struct("<d")
+_LENGTH = struct.Struct("<L")
+_INT_MIN, _INT_MAX = -(2**63), 2**63 - 1
+
+
+def _encode(value, parts):
+    if value is None:
+        parts.append(b"N")
+    elif value is True:
+        parts.append(b"T")
+    elif value is False:
+        parts.append(b"F")
+    elif isinstance(value, int):
+        if _INT_MIN <= value <= _INT_MAX:
+            parts.append(b"i" + _INT.pack(value))
+        else:
+            data = value.to_bytes((value.bit_length() + 8) // 8, "little", signed=True)
+            parts.append(b"I" + _LENGTH.pack(len(data)))
+            parts.append(data)
+    elif isinstance(value, float):
+        parts.append(b"f" + _FLOAT.pack(value))
+    elif isinstance(value, str):
+        data = value.encode("utf-8")
+        parts.append(b"s" + _LENGTH.pack(len(data)))
+        parts.append(data)
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        parts.append(b"b" + _LENGTH.pack(len(value)))
+        parts.append(value)
+    elif isinstance(value, (list, tuple)):
+        parts.append((b"l" if isinstance(value, list) else b"t") + _LENGTH.pack(len(value)))
+        for item in value:
+            _encode(item, parts)
+    elif isinstance(value, dict):
+        parts.append(b"d" + _LENGTH.pack(len(value)))
+        for key, item in value.items():
+            _encode(key, parts)
+            _encode(item, parts)
+    else:
+        raise TypeError("PED-RPC> the struct codec cannot encode {0}".format(type(value).__name__))
+
+
+_CONSTANTS = {ord("N"): None, ord("T"): True, ord("F"): False}
+
+
+def _decode(view, position):
+    try:
+        tag = view[position]
+    except IndexError:
+        raise exception.BoofuzzRpcError("PED-RPC> truncated message")
+    position += 1
+    if tag in _CONSTANTS:
+        return _CONSTANTS[tag], position
+    if tag == ord("i"):
+        return _INT.unpack_from(view, position)[0], position + _INT.size
+    if tag == ord("f"):
+        return _FLOAT.unpack_from(view, position)[0], position + _FLOAT.size
+
+    length = _LENGTH.unpack_from(view, position)[0]
+    position += _LENGTH.size
+    if tag in (ord("s"), ord("b"), ord("I")):
+        end = position + length
+        if end > len(view):
+            raise exception.BoofuzzRpcError("PED-RPC> truncated message")
+        if tag == ord("s"):
+            return str(view[position:end], "utf-8"), end
+        if tag == ord("b"):
+            return view[position:end].tobytes(), end
+        return int.from_bytes(view[position:end], "little", signed=True), end
+    if tag in (ord("l"), ord("t")):
+        items = []
+        for _ in range(length):
+            item, position = _decode(view, position)
+            items.append(item)
+        return (items if tag == ord("l") else tuple(items)), position
+    if tag == ord("d"):
+        items = {}
+        for _ in range(length):
+            key, position = _decode(view, position)
+            items[key], position = _decode(view, position)
+        return items, position
+    raise exception.BoofuzzRpcError("PED-RPC> unknown type tag {0!r}".format(chr(tag)))
@@ -24,12 +24,14 @@ class ProcessMonitor(BaseMonitor, pedrpc.Client):
     this explicit proxy class has been introduced that
     fast-forwards all calls to the RPC partner.
 
+    Pass codec="struct" to only talk to agents that do not use pickle.
+
     .. versionadded:: 0.2.0
     """
 
-    def __init__(self, host, port):
+    def __init__(self, host, port, codec=None):
         BaseMonitor.__init__(self)
-        pedrpc.Client.__init__(self, host, port)
+        pedrpc.Client.__init__(self, host, port, codec=codec)
 
         self.server_options = {}
         self.host = host
@@ -47,6 +49,17 @@ class ProcessMonitor(BaseMonitor, pedrpc.Client):
         """This method is forwarded to the RPC daemon."""
         return self.__method_missing("post_send")
 
+    def post_test_case(self, target=None, fuzz_data_logger=None, session=None, retrieve_data=False):
+        """post_send and get_crash_synopsis are forwarded to the RPC daemon in one round trip.
+
+        Agents of protocol version 1 take a connection per call, so they are asked for the synopsis only after a crash.
+        """
+        if self.protocol_version < 2:
+            alive = self.post_send()
+            return alive, None if alive else self.get_crash_synopsis(), None
+        alive, synopsis = self.pipeline_calls([("post_send", (), {}), ("get_crash_synopsis", (), {})])
+        return alive, synopsis, None
+
     def set_options(self, *args, **kwargs):
         """
         The old RPC interfaces specified set_foobar methods to set options.
@@ -3,7 +3,6 @@ import os
 import sys
 import threading
 import time
-from io import open
 import impacket.ImpactDecoder  # pytype: disable=import-error
 
 import netifaces as ni
@@ -12,8 +11,10 @@ import netifaces as ni
 import pcapy  # pytype: disable=import-error
 
 from boofuzz import helpers, pedrpc
+from boofuzz.utils.packet_ring_buffer import DEFAULT_MAX_BYTES, PacketRingBuffer
 
 MAX_PACKET_LENGTH = 65535  # Max packet length for IP capture
+READ_TIMEOUT_MS = 100  # libpcap read timeout, packets may be handed over this late
 
 
 def log_error(message=None):
@@ -53,6 +54,8 @@ def create_usage(ifs):
     [-P|--log_path PATH]      log directory to store pcaps to
     [-l|--log_level LEVEL]    log level: default 1, increase for more verbosity
     [--port PORT]             TCP port to bind this agent to
+    [--codec CODEC]           PED-RPC codec, pickle (default) or struct
+    [--ring_buffer_size MB]   MiB of packets kept in memory, default 64
 
 Network Device List:
 """
@@ -88,13 +91,14 @@ Network Device List:
 
 
 class PcapThread(threading.Thread):
-    def __init__(self, network_monitor, pcap, pcap_save_path):
+    """Captures packets into a PacketRingBuffer until active is lowered."""
+
+    def __init__(self, network_monitor, pcap, ring_buffer):
         self.network_monitor = network_monitor
         self.pcap = pcap
         self.decoder = None
-        self.dumper = self.pcap.dump_open(pcap_save_path)
+        self.ring_buffer = ring_buffer
         self.active = True
-        self.data_bytes = 0
 
         # register the appropriate decoder.
         if pcap.datalink() == pcapy.DLT_EN10MB or pcap.datalink() == pcapy.DLT_NULL:
@@ -104,14 +108,12 @@ class PcapThread(threading.Thread):
         else:
             raise Exception
 
-        threading.Thread.__init__(self)
+        threading.Thread.__init__(self, daemon=True)
 
     def packet_handler(self, header, data):
-        # add the captured data to the PCAP.
-        self.dumper.dump(header, data)
-
-        # increment the captured byte count.
-        self.data_bytes += len(data)
+        # add the captured data to the ring buffer, tagged with the current test case.
+        ts_sec, ts_usec = header.getts()
+        self.ring_buffer.append(ts_sec, ts_usec, data, header.getlen())
 
         # log the decoded data at the appropriate log level.
         self.network_monitor.log(self.decoder.decode(data), 15)
@@ -120,10 +122,29 @@ class PcapThread(threading.Thread):
         # process packets while the active flag is raised.
         while self.active:
             self.pcap.dispatch(0, self.packet_handler)
+            self.ring_buffer.end_dispatch()
 
 
 class NetworkMonitorPedrpcServer(pedrpc.Server):
-    def __init__(self, host, port, monitor_device, bpf_filter="", path="./", level=1):
+    """
+    Captures the traffic of the fuzzed target.
+
+    One capture runs for the whole fuzzing run and keeps the last ring_buffer_size bytes of packets in memory, tagged
+    with the test case they were captured in. The packets of a test case are saved to <path>/<test number>.pcap when
+    the test case fails, and are sent by retrieve on demand.
+    """
+
+    def __init__(
+        self,
+        host,
+        port,
+        monitor_device,
+        bpf_filter="",
+        path="./",
+        level=1,
+        codec="pickle",
+        ring_buffer_size=DEFAULT_MAX_BYTES,
+    ):
         """
         @type  host:           str
         @param host:           Hostname or IP address to bind server to
@@ -137,16 +158,23 @@ class NetworkMonitorPedrpcServer(pedrpc.Server):
         @param path:           (Optional, def="./") Path to save recorded PCAPs to
         @type  level:          int
         @param level:          (Optional, def=1) Log output level, increase for more verbosity
+        @type  codec:          str
+        @param codec:          (Optional, def="pickle") PED-RPC codec, "pickle" or "struct"
+        @type  ring_buffer_size: int
+        @param ring_buffer_size: (Optional, def=64 MiB) Bytes of packets kept in memory
         """
 
         # initialize the PED-RPC server.
-        pedrpc.Server.__init__(self, host, port)
+        pedrpc.Server.__init__(self, host, port, codec=codec)
         self.device = monitor_device
         self.filter = bpf_filter
         self.log_path = path
         self.log_level = level
+        self.ring_buffer_size = ring_buffer_size
         self.pcap = None
         self.pcap_thread = None
+        self.ring_buffer = None
+        self.test_number = None
 
         # ensure the log path is valid.
         if not os.access(self.log_path, os.X_OK):
@@ -158,25 +186,22 @@ class NetworkMonitorPedrpcServer(pedrpc.Server):
         self.log("\t filter:    %s" % self.filter)
         self.log("\t log path:  %s" % self.log_path)
         self.log("\t log_level: %d" % self.log_level)
+        self.log("\t ring buffer: %d bytes" % self.ring_buffer_size)
         self.log("Awaiting requests...")
 
-    def __stop_capture(self):
+    def __start_capture(self):
         """
-        Stop the PCAP thread, wait all handler and return data_bytes.
+        Open the capture device and start the PCAP thread, which runs until the monitor exits.
         """
-        res = 0
+        self.log("starting packet capture thread.", 10)
 
-        if self.pcap_thread:
-            self.log("stopping active packet capture thread.", 10)
-
-            self.pcap_thread.active = False
-            self.pcap_thread.join()
-
-            res = self.pcap_thread.data_bytes
-
-            self.pcap_thread = None
+        # open the capture device and set the BPF filter.
+        self.pcap = pcapy.open_live(self.device, MAX_PACKET_LENGTH, 1, READ_TIMEOUT_MS)
+        self.pcap.setfilter(self.filter)
 
-        return res
+        self.ring_buffer = PacketRingBuffer(self.pcap.datalink(), MAX_PACKET_LENGTH, self.ring_buffer_size)
+        self.pcap_thread = PcapThread(self, self.pcap, self.ring_buffer)
+        self.pcap_thread.start()
 
     # noinspection PyMethodMayBeStatic
     def alive(self):
@@ -188,33 +213,57 @@ class NetworkMonitorPedrpcServer(pedrpc.Server):
 
     def post_send(self):
         """
-        This routine is called after the fuzzer transmits a test case and returns the number of bytes captured by the
-        PCAP thread.
+        This routine is called after the fuzzer transmits a test case and returns the number of bytes captured during
+        the test case. It waits until the capture thread has handed over the packets sent so far, as libpcap holds them
+        back for up to its read timeout. The wait runs in a worker thread, so the other clients are served meanwhile.
 
         @rtype:  Integer
-        @return: Number of bytes captured in PCAP thread.
+        @return: Number of bytes captured in the current test case.
         """
-        # stop the packet capture thread and grab the number of recorded bytes.
-        data_bytes = self.__stop_capture()
+        if self.ring_buffer is None:
+            return 0
+        ring_buffer, test_number = self.ring_buffer, self.test_number
 
-        self.log("stopped PCAP thread, snagged %d bytes of data" % data_bytes)
-        return data_bytes
+        def wait_for_packets():
+            # a dispatch ends at the latest one read timeout after it started, allow as much again for scheduling.
+            if not ring_buffer.wait_for_capture(2 * READ_TIMEOUT_MS / 1000.0):
+                self.log("capture thread did not hand over packets in time", 10)
+            data_bytes = ring_buffer.case_bytes(test_number)
+
+            self.log("snagged %d bytes of data for test case #%d" % (data_bytes, test_number))
+            return data_bytes
+
+        return pedrpc.Blocking(wait_for_packets)
 
     def pre_send(self, test_number):
         """
-        This routine is called before the fuzzer transmits a test case and spin off a packet capture thread.
+        This routine is called before the fuzzer transmits a test case and tags the packets captured from now on with
+        it. The capture is started on the first call.
         """
 
-        self.log("initializing capture for test case #%d" % test_number)
+        self.log("capturing test case #%d" % test_number)
 
-        # open the capture device and set the BPF filter.
-        self.pcap = pcapy.open_live(self.device, MAX_PACKET_LENGTH, 1, 100)
-        self.pcap.setfilter(self.filter)
+        if self.pcap_thread is None:
+            self.__start_capture()
+        self.test_number = test_number
+        self.ring_buffer.start_test_case(test_number)
 
-        # instantiate the capture thread.
-        pcap_log_path = "%s/%d.pcap" % (self.log_path, test_number)
-        self.pcap_thread = PcapThread(self, self.pcap, pcap_log_path)
-        self.pcap_thread.start()
+    def get_crash_synopsis(self):
+        """
+        Called when the current test case failed. Saves its packets to <log path>/<test number>.pcap.
+
+        @rtype:  String
+        @return: Where the packets were saved, empty if nothing was captured.
+        """
+        if self.ring_buffer is None or self.test_number is None:
+            return ""
+
+        pcap_log_path = "%s/%d.pcap" % (self.log_path, self.test_number)
+        num_packets = self.ring_buffer.write_pcap(self.test_number, pcap_log_path)
+        self.log("saved %d packets of test case #%d to %s" % (num_packets, self.test_number, pcap_log_path))
+        if num_packets == 0:
+            return ""
+        return "saved {0} packets to {1}".format(num_packets, pcap_log_path)
 
     def log(self, msg="", level=1):
         """
@@ -229,7 +278,8 @@ class NetworkMonitorPedrpcServer(pedrpc.Server):
 
     def retrieve(self, test_number):
         """
-        Return the raw binary contents of the PCAP saved for the specified test case number.
+        Return the PCAP of the specified test case number: the one saved for a failure, otherwise the packets still in
+        the ring buffer. It is streamed to the client in chunks.
 
         @type  test_number: int
         @param test_number: Test number to retrieve PCAP for.
@@ -238,15 +288,15 @@ class NetworkMonitorPedrpcServer(pedrpc.Server):
         self.log("retrieving PCAP for test case #%d" % test_number)
 
         pcap_log_path = "%s/%d.pcap" % (self.log_path, test_number)
-        fh = open(pcap_log_path, "rb")
-        data = fh.read()
-        fh.close()
-
-        return data
+        if os.path.exists(pcap_log_path) or self.ring_buffer is None:
+            return pedrpc.StreamedBytes.from_file(pcap_log_path)
+        return pedrpc.StreamedBytes(self.ring_buffer.pcap_chunks(test_number))
 
     def set_filter(self, new_filter):
         self.log("updating PCAP filter to '%s'" % new_filter)
         self.filter = new_filter
+        if self.pcap is not None:
+            self.pcap.setfilter(self.filter)
 
     def set_log_path(self, new_log_path):
         self.log("updating log path to '%s'" % new_log_path)
@@ -265,7 +315,11 @@ def main():
 
     # parse command line options.
     try:
-        opts, args = getopt.getopt(sys.argv[1:], "d:f:P:l:", ["device=", "filter=", "log_path=", "log_level=", "port="])
+        opts, args = getopt.getopt(
+            sys.argv[1:],
+            "d:f:P:l:",
+            ["device=", "filter=", "log_path=", "log_level=", "port=", "codec=", "ring_buffer_size="],
+        )
     except getopt.GetoptError:
         log_error(usage_message)
 
@@ -273,6 +327,8 @@ def main():
     pcap_filter = ""
     log_path = "./"
     log_level = 1
+    codec = "pickle"
+    ring_buffer_size = DEFAULT_MAX_BYTES
 
     for opt, arg in opts:
         if opt in ("-d", "--device"):
@@ -285,12 +341,18 @@ def main():
             log_level = int(arg)
         if opt in "--port":
             rpc_port = int(arg)
+        if opt == "--codec":
+            codec = arg
+        if opt == "--ring_buffer_size":
+            ring_buffer_size = int(arg) * 1024 * 1024
 
     if not device:
         log_error(usage_message)
 
     try:
-        servlet = NetworkMonitorPedrpcServer("0.0.0.0", rpc_port, device, pcap_filter, log_path, log_level)
+        servlet = NetworkMonitorPedrpcServer(
+            "0.0.0.0", rpc_port, device, pcap_filter, log_path, log_level, codec, ring_buffer_size
+        )
         t = threading.Thread(target=servlet.serve_forever)
         t.daemon = True
         t.start()
@@ -17,11 +17,84 @@ import copy
 
 import pydot
 
+_MISSING = object()
+
+
+class _AttributeIndex:
+    """
+    Lookup of the first item, in insertion order, of an id -> item dictionary with a given attribute value.
+
+    An index per attribute is built on first use and extended as items are added. Indexes are rebuilt if items were
+    removed or the dictionary was changed behind the index's back (detected by its size). Lookups of unhashable values
+    fall back to a scan.
+    """
+
+    def __init__(self, items):
+        self._items = items
+        self._indexes = {}  # attribute -> {value: item}
+        self._num_items = len(items)
+
+    def add(self, item):
+        if self._num_items != len(self._items) - 1:
+            self.clear()
+            return
+        self._num_items = len(self._items)
+        for attribute, index in self._indexes.items():
+            self._add_to_index(index, attribute, item)
+
+    def clear(self):
+        self._indexes = {}
+        self._num_items = len(self._items)
+
+    def find(self, attribute, value):
+        if self._num_items != len(self._items):
+            self.clear()
+        try:
+            item = self._get_index(attribute).get(value)
+        except TypeError:
+            return self._scan(attribute, value)
+        if item is not None and (getattr(item, attribute, _MISSING) != value or self._items.get(item.id) is not item):
+            # the attribute or the dictionary changed since the index was built.
+            self.clear()
+            item = self._get_index(attribute).get(value)
+        return item
+
+    def _get_index(self, attribute):
+        index = self._indexes.get(attribute)
+        if index is None:
+            index = {}
+            for item in self._items.values():
+                self._add_to_index(index, attribute, item)
+            self._indexes[attribute] = index
+        return index
+
+    @staticmethod
+    def _add_to_index(index, attribute, item):
+        value = getattr(item, attribute, _MISSING)
+        if value is _MISSING:
+            return
+        try:
+            index.setdefault(value, item)
+        except TypeError:
+            pass
+
+    def _scan(self, attribute, value):
+        for item in self._items.values():
+            if getattr(item, attribute, _MISSING) == value:
+                return item
+        return None
+
 
 class Graph:
     """
+    Directed graph of nodes and edges, keyed by id.
+
+    Besides the id -> node and id -> edge dictionaries, the graph keeps adjacency indexes of the edges from and to
+    each node, and attribute indexes for find_node() and find_edge(). Add and remove nodes and edges through the
+    methods of this class, and change node ids with update_node_id(), to keep these indexes in sync. Attributes used
+    for lookups must not be changed while the element is part of the graph.
+
     @todo: Add support for clusters
-    @todo: Potentially swap node list with a node dictionary for increased performance
     """
 
     id = None
@@ -34,6 +107,11 @@ class Graph:
         self.clusters = []
         self.edges = {}
         self.nodes = {}
+        self._edges_from = {}  # node id -> {edge id: edge}
+        self._edges_to = {}  # node id -> {edge id: edge}
+        self._num_indexed_edges = 0
+        self._node_index = _AttributeIndex(self.nodes)
+        self._edge_index = _AttributeIndex(self.edges)
 
     def add_cluster(self, cluster):
         """
@@ -62,8 +140,16 @@ class Graph:
                 return self
 
         # ensure the source and destination nodes exist.
-        if self.find_node("id", graph_edge.src) is not None and self.find_node("id", graph_edge.dst) is not None:
-            self.edges[graph_edge.id] = graph_edge
+        if graph_edge.src in self.nodes and graph_edge.dst in self.nodes:
+            if graph_edge.id in self.edges:
+                # replace the edge, keeping its position in the indexes.
+                self._unindex_edge(self.edges[graph_edge.id], keep=graph_edge)
+                self.edges[graph_edge.id] = graph_edge
+                self._edge_index.clear()
+            else:
+                self.edges[graph_edge.id] = graph_edge
+                self._edge_index.add(graph_edge)
+            self._index_edge(graph_edge)
 
         return self
 
@@ -92,6 +178,7 @@ class Graph:
 
         if node.id not in self.nodes:
             self.nodes[node.id] = node
+            self._node_index.add(node)
 
         return self
 
@@ -132,7 +219,8 @@ class Graph:
             graph_id = (src << 32) + dst  # pytype: disable=unsupported-operands
 
         if graph_id in self.edges:
-            del self.edges[graph_id]
+            self._unindex_edge(self.edges.pop(graph_id))
+            self._edge_index.clear()
 
         return self
 
@@ -160,6 +248,7 @@ class Graph:
 
         if node_id in self.nodes:
             del self.nodes[node_id]
+            self._node_index.clear()
 
         return self
 
@@ -174,7 +263,8 @@ class Graph:
         @return: List of edges from the specified node
         """
 
-        return [edge_value for edge_value in list(self.edges.values()) if edge_value.src == edge_id]
+        self._check_adjacency()
+        return list(self._edges_from.get(edge_id, {}).values())
 
     def edges_to(self, edge_id):
         """
@@ -187,7 +277,8 @@ class Graph:
         @return: List of edges to the specified node
         """
 
-        return [edge_value for edge_value in list(self.edges.values()) if edge_value.dst == edge_id]
+        self._check_adjacency()
+        return list(self._edges_to.get(edge_id, {}).values())
 
     def find_cluster(self, attribute, value):
         """
@@ -247,15 +338,7 @@ class Graph:
         if attribute == "id" and value in self.edges:
             return self.edges[value]
 
-        # step through all the edges looking for the given attribute/value pair.
-        else:
-            # TODO: Verify that this actually works? Was broken when I got here ;-P
-            for node_edge in list(self.edges.values()):
-                if hasattr(node_edge, attribute):
-                    if getattr(node_edge, attribute) == value:
-                        return node_edge
-
-        return None
+        return self._edge_index.find(attribute, value)
 
     def find_node(self, attribute, value):
         """
@@ -274,14 +357,7 @@ class Graph:
         if attribute == "id" and value in self.nodes:
             return self.nodes[value]
 
-        # step through all the nodes looking for the given attribute/value pair.
-        else:
-            for node in list(self.nodes.values()):
-                if hasattr(node, attribute):
-                    if getattr(node, attribute) == value:
-                        return node
-
-        return None
+        return self._node_index.find(attribute, value)
 
     def graph_cat(self, other_graph):
         """
@@ -337,9 +413,9 @@ class Graph:
                 down_graph.add_node(copy.copy(node))
 
                 for edge in self.edges_from(node.id):
-                    to_add = self.find_node("id", edge.dst)
+                    to_add = self.nodes[edge.dst]
 
-                    if not down_graph.find_node("id", edge.dst):
+                    if edge.dst not in down_graph.nodes:
                         next_level.append(to_add)
 
                     down_graph.add_node(copy.copy(to_add))
@@ -443,9 +519,9 @@ class Graph:
                 up_graph.add_node(copy.copy(node))
 
                 for edge in self.edges_to(node.id):
-                    to_add = self.find_node("id", edge.src)
+                    to_add = self.nodes[edge.src]
 
-                    if not up_graph.find_node("id", edge.src):
+                    if edge.src not in up_graph.nodes:
                         next_level.append(to_add)
 
                     up_graph.add_node(copy.copy(to_add))
@@ -592,10 +668,12 @@ class Graph:
         del self.nodes[current_id]
         node.id = new_id
         self.nodes[node.id] = node
+        self._node_index.clear()
 
         # update the edges.
         for edge in [edge for edge in list(self.edges.values()) if current_id in (edge.src, edge.dst)]:
             del self.edges[edge.id]
+            self._unindex_edge(edge)
 
             if edge.src == current_id:
                 edge.src = new_id
@@ -605,6 +683,30 @@ class Graph:
             edge.id = (edge.src << 32) + edge.dst
 
             self.edges[edge.id] = edge
+            self._index_edge(edge)
+        self._edge_index.clear()
+
+    def _index_edge(self, edge):
+        self._edges_from.setdefault(edge.src, {})[edge.id] = edge
+        self._edges_to.setdefault(edge.dst, {})[edge.id] = edge
+        self._num_indexed_edges = len(self.edges)
+
+    def _unindex_edge(self, edge, keep=None):
+        if keep is None or keep.src != edge.src:
+            self._edges_from.get(edge.src, {}).pop(edge.id, None)
+        if keep is None or keep.dst != edge.dst:
+            self._edges_to.get(edge.dst, {}).pop(edge.id, None)
+        self._num_indexed_edges = len(self.edges)
+
+    def _check_adjacency(self):
+        """
+        Rebuild the edges from / to indexes if self.edges was changed without add_edge() or del_edge().
+        """
+        if self._num_indexed_edges != len(self.edges):
+            self._edges_from = {}
+            self._edges_to = {}
+            for edge in self.edges.values():
+                self._index_edge(edge)
 
     def sorted_nodes(self):
         """
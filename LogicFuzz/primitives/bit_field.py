@@ -1,6 +1,6 @@
+import functools
 import struct
 
-from .. import helpers
 from ..constants import LITTLE_ENDIAN
 from ..fuzzable import Fuzzable
 
@@ -34,6 +34,53 @@ def int_to_binary_string(number, bit_width):
     return "".join(map(lambda x: str((number >> x) & 1), range(bit_width - 1, -1, -1)))
 
 
+# struct formats of the bit widths that have a standard size.
+_STRUCT_FORMATS = {8: "B", 16: "H", 32: "L", 64: "Q"}
+
+
+@functools.lru_cache(maxsize=None)
+def _get_renderer(output_format, bit_width, endian, signed):
+    """
+    Build the function that renders an integer for the given BitField settings.
+
+    Binary output takes the low bit_width bits of the value (two's complement for negative values), padded to whole
+    bytes. Widths with a standard struct size use a precompiled struct.Struct, other widths int.to_bytes.
+
+    Ascii output is the decimal value. If signed is set, a value whose bit_width-bit sign bit is set renders as the
+    negative number these bits represent.
+
+    Args:
+        output_format (str): "binary" or "ascii"
+        bit_width (int): Width of output in bits.
+        endian: BIG_ENDIAN or LITTLE_ENDIAN
+        signed (bool):
+
+    Returns:
+        callable: Function mapping an int to bytes.
+    """
+    if output_format == "binary":
+        mask = (1 << bit_width) - 1
+        byte_order = "little" if endian == LITTLE_ENDIAN else "big"
+        if bit_width in _STRUCT_FORMATS:
+            pack = struct.Struct(("<" if byte_order == "little" else ">") + _STRUCT_FORMATS[bit_width]).pack
+            return lambda value: pack(value & mask)
+        num_bytes = (bit_width + 7) // 8
+        return lambda value: (value & mask).to_bytes(num_bytes, byte_order)
+
+    # Otherwise we have ascii/something else
+    if not signed:
+        return lambda value: b"%d" % value
+    sign_bit = 1 << (bit_width - 1)
+
+    def render_signed(value):
+        if value & sign_bit:
+            # chop off the sign bit; the negative scale starts at -sign_bit.
+            return b"%d" % ((value & (sign_bit - 1)) - sign_bit)
+        return b"%d" % value
+
+    return render_signed
+
+
 class BitField(Fuzzable):
     """
     The bit field primitive represents a number of variable length and is used to define all other integer types.
@@ -151,15 +198,38 @@ class BitField(Fuzzable):
                 yield case
 
     def encode(self, value, mutation_context):
-        temp = self._render_int(
-            value, output_format=self.format, bit_width=self.width, endian=self.endian, signed=self.signed
-        )
-        return helpers.str_to_bytes(temp)
+        return _get_renderer(self.format, self.width, self.endian, self.signed)(value)
 
     def mutations(self, default_value):
         for val in self._iterate_fuzz_lib():
             yield val
 
+    def num_mutations(self, default_value):
+        """
+        Calculate and return the total number of mutations for this individual primitive.
+
+        Mirrors _iterate_fuzz_lib: every boundary contributes the part of its range that lies above the previous
+        boundary's values and below max_num.
+
+        Args:
+            default_value:
+
+        Returns:
+            int: Number of mutated forms this primitive can take
+        """
+        if self.full_range:
+            return max(0, self.max_num)
+
+        num_mutations = 0
+        lower_border = -1
+        for boundary in self._interesting_boundaries:
+            first = max(boundary - 10, lower_border + 1)
+            last = min(boundary + 9, self.max_num - 1)
+            if first <= last:
+                num_mutations += last - first + 1
+                lower_border = last
+        return num_mutations
+
     @staticmethod
     def _render_int(value, output_format, bit_width, endian, signed):
         """
@@ -173,47 +243,6 @@ class BitField(Fuzzable):
             signed (bool):
 
         Returns:
-            str: value converted to a byte string
+            bytes: value converted to a byte string
         """
-        if output_format == "binary":
-            bit_stream = ""
-            rendered = b""
-
-            # pad the bit stream to the next byte boundary.
-            if bit_width % 8 == 0:
-                bit_stream += int_to_binary_string(value, bit_width)
-            else:
-                bit_stream = "0" * (8 - (bit_width % 8))
-                bit_stream += int_to_binary_string(value, bit_width)
-
-            # convert the bit stream from a string of bits into raw bytes.
-            for i in range(len(bit_stream) // 8):
-                chunk_min = 8 * i
-                chunk_max = chunk_min + 8
-                chunk = bit_stream[chunk_min:chunk_max]
-                rendered += struct.pack("B", binary_string_to_int(chunk))
-
-            # if necessary, convert the endianness of the raw bytes.
-            if endian == LITTLE_ENDIAN:
-                # reverse the bytes
-                rendered = rendered[::-1]
-
-            _rendered = rendered
-        else:
-            # Otherwise we have ascii/something else
-            # if the sign flag is raised and we are dealing with a signed integer (first bit is 1).
-            if signed and int_to_binary_string(value, bit_width)[0] == "1":
-                max_num = binary_string_to_int("1" + "0" * (bit_width - 1))
-                # chop off the sign bit.
-                val = value & binary_string_to_int("1" * (bit_width - 1))
-
-                # account for the fact that the negative scale works backwards.
-                val = max_num - val - 1
-
-                # toss in the negative sign.
-                _rendered = "%d" % ~val
-
-            # unsigned integer or positive signed integer.
-            else:
-                _rendered = "%d" % value
-        return _rendered
+        return _get_renderer(output_format, bit_width, endian, signed)(value)
@@ -52,7 +52,6 @@ class Float(Fuzzable):
         self.endian = endian
 
     def mutations(self, default_value):
-        last_val = None
         if self.seed is not None:
             random.seed(self.seed)
 
@@ -63,12 +62,7 @@ class Float(Fuzzable):
                 current_val = random.uniform(self.f_min, self.f_max)
 
             str_format = "%" + self.s_format
-            current_val = str_format % float(current_val)
-
-            if last_val == current_val:
-                continue
-            last_val = current_val
-            yield current_val
+            yield str_format % float(current_val)
 
     def encode(self, value, mutation_context=None):
         if self.encode_as_ieee_754:
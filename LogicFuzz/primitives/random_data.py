@@ -1,5 +1,4 @@
 import random
-import struct
 
 from boofuzz import helpers
 from ..fuzzable import Fuzzable
@@ -52,21 +51,48 @@ class RandomData(Fuzzable):
         Yields:
             str: Mutations
         """
+        return self.mutations_from(default_value, 0)
 
-        local_random = random.Random(0)  # We want constant random numbers to generate reproducible test cases
+    def mutations_from(self, default_value, start):
+        """
+        Yield the mutations from index start on, without generating the earlier ones.
+
+        Args:
+            default_value (str): Default value of element.
+            start (int): Index of the first mutation to yield.
+
+        Yields:
+            str: Mutations
+        """
+        for i in range(start, self.max_mutations):
+            yield self.random_value(i)
+
+    def random_value(self, index):
+        """
+        Generate the mutation with the given index.
 
-        for i in range(0, self.get_num_mutations()):
-            # select a random length for this string.
-            if not self.step:
-                length = local_random.randint(self.min_length, self.max_length)
-            # select a length function of the mutant index and the step.
-            else:
-                length = self.min_length + i * self.step
+        Every mutation is drawn from its own random generator, seeded with the mutation index, so that a mutation
+        can be generated on its own and is the same whenever it is replayed.
 
-            value = b""
-            for _ in range(length):
-                value += struct.pack("B", local_random.randint(0, 255))
-            yield value
+        Args:
+            index (int): Mutation index.
+
+        Returns:
+            bytes: Random data
+        """
+        local_random = random.Random(index)
+
+        # select a random length for this string.
+        if not self.step:
+            length = local_random.randint(self.min_length, self.max_length)
+        # select a length function of the mutant index and the step.
+        else:
+            length = self.min_length + index * self.step
+
+        if length <= 0:
+            return b""
+        # Equivalent to Random.randbytes(length), which is not available before Python 3.9.
+        return local_random.getrandbits(length * 8).to_bytes(length, "little")
 
     def encode(self, value, mutation_context):
         return value
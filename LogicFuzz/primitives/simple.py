@@ -17,3 +17,6 @@ class Simple(Fuzzable):
 
     def __init__(self, name=None, default_value=None, fuzz_values=None, *args, **kwargs):
         super(Simple, self).__init__(name=name, default_value=default_value, fuzz_values=fuzz_values, *args, **kwargs)
+
+    def num_mutations(self, default_value):
+        return 0
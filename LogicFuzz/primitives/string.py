@@ -1,6 +1,6 @@
 import itertools
-import math
 import random
+import threading
 
 from ..fuzzable import Fuzzable
 
@@ -181,6 +181,8 @@ class String(Fuzzable):
 
     _variable_mutation_multipliers = [2, 10, 100]
 
+    _random_indices = None  # see _get_random_indices
+
     def __init__(
         self, name=None, default_value="", size=None, padding=b"\x00", encoding="utf-8", max_len=None, *args, **kwargs
     ):
@@ -194,55 +196,35 @@ class String(Fuzzable):
         self.padding = padding
         if isinstance(padding, str):
             self.padding = self.padding.encode(self.encoding)
-        self._static_num_mutations = None
-        self.random_indices = {}
-
-        local_random = random.Random(0)  # We want constant random numbers to generate reproducible test cases
-        previous_length = 0
-        # For every length add a random number of random indices to the random_indices dict. Prevent duplicates by
-        # adding only indices in between previous_length and current length.
-        for length in self._long_string_lengths:
-            self.random_indices[length] = local_random.sample(
-                range(previous_length, length), local_random.randint(1, self._long_string_lengths[0])
-            )
-            previous_length = length
-
-    def _yield_long_strings(self, sequences):
-        """
-        Given a sequence, yield a number of selectively chosen strings lengths of the given sequence.
-
-        @type  sequences: list(str)
-        @param sequences: Sequence to repeat for creation of fuzz strings.
-        """
-        for sequence in sequences:
-            for size in [
-                length + delta
-                for length, delta in itertools.product(self._long_string_lengths, self._long_string_deltas)
-            ]:
-                if self.max_len is None or size <= self.max_len:
-                    data = sequence * math.ceil(size / len(sequence))
-                    yield data[:size]
-                else:
-                    break
+        self.random_indices = self._get_random_indices()
 
-            for size in self._extra_long_string_lengths:
-                if self.max_len is None or size <= self.max_len:
-                    data = sequence * math.ceil(size / len(sequence))
-                    yield data[:size]
-                else:
-                    break
-
-            if self.max_len is not None:
-                data = sequence * math.ceil(self.max_len / len(sequence))
-                yield data
+    @classmethod
+    def _get_random_indices(cls):
+        """Positions of the terminator in the "D" long strings. The same for every instance, so computed once."""
+        if cls._random_indices is None:
+            random_indices = {}
+            local_random = random.Random(0)  # We want constant random numbers to generate reproducible test cases
+            previous_length = 0
+            # For every length add a random number of random indices to the random_indices dict. Prevent duplicates by
+            # adding only indices in between previous_length and current length.
+            for length in cls._long_string_lengths:
+                random_indices[length] = local_random.sample(
+                    range(previous_length, length), local_random.randint(1, cls._long_string_lengths[0])
+                )
+                previous_length = length
+            cls._random_indices = random_indices
+        return cls._random_indices
 
-        for size in self._long_string_lengths:
-            if self.max_len is None or size <= self.max_len:
-                s = "D" * size
-                for loc in self.random_indices[size]:
-                    yield s[:loc] + "\x00" + s[loc + 1 :]  # Replace character at loc with terminator
-            else:
-                break
+    def _get_library(self):
+        """Get the process-wide _StringLibrary for the current max_len of this primitive."""
+        library = _libraries.get(self.max_len)
+        if library is None:
+            with _libraries_lock:
+                library = _libraries.get(self.max_len)
+                if library is None:
+                    library = _StringLibrary(self.max_len)
+                    _libraries[self.max_len] = library
+        return library
 
     def _yield_variable_mutations(self, default_value):
         for length in self._variable_mutation_multipliers:
@@ -263,25 +245,34 @@ class String(Fuzzable):
         Mutate the primitive by stepping through the fuzz library extended with the "this" library, return False on
         completion.
 
+        Consecutive duplicates (e.g. caused by max_len) are skipped. The fuzz library and long strings come from a
+        process-wide cache shared by all String primitives with the same settings; long strings are built on demand.
+
         Args:
             default_value (str): Default value of element.
 
         Yields:
             str: Mutations
         """
+        library = self._get_library()
         last_val = None
+        for val in library.library:
+            last_val = val
+            yield val
 
-        for val in itertools.chain(
-            self._fuzz_library,
-            self._yield_variable_mutations(default_value),
-            self._yield_long_strings(self.long_string_seeds),
-        ):
+        for val in self._yield_variable_mutations(default_value):
             current_val = self._adjust_mutation_for_size(val)
             if last_val == current_val:
                 continue
             last_val = current_val
             yield current_val
 
+        for i, descriptor in enumerate(library.long_strings):
+            current_val = library.build(descriptor)
+            if i == 0 and last_val == current_val:
+                continue
+            yield current_val
+
         # TODO: Add easy and sane string injection from external file/s
 
     def encode(self, value, mutation_context=None):
@@ -301,8 +292,96 @@ class String(Fuzzable):
         Returns:
             int: Number of mutated forms this primitive can take
         """
-        variable_num_mutations = sum(1 for _ in self._yield_variable_mutations(default_value=default_value))
-        if self._static_num_mutations is None:
-            #  Counting the number of mutations with default value "" results in 0 variable_num_mutations 3 * "" = ""
-            self._static_num_mutations = sum(1 for _ in self.mutations(default_value=""))
-        return self._static_num_mutations + variable_num_mutations
+        library = self._get_library()
+        num_mutations = len(library.library)
+        last_val = library.library[-1]
+        for val in self._yield_variable_mutations(default_value):
+            current_val = self._adjust_mutation_for_size(val)
+            if last_val != current_val:
+                num_mutations += 1
+            last_val = current_val
+
+        # mutations() skips the first long string if it repeats the last variable mutation
+        if library.build(library.long_strings[0]) == last_val:
+            num_mutations -= 1
+        return num_mutations + len(library.long_strings)
+
+
+_libraries = {}  # max_len -> _StringLibrary
+_libraries_lock = threading.Lock()
+
+
+class _StringLibrary:
+    """Static mutations of all String primitives with the same max_len, shared process-wide.
+
+    Holds the truncated, de-duplicated fuzz library, and the long strings as compact (sequence, length, terminator
+    position) descriptors that :meth:`build` turns into strings on demand, so no instance keeps long strings alive.
+
+    Args:
+        max_len (int): Maximum string length, or None.
+    """
+
+    def __init__(self, max_len):
+        self.max_len = max_len
+
+        self.library = []
+        for val in String._fuzz_library:
+            if max_len is not None:
+                val = val[:max_len]
+            if not self.library or self.library[-1] != val:
+                self.library.append(val)
+
+        self.long_strings = []
+        last_key = None
+        for descriptor in self._iterate_long_string_descriptors():
+            key = descriptor if descriptor[1] > 0 else ("", 0, None)  # empty strings are equal for any sequence
+            if key != last_key:
+                self.long_strings.append(descriptor)
+            last_key = key
+
+    def _iterate_long_string_descriptors(self):
+        """Yield (sequence, length, terminator position) of a number of selectively chosen long strings."""
+        max_len = self.max_len
+        sizes = [
+            length + delta
+            for length, delta in itertools.product(String._long_string_lengths, String._long_string_deltas)
+        ]
+        for sequence in String.long_string_seeds:
+            for size in sizes:
+                if max_len is None or size <= max_len:
+                    yield sequence, size, None
+                else:
+                    break
+
+            for size in String._extra_long_string_lengths:
+                if max_len is None or size <= max_len:
+                    yield sequence, size, None
+                else:
+                    break
+
+            if max_len is not None:
+                yield sequence, max_len, None
+
+        random_indices = String._get_random_indices()
+        for size in String._long_string_lengths:
+            if max_len is None or size <= max_len:
+                for loc in random_indices[size]:
+                    yield "D", size, loc  # Replace character at loc with terminator
+            else:
+                break
+
+    @staticmethod
+    def build(descriptor):
+        """Build the long string described by descriptor.
+
+        Args:
+            descriptor (tuple): (sequence, length, terminator position or None)
+
+        Returns:
+            str: Long string
+        """
+        sequence, size, loc = descriptor
+        value = (sequence * -(-size // len(sequence)))[:size]
+        if loc is not None:
+            value = value[:loc] + "\x00" + value[loc + 1 :]
+        return value
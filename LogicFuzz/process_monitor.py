@@ -6,7 +6,7 @@ from boofuzz.utils.debugger_thread_simple import DebuggerThreadSimple
 from boofuzz.utils.process_monitor_pedrpc_server import ProcessMonitorPedrpcServer
 
 
-def serve_procmon(port, crash_bin, proc_name, ignore_pid, log_level):
+def serve_procmon(port, crash_bin, proc_name, ignore_pid, log_level, codec="pickle"):
     with ProcessMonitorPedrpcServer(
         host="0.0.0.0",
         port=port,
@@ -16,6 +16,7 @@ def serve_procmon(port, crash_bin, proc_name, ignore_pid, log_level):
         pid_to_ignore=ignore_pid,
         level=log_level,
         coredump_dir=None,
+        codec=codec,
     ) as servlet:
         servlet.serve_forever()
 
@@ -56,8 +57,17 @@ def serve_procmon(port, crash_bin, proc_name, ignore_pid, log_level):
 )
 @click.option("--proc-name", "--proc_name", "-p", help="process name to search for and attach to", metavar="NAME")
 @click.option("--port", "-P", help="TCP port to bind this agent to", type=int, default=DEFAULT_PROCMON_PORT)
-def go(crash_bin, ignore_pid, log_level, proc_name, port):
-    serve_procmon(port=port, crash_bin=crash_bin, proc_name=proc_name, ignore_pid=ignore_pid, log_level=log_level)
+@click.option(
+    "--codec",
+    help="PED-RPC codec, struct if untrusted hosts can connect",
+    type=click.Choice(["pickle", "struct"]),
+    default="pickle",
+    show_default=True,
+)
+def go(crash_bin, ignore_pid, log_level, proc_name, port, codec):
+    serve_procmon(
+        port=port, crash_bin=crash_bin, proc_name=proc_name, ignore_pid=ignore_pid, log_level=log_level, codec=codec
+    )
 
 
 if __name__ == "__main__":
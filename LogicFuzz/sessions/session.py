@@ -1,21 +1,21 @@
+import concurrent.futures
+import contextlib
 import datetime
 import errno
+import heapq
 import itertools
 import logging
 import os
-import pickle
+import queue
 import socket
 import threading
 import time
 import traceback
 import warnings
-import zlib
 from builtins import input
-from io import open
 
 from tornado.httpserver import HTTPServer
 from tornado.ioloop import IOLoop
-from tornado.wsgi import WSGIContainer
 
 from boofuzz import (
     blocks,
@@ -23,35 +23,83 @@ from boofuzz import (
     event_hook,
     exception,
     fuzz_logger,
+    fuzz_logger_buffer,
     fuzz_logger_curses,
     fuzz_logger_db,
+    fuzz_logger_queue,
     fuzz_logger_text,
     helpers,
     pgraph,
     primitives,
 )
 from boofuzz.exception import BoofuzzFailure
-from boofuzz.monitors import CallbackMonitor
+from boofuzz.monitors import CallbackMonitor, pedrpc
 from boofuzz.mutation_context import MutationContext
+from boofuzz.mutation_index import MutationIndex
 from boofuzz.protocol_session import ProtocolSession
+from boofuzz.web import event_stream
 from boofuzz.web.app import app
 from .connection import Connection
+from .session_checkpoint import SessionCheckpoint
 from .session_info import SessionInfo
 from .web_app import WebApp
 
 
-def open_test_run(db_filename, port=constants.DEFAULT_WEB_UI_PORT, address=constants.DEFAULT_WEB_UI_ADDRESS):
-    s = SessionInfo(db_filename=db_filename)
-    w = WebApp(session_info=s, web_port=port, web_address=address)
+def open_test_run(
+    db_filename, port=constants.DEFAULT_WEB_UI_PORT, address=constants.DEFAULT_WEB_UI_ADDRESS, pool_size=None
+):
+    """Serve the results of a finished run in the web interface.
+
+    Args:
+        db_filename (str): Name of the database file of the run.
+        port (int): Port of the web interface. Default 26000.
+        address (str): Address of the web interface. Default 'localhost'.
+        pool_size (int): Serve requests on this many threads, reading the database through as many read-only
+            connections. Default None (one thread, one read-write connection).
+    """
+    s = SessionInfo(db_filename=db_filename, pool_size=pool_size)
+    w = WebApp(session_info=s, web_port=port, web_address=address, num_threads=pool_size)
     w.server_init()
 
 
+class _WorkerLocal:
+    """Session attribute that holds a separate value in each parallel target worker thread.
+
+    Outside of worker threads, and in all threads while fuzzing a single target, the shared value is used.
+    """
+
+    def __set_name__(self, owner, name):
+        self._name = name
+
+    def __get__(self, session, owner=None):
+        if session is None:
+            return self
+        worker_state = session.__dict__.get("_worker_state")
+        if worker_state is not None and getattr(worker_state, "active", False):
+            return getattr(worker_state, self._name)
+        try:
+            return session.__dict__[self._name]
+        except KeyError:
+            raise AttributeError(self._name)
+
+    def __set__(self, session, value):
+        worker_state = session.__dict__.get("_worker_state")
+        if worker_state is not None and getattr(worker_state, "active", False):
+            setattr(worker_state, self._name, value)
+        else:
+            session.__dict__[self._name] = value
+
+
 class Session(pgraph.Graph):
     """
     Extends pgraph.graph and provides a container for architecting protocol dialogs.
 
     Args:
         session_filename (str): Filename to serialize persistent data to. Default None.
+        session_snapshot_cases (int): Write a full snapshot to session_filename every n test cases. In between, the
+                                      resume point is appended to a journal by a background thread. Default 1000.
+        session_snapshot_seconds (float): Write a full snapshot to session_filename at least every n seconds while
+                                          fuzzing. Default 60.
         index_start (int);      First test case index to run
         index_end (int);        Last test case index to run
         sleep_time (float):     Time in seconds to sleep in between tests. Default 0.
@@ -79,6 +127,11 @@ class Session(pgraph.Graph):
         fuzz_db_keep_only_n_pass_cases (int): Minimize disk usage by only saving passing test cases
                                               if they are in the n test cases preceding a failure or error.
                                               Set to 0 to save after every test case (high disk I/O!). Default 0.
+        fuzz_db_keep_every_nth_pass_case (int): Additionally save every nth passing test case. Default 0 (off).
+        fuzz_db_keep_changed_response_cases (bool): Additionally save passing test cases whose received data differs
+                                                    from the first test case. Default False.
+        fuzz_db_keep_pass_case_interval (float): Additionally save the first passing test case of every interval of
+                                                 this many seconds. Default None (off).
         receive_data_after_each_request (bool): If True, Session will attempt to receive a reply after transmitting
                                                 each non-fuzzed node. Default True.
         check_data_received_each_request (bool): If True, Session will verify that some data has
@@ -101,14 +154,35 @@ class Session(pgraph.Graph):
         db_filename (str):      Filename to store sqlite db for test results and case information.
                                 Defaults to ./boofuzz-results/{uniq_timestamp}.db
         web_address:            Address where's Boofuzz logger exposed. Default 'localhost'
+        parallel_targets (bool): If True and more than one target was added, test cases are distributed over all
+                                 targets. Each target is fuzzed by its own worker thread with its own connection,
+                                 monitors and restart handling. Requests are rendered one at a time, as elements
+                                 such as Checksum and Mirror keep state while rendering; edge callbacks that render
+                                 a node themselves are not serialized. Default False.
+        threaded_fuzz_loggers (bool): If True, each fuzz logger gets its own queue and worker thread, so slow loggers
+                                 do not hold up the fuzzing loop or each other. The database logger is not queued:
+                                 it already writes on a thread of its own, and the session and web interface read
+                                 test cases and failures from it directly. Default False.
 
     .. versionchanged:: 0.4.2
        This class has been moved into the sessions subpackage. The full path is now boofuzz.sessions.session.Session.
     """
 
+    # Per test case state. Each parallel target worker keeps its own copy, see _parallel_fuzz_loop().
+    fuzz_node = _WorkerLocal()
+    mutant_index = _WorkerLocal()
+    total_mutant_index = _WorkerLocal()
+    current_test_case_name = _WorkerLocal()
+    last_send = _WorkerLocal()
+    last_recv = _WorkerLocal()
+    _mutant = _WorkerLocal()
+    _fuzz_data_logger = _WorkerLocal()
+
     def __init__(
         self,
         session_filename=None,
+        session_snapshot_cases=1000,
+        session_snapshot_seconds=60.0,
         index_start=1,
         index_end=None,
         sleep_time=0.0,
@@ -138,7 +212,18 @@ class Session(pgraph.Graph):
         target=None,
         web_address=constants.DEFAULT_WEB_UI_ADDRESS,
         db_filename=None,
+        parallel_targets=False,
+        threaded_fuzz_loggers=False,
+        fuzz_db_keep_every_nth_pass_case=0,
+        fuzz_db_keep_changed_response_cases=False,
+        fuzz_db_keep_pass_case_interval=None,
     ):
+        self._worker_state = threading.local()
+        self._shared_state_lock = threading.RLock()
+        self._render_lock = threading.RLock()  # requests and their render caches are shared by parallel workers
+        self._monitor_executor = None  # queries remote monitors concurrently, created on first use
+        self._monitor_case_data = {}  # target -> {monitor: data retrieved with post_test_case}
+        self._parallel_targets = parallel_targets
         self._ignore_connection_reset = ignore_connection_reset
         self._ignore_connection_aborted = ignore_connection_aborted
         self._ignore_connection_issues_when_sending_fuzz_data = ignore_connection_issues_when_sending_fuzz_data
@@ -148,6 +233,9 @@ class Session(pgraph.Graph):
         super(Session, self).__init__()
 
         self.session_filename = session_filename
+        self._session_snapshot_cases = session_snapshot_cases
+        self._session_snapshot_seconds = session_snapshot_seconds
+        self._checkpoint = None  # SessionCheckpoint of session_filename, opened on first use
         self._index_start = max(index_start, 1)
         self._index_end = index_end
         self.sleep_time = sleep_time
@@ -161,6 +249,7 @@ class Session(pgraph.Graph):
         self.restart_threshold = restart_threshold
         self.restart_timeout = restart_timeout
         self.web_address = web_address
+        self.event_bus = event_stream.EventBus()
         if fuzz_loggers is None:
             fuzz_loggers = []
             if self.console_gui and os.name != "nt":
@@ -179,12 +268,26 @@ class Session(pgraph.Graph):
             helpers.mkdir_safe(os.path.join(constants.RESULTS_DIR))
             self._db_filename = os.path.join(constants.RESULTS_DIR, "run-{0}.db".format(self._run_id))
 
+        self._db_reader = None  # opened by the first failures query of the web interface
         self._db_logger = fuzz_logger_db.FuzzLoggerDb(
-            db_filename=self._db_filename, num_log_cases=fuzz_db_keep_only_n_pass_cases
+            db_filename=self._db_filename,
+            num_log_cases=fuzz_db_keep_only_n_pass_cases,
+            keep_every_nth_pass=fuzz_db_keep_every_nth_pass_case,
+            keep_changed_responses=fuzz_db_keep_changed_response_cases,
+            keep_pass_interval=fuzz_db_keep_pass_case_interval,
         )
 
         self._crash_filename = "boofuzz-crash-bin-{0}".format(self._run_id)
 
+        if threaded_fuzz_loggers:
+            fuzz_loggers = [
+                (
+                    logger
+                    if isinstance(logger, fuzz_logger_queue.FuzzLoggerQueue)
+                    else fuzz_logger_queue.FuzzLoggerQueue(logger)
+                )
+                for logger in fuzz_loggers
+            ]
         self._fuzz_data_logger = fuzz_logger.FuzzLogger(fuzz_loggers=[self._db_logger] + fuzz_loggers)
         self._check_data_received_each_request = check_data_received_each_request
         self._receive_data_after_each_request = receive_data_after_each_request
@@ -230,6 +333,7 @@ class Session(pgraph.Graph):
         self.mutant_index = 0  # index within currently mutating element
         self.num_cases_actually_fuzzed = 0
         self.fuzz_node = None  # Request object currently being fuzzed
+        self._mutant = None  # element of fuzz_node currently being mutated
         self.current_test_case_name = ""
         self.targets = []
         self.monitor_results = {}  # map of test case indices to list of crash synopsis strings (failed cases only)
@@ -283,13 +387,9 @@ class Session(pgraph.Graph):
             node (pgraph.Node): Node to add to session graph
         """
 
-        node.number = len(self.nodes)
         node.id = len(self.nodes)
 
-        if node.id not in self.nodes:
-            self.nodes[node.id] = node
-
-        return self
+        return super(Session, self).add_node(node)
 
     def add_target(self, target):
         """
@@ -360,6 +460,15 @@ class Session(pgraph.Graph):
 
         return edge
 
+    @property
+    def is_paused(self):
+        return self._is_paused
+
+    @is_paused.setter
+    def is_paused(self, value):
+        self._is_paused = value
+        self.event_bus.publish(is_paused=value)
+
     @property
     def exec_speed(self):
         return self.num_cases_actually_fuzzed / self.runtime
@@ -372,16 +481,34 @@ class Session(pgraph.Graph):
             t = time.time()
         return t - self.start_time - self.cumulative_pause_time
 
-    def export_file(self):
+    def export_file(self, snapshot=False):
         """
         Dump various object values to disk.
 
+        The values are appended to a journal by a background thread, which regularly writes them to a full snapshot
+        in session_filename. See SessionCheckpoint.
+
+        Args:
+            snapshot (bool): Block until the values are written to a full snapshot. Default False.
+
         :see: import_file()
         """
 
         if not self.session_filename:
             return
 
+        with self._shared_state_lock:
+            if self._checkpoint is None or self._checkpoint.filename != self.session_filename:
+                # a new SessionCheckpoint has none of the earlier results
+                checkpoint = self._open_checkpoint()
+                monitor_results = dict(self.monitor_results)
+            else:
+                # only the results of the current test case; SessionCheckpoint accumulates them
+                checkpoint = self._checkpoint
+                monitor_results = {}
+                if self.total_mutant_index in self.monitor_results:
+                    monitor_results[self.total_mutant_index] = self.monitor_results[self.total_mutant_index]
+
         data = {
             "session_filename": self.session_filename,
             "index_start": self.total_mutant_index,
@@ -393,13 +520,24 @@ class Session(pgraph.Graph):
             "crash_threshold": self._crash_threshold_node,
             "total_num_mutations": self.total_num_mutations,
             "total_mutant_index": self.total_mutant_index,
-            "monitor_results": self.monitor_results,
+            "monitor_results": monitor_results,
             "is_paused": self.is_paused,
         }
 
-        fh = open(self.session_filename, "wb+")
-        fh.write(zlib.compress(pickle.dumps(data, protocol=2)))
-        fh.close()
+        checkpoint.record(data)
+        if snapshot:
+            checkpoint.snapshot()
+
+    def _open_checkpoint(self):
+        """Close the SessionCheckpoint of a former session_filename and open the one of the current."""
+        if self._checkpoint is not None:
+            self._checkpoint.close()
+        self._checkpoint = SessionCheckpoint(
+            filename=self.session_filename,
+            snapshot_cases=self._session_snapshot_cases,
+            snapshot_seconds=self._session_snapshot_seconds,
+        )
+        return self._checkpoint
 
     def _start_target(self, target):
         started = False
@@ -420,10 +558,9 @@ class Session(pgraph.Graph):
         if self.session_filename is None:
             return
 
-        try:
-            with open(self.session_filename, "rb") as f:
-                data = pickle.loads(zlib.decompress(f.read()))
-        except (IOError, zlib.error, pickle.UnpicklingError):
+        with self._shared_state_lock:
+            data = self._open_checkpoint().load()
+        if data is None:
             return
 
         # update the skip variable to pick up fuzzing from last test case.
@@ -504,12 +641,13 @@ class Session(pgraph.Graph):
                     break
             self.cumulative_pause_time += time.time() - pause_start
 
-    def _check_for_passively_detected_failures(self, target, failure_already_detected=False):
+    def _check_for_passively_detected_failures(self, target, failure_already_detected=False, retrieve_data=False):
         """Check for and log passively detected failures. Return True if any found.
 
         Args:
             target (Target): Target to be checked for failures.
             failure_already_detected (bool): If a failure was already detected.
+            retrieve_data (bool): Retrieve the data of the monitors in the same calls, for _get_monitor_data.
 
         Returns:
             bool: True if failures were found. False otherwise.
@@ -517,19 +655,22 @@ class Session(pgraph.Graph):
         has_crashed = False
         if len(target.monitors) > 0:
             self._fuzz_data_logger.open_test_step("Contact target monitors")
-            # So, we need to run through the array two times. First, we check
-            # if any of the monitors reported a failure and if so, we need to
-            # gather a crash synopsis from them. We don't know whether
-            # a monitor can provide a crash synopsis, but in any case, we'll
-            # check. In the second run, we try to get crash synopsis from the
-            # monitors that did not detect a crash as supplemental information.
+            # Every monitor reports its status, and its crash synopsis if it has one at hand, in one call. If any of
+            # them detected a crash, the monitors that did not provide a synopsis are asked for one as supplemental
+            # information.
+            results = self._post_test_case_monitors(target, retrieve_data=retrieve_data)
+            if retrieve_data:
+                self._monitor_case_data[target] = {monitor: data for monitor, (_, _, data) in results.items()}
             finished_monitors = []
             for monitor in target.monitors:
-                if not monitor.post_send(target=target, fuzz_data_logger=self._fuzz_data_logger, session=self):
+                alive, synopsis, _ = results[monitor]
+                if not alive:
                     has_crashed = True
+                    if synopsis is None:
+                        synopsis = monitor.get_crash_synopsis()
                     self._fuzz_data_logger.log_fail(
                         "{0} detected crash on test case #{1}: {2}".format(
-                            str(monitor), self.total_mutant_index, monitor.get_crash_synopsis()
+                            str(monitor), self.total_mutant_index, synopsis
                         )
                     )
                     finished_monitors.append(monitor)
@@ -537,34 +678,84 @@ class Session(pgraph.Graph):
             if not has_crashed and not failure_already_detected:
                 self._fuzz_data_logger.log_pass("No crash detected.")
             else:
-                for monitor in set(target.monitors) - set(finished_monitors):
-                    synopsis = monitor.get_crash_synopsis()
+                for monitor in target.monitors:
+                    if monitor in finished_monitors:
+                        continue
+                    synopsis = results[monitor][1]
+                    if synopsis is None:
+                        synopsis = monitor.get_crash_synopsis()
                     if len(synopsis) > 0:
                         self._fuzz_data_logger.log_fail(
                             "{0} provided additional information for crash on #{1}: {2}".format(
-                                str(monitor), self.total_mutant_index, monitor.get_crash_synopsis()
+                                str(monitor), self.total_mutant_index, synopsis
                             )
                         )
         return has_crashed
 
+    def _post_test_case_monitors(self, target, retrieve_data=False):
+        """Call post_test_case of all monitors of target.
+
+        Remote monitors are queried concurrently if there are several of them, all others one after another in this
+        thread, as they may log to the fuzz data logger.
+
+        Args:
+            target (Target): Target whose monitors are queried.
+            retrieve_data (bool): Retrieve the data of the monitors too.
+
+        Returns:
+            dict: Monitor -> (alive, synopsis, data) as returned by :meth:`BaseMonitor.post_test_case`.
+        """
+        kwargs = {
+            "target": target,
+            "fuzz_data_logger": self._fuzz_data_logger,
+            "session": self,
+            "retrieve_data": retrieve_data,
+        }
+        remote_monitors = [monitor for monitor in target.monitors if isinstance(monitor, pedrpc.Client)]
+        futures = {}
+        if len(remote_monitors) > 1:
+            executor = self._get_monitor_executor()
+            futures = {monitor: executor.submit(monitor.post_test_case, **kwargs) for monitor in remote_monitors}
+        results = {}
+        for monitor in target.monitors:
+            if monitor not in futures:
+                results[monitor] = monitor.post_test_case(**kwargs)
+        for monitor, future in futures.items():
+            results[monitor] = future.result()
+        return results
+
+    def _get_monitor_executor(self):
+        with self._shared_state_lock:
+            if self._monitor_executor is None:
+                max_workers = sum(
+                    sum(1 for monitor in target.monitors if isinstance(monitor, pedrpc.Client))
+                    for target in self.targets
+                )
+                self._monitor_executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=max(max_workers, 2), thread_name_prefix="monitor"
+                )
+            return self._monitor_executor
+
     def _get_monitor_data(self, target):
         """Query monitors for any data they may want to add to this test case.
 
         Args:
             target (Target): Monitor to query data from.
         """
+        retrieved = self._monitor_case_data.pop(target, {})
         for monitor in target.monitors:
-            data = monitor.retrieve_data()
+            data = retrieved[monitor] if monitor in retrieved else monitor.retrieve_data()
             if data is not None and len(data) > 0:
                 self._fuzz_data_logger.log_info(
                     "{0} captured {1} bytes of additional data for test case #{2}".format(
                         str(monitor), len(data), self.total_mutant_index
                     )
                 )
-                if self.total_mutant_index not in self.monitor_data:
-                    self.monitor_data[self.total_mutant_index] = []
+                with self._shared_state_lock:
+                    if self.total_mutant_index not in self.monitor_data:
+                        self.monitor_data[self.total_mutant_index] = []
 
-                self.monitor_data[self.total_mutant_index] += [data]
+                    self.monitor_data[self.total_mutant_index] += [data]
 
     def _process_failures(self, target):
         """Process any failures in self.crash_synopses.
@@ -588,7 +779,7 @@ class Session(pgraph.Graph):
             self._fuzz_data_logger.open_test_step("Failure summary")
 
             # retrieve the primitive that caused the crash and increment it's individual crash count.
-            self.crashing_primitives[self.fuzz_node.mutant] = self.crashing_primitives.get(self.fuzz_node.mutant, 0) + 1
+            self.crashing_primitives[self._mutant] = self.crashing_primitives.get(self._mutant, 0) + 1
             self.crashing_primitives[self.fuzz_node] = self.crashing_primitives.get(self.fuzz_node, 0) + 1
 
             # print crash synopsis
@@ -597,40 +788,65 @@ class Session(pgraph.Graph):
                 synopsis = "({0} reports) {1}".format(len(crash_synopses), "\n".join(crash_synopses))
             else:
                 synopsis = "\n".join(crash_synopses)
-            self.monitor_results[self.total_mutant_index] = crash_synopses
+            with self._shared_state_lock:
+                self.monitor_results[self.total_mutant_index] = crash_synopses
+            self.event_bus.publish_failure(self.total_mutant_index, crash_synopses)
             self._fuzz_data_logger.log_info(synopsis)
 
-            if (
-                self.fuzz_node.mutant is not None
-                and self.crashing_primitives[self.fuzz_node] >= self._crash_threshold_node
-            ):
-                skipped = max(0, self.fuzz_node.get_num_mutations() - self.mutant_index)
-                self._skip_current_node_after_current_test_case = True
+            if self._mutant is not None and self.crashing_primitives[self.fuzz_node] >= self._crash_threshold_node:
+                skipped = self._skip_remaining_mutants(whole_node=True)
                 self._fuzz_data_logger.open_test_step(
                     "Crash threshold reached for this request, exhausting {0} mutants.".format(skipped)
                 )
-                self.total_mutant_index += skipped
-                self.mutant_index += skipped
-            elif (
-                self.fuzz_node.mutant is not None
-                and self.crashing_primitives[self.fuzz_node.mutant] >= self._crash_threshold_element
-            ):
-                if not isinstance(self.fuzz_node.mutant, primitives.Group) and not isinstance(
-                    self.fuzz_node.mutant, blocks.Repeat
-                ):
-                    skipped = max(0, self.fuzz_node.mutant.get_num_mutations() - self.mutant_index)
-                    self._skip_current_element_after_current_test_case = True
+            elif self._mutant is not None and self.crashing_primitives[self._mutant] >= self._crash_threshold_element:
+                if not isinstance(self._mutant, primitives.Group) and not isinstance(self._mutant, blocks.Repeat):
+                    skipped = self._skip_remaining_mutants(whole_node=False)
                     self._fuzz_data_logger.open_test_step(
                         "Crash threshold reached for this element, exhausting {0} mutants.".format(skipped)
                     )
-                    self.total_mutant_index += skipped
-                    self.mutant_index += skipped
 
             self._restart_target(target)
             return True
         else:
             return False
 
+    def _skip_remaining_mutants(self, whole_node):
+        """Skip the remaining mutants of the current node or element after the current test case.
+
+        In a parallel target worker, the test case generator may already have moved on to another node or element,
+        in which case nothing is skipped.
+
+        Args:
+            whole_node (bool): Skip the rest of the current node if True, else only the rest of the current element.
+
+        Returns:
+            int: Number of skipped mutants.
+        """
+        node, mutant = self.fuzz_node, self._mutant
+        with self._shared_session_state():
+            if self.fuzz_node is not node or self._mutant is not mutant:
+                return 0
+            if whole_node:
+                skipped = max(0, node.get_num_mutations() - self.mutant_index)
+                self._skip_current_node_after_current_test_case = True
+            else:
+                skipped = max(0, mutant.get_num_mutations() - self.mutant_index)
+                self._skip_current_element_after_current_test_case = True
+            self.total_mutant_index += skipped
+            self.mutant_index += skipped
+        return skipped
+
+    @contextlib.contextmanager
+    def _shared_session_state(self):
+        """Context manager to access the shared rather than the per-worker session state, see _WorkerLocal."""
+        with self._shared_state_lock:
+            active = getattr(self._worker_state, "active", False)
+            self._worker_state.active = False
+            try:
+                yield
+            finally:
+                self._worker_state.active = active
+
     def register_post_test_case_callback(self, method):
         """Register a post- test case method.
 
@@ -734,7 +950,7 @@ class Session(pgraph.Graph):
 
         if restarted:
             for monitor in target.monitors:
-                monitor.post_start_target(target=self.targets[0], fuzz_data_logger=self._fuzz_data_logger, session=self)
+                monitor.post_start_target(target=target, fuzz_data_logger=self._fuzz_data_logger, session=self)
         else:
             self._fuzz_data_logger.log_info(
                 "No reset handler available... sleeping for {} seconds".format(self.restart_sleep_time)
@@ -744,6 +960,19 @@ class Session(pgraph.Graph):
         # pass specified target parameters to the PED-RPC server to re-establish connections.
         target.monitors_alive()
 
+    def _publish_test_case(self, test_case_name, num_mutations_element):
+        """Publish the counters of the test case being opened to the event bus of the web interface."""
+        self.event_bus.publish(
+            current_index=self.total_mutant_index,
+            num_mutations=self.total_num_mutations,
+            current_index_element=self.mutant_index,
+            num_mutations_element=num_mutations_element,
+            current_element=self.fuzz_node.name,
+            current_test_case_name=test_case_name,
+            runtime=self.runtime,
+            exec_speed=self.exec_speed,
+        )
+
     def server_init(self):
         """Called by fuzz() to initialize variables, web interface, etc."""
         if self.web_port is not None:
@@ -751,13 +980,14 @@ class Session(pgraph.Graph):
                 # spawn the web interface.
                 self.web_interface_thread.start()
 
-    def _callback_current_node(self, node, edge, test_case_context):
+    def _callback_current_node(self, node, edge, test_case_context, target=None):
         """Execute callback preceding current node.
 
         Args:
             test_case_context (ProtocolSession): Context for test case-scoped data.
             node (pgraph.node.node (Node), optional): Current Request/Node
             edge (pgraph.edge.edge (pgraph.edge), optional): Edge along the current fuzz path from "node" to next node.
+            target (Target, optional): Target passed to the callback. Default: The first target of the session.
 
         Returns:
             bytes: Data rendered by current node if any; otherwise None.
@@ -768,7 +998,7 @@ class Session(pgraph.Graph):
         if edge.callback:
             self._fuzz_data_logger.open_test_step("Callback function '{0}'".format(edge.callback.__name__))
             data = edge.callback(
-                self.targets[0],
+                target if target is not None else self.targets[0],
                 self._fuzz_data_logger,
                 session=self,
                 node=node,
@@ -791,11 +1021,14 @@ class Session(pgraph.Graph):
         if callback_data:
             data = callback_data
         else:
-            data = node.render(mutation_context=mutation_context)
+            with self._render_lock:
+                data = node.render_segments(mutation_context=mutation_context)
 
         try:  # send
-            self.targets[0].send(data)
-            self.last_send = data
+            sent = sock.send(data)
+            if sent is None:  # a Target that does not return the sent data
+                sent = b"".join(data) if isinstance(data, list) else data
+            self.last_send = sent
         except exception.BoofuzzTargetConnectionReset:
             # TODO: Switch _ignore_connection_reset for _ignore_transmission_error, or provide retry mechanism
             if self._ignore_connection_reset:
@@ -817,7 +1050,7 @@ class Session(pgraph.Graph):
 
         try:  # recv
             if self._receive_data_after_each_request:
-                self.last_recv = self.targets[0].recv()
+                self.last_recv = sock.recv()
 
                 if self._check_data_received_each_request:
                     self._fuzz_data_logger.log_check("Verify some data was received from the target.")
@@ -856,11 +1089,14 @@ class Session(pgraph.Graph):
         if callback_data:
             data = callback_data
         else:
-            data = self.fuzz_node.render(mutation_context)
+            with self._render_lock:
+                data = self.fuzz_node.render_segments(mutation_context)
 
         try:  # send
-            self.targets[0].send(data)
-            self.last_send = data
+            sent = sock.send(data)
+            if sent is None:  # a Target that does not return the sent data
+                sent = b"".join(data) if isinstance(data, list) else data
+            self.last_send = sent
         except exception.BoofuzzTargetConnectionReset:
             if self._ignore_connection_issues_when_sending_fuzz_data:
                 self._fuzz_data_logger.log_info(constants.ERR_CONN_RESET)
@@ -881,7 +1117,7 @@ class Session(pgraph.Graph):
         received = b""
         try:  # recv
             if self._receive_data_after_fuzz:
-                received = self.targets[0].recv()
+                received = sock.recv()
         except exception.BoofuzzTargetConnectionReset:
             if self._check_data_received_each_request:
                 raise BoofuzzFailure(message=constants.ERR_CONN_RESET)
@@ -904,7 +1140,7 @@ class Session(pgraph.Graph):
 
     def build_webapp_thread(self, port=constants.DEFAULT_WEB_UI_PORT, address=constants.DEFAULT_WEB_UI_ADDRESS):
         app.session = self
-        http_server = HTTPServer(WSGIContainer(app))
+        http_server = HTTPServer(event_stream.make_application(app, self.event_bus))
         while True:
             try:
                 http_server.listen(port, address=address)
@@ -954,7 +1190,9 @@ class Session(pgraph.Graph):
 
         if name is None or name == "":
             self.total_num_mutations = self.num_mutations(max_depth=max_depth)
-            self._main_fuzz_loop(self._generate_mutations_indefinitely(max_depth=max_depth))
+            self._main_fuzz_loop(
+                self._generate_mutations_indefinitely(max_depth=max_depth, start_index=self._index_start)
+            )
         else:
             path, mutations = helpers.parse_test_case_name(name)
             if len(mutations) < 1:
@@ -991,7 +1229,7 @@ class Session(pgraph.Graph):
         self.total_mutant_index = 0
         self.total_num_mutations = self.nodes[node_edges[-1].dst].get_num_mutations()
 
-        self._main_fuzz_loop(self._generate_mutations_indefinitely(path=node_edges))
+        self._main_fuzz_loop(self._generate_mutations_indefinitely(path=node_edges, start_index=self._index_start))
 
     def fuzz_single_case(self, mutant_index):
         """Deprecated: Fuzz a test case by mutant_index.
@@ -1047,6 +1285,9 @@ class Session(pgraph.Graph):
             self._fuzz_data_logger.log_error("Unexpected exception! {0}".format(traceback.format_exc()))
             self.export_file()
             raise
+        finally:
+            if self._checkpoint is not None:
+                self._checkpoint.close()
 
     def _main_fuzz_loop(self, fuzz_case_iterator):
         """Execute main fuzz logic; takes an iterator of test cases.
@@ -1063,37 +1304,41 @@ class Session(pgraph.Graph):
         self.server_init()
 
         try:
-            self._start_target(self.targets[0])
+            if self._parallel_targets and len(self.targets) > 1:
+                self._parallel_fuzz_loop(fuzz_case_iterator)
+            else:
+                self._start_target(self.targets[0])
 
-            if self._reuse_target_connection:
-                self.targets[0].open()
-            self.num_cases_actually_fuzzed = 0
-            self.start_time = time.time()
-            for mutation_context in fuzz_case_iterator:
-                if self.total_mutant_index < self._index_start:
-                    continue
+                if self._reuse_target_connection:
+                    self.targets[0].open()
+                self.num_cases_actually_fuzzed = 0
+                self.start_time = time.time()
+                for mutation_context in fuzz_case_iterator:
+                    if self.total_mutant_index < self._index_start:
+                        continue
 
-                # Check restart interval
-                if (
-                    self.num_cases_actually_fuzzed
-                    and self.restart_interval
-                    and self.num_cases_actually_fuzzed % self.restart_interval == 0
-                ):
-                    self._fuzz_data_logger.open_test_step("restart interval of %d reached" % self.restart_interval)
-                    self._restart_target(self.targets[0])
+                    # Check restart interval
+                    if (
+                        self.num_cases_actually_fuzzed
+                        and self.restart_interval
+                        and self.num_cases_actually_fuzzed % self.restart_interval == 0
+                    ):
+                        self._fuzz_data_logger.open_test_step("restart interval of %d reached" % self.restart_interval)
+                        self._restart_target(self.targets[0])
 
-                self._fuzz_current_case(mutation_context)
+                    self._fuzz_current_case(mutation_context)
 
-                self.num_cases_actually_fuzzed += 1
+                    self.num_cases_actually_fuzzed += 1
 
-                if self._index_end is not None and self.total_mutant_index >= self._index_end:
-                    break
+                    if self._index_end is not None and self.total_mutant_index >= self._index_end:
+                        break
 
-            if self._reuse_target_connection:
-                self.targets[0].close()
+                if self._reuse_target_connection:
+                    self.targets[0].close()
 
             if self._keep_web_open and self.web_port is not None:
                 self.end_time = time.time()
+                self.event_bus.publish(runtime=self.runtime, exec_speed=self.exec_speed)
                 print(
                     "\nFuzzing session completed. Keeping webinterface up on {}:{}".format(
                         self.web_address, self.web_port
@@ -1119,57 +1364,209 @@ class Session(pgraph.Graph):
             raise
         finally:
             self._fuzz_data_logger.close_test()
+            if self._checkpoint is not None:
+                self._checkpoint.close()
+
+    def _parallel_fuzz_loop(self, fuzz_case_iterator):
+        """Distribute the test cases of fuzz_case_iterator over one worker thread per target.
+
+        Only the calling thread advances fuzz_case_iterator. Every test case is handed to the next idle worker along
+        with a snapshot of the per test case session state (see _WorkerLocal). Workers log through a
+        FuzzLoggerBuffer, so the shared loggers see each test case as a whole.
+
+        Args:
+            fuzz_case_iterator (Iterable): An iterator that walks through fuzz cases and yields MutationContext objects.
+        """
+        jobs = queue.Queue(maxsize=len(self.targets))
+        stop = threading.Event()
+        errors = []
+        log_lock = threading.Lock()
+        workers = [
+            threading.Thread(
+                target=self._parallel_worker,
+                args=(target, jobs, stop, errors, self._fuzz_data_logger, log_lock),
+                name="boofuzz-target-{0}".format(i),
+            )
+            for i, target in enumerate(self.targets)
+        ]
+
+        self.num_cases_actually_fuzzed = 0
+        self.start_time = time.time()
+        for worker in workers:
+            worker.daemon = True
+            worker.start()
+
+        try:
+            fuzz_case_iterator = iter(fuzz_case_iterator)
+            while not stop.is_set():
+                # generating mutations may render elements too, e.g. for Repeat
+                with self._shared_state_lock, self._render_lock:
+                    mutation_context = next(fuzz_case_iterator, None)
+                    if mutation_context is None:
+                        break
+                    if self.total_mutant_index < self._index_start:
+                        continue
+                    # the generator keeps modifying its message path list, so hand out a copy
+                    job = (
+                        self.total_mutant_index,
+                        self.mutant_index,
+                        self.fuzz_node,
+                        self._mutant,
+                        MutationContext(
+                            message_path=list(mutation_context.message_path), mutations=mutation_context.mutations
+                        ),
+                    )
+
+                while not stop.is_set() and any(worker.is_alive() for worker in workers):
+                    try:
+                        jobs.put(job, timeout=0.1)
+                        break
+                    except queue.Full:
+                        pass
+                else:
+                    break
+
+                if self._index_end is not None and self.total_mutant_index >= self._index_end:
+                    break
+        except BaseException:
+            stop.set()
+            raise
+        finally:
+            if stop.is_set() or not any(worker.is_alive() for worker in workers):
+                # workers finish their current test case only
+                while not jobs.empty():
+                    jobs.get_nowait()
+            for _ in workers:
+                jobs.put(None)
+            for worker in workers:
+                worker.join()
+
+        if errors:
+            raise errors[0]
+
+    def _parallel_worker(self, target, jobs, stop, errors, fuzz_data_logger, log_lock):
+        """Fuzz target with the test cases from jobs until a None job is received or stop is set.
+
+        Args:
+            target (Target): Target owned by this worker.
+            jobs (queue.Queue): Test cases as queued by _parallel_fuzz_loop.
+            stop (threading.Event): Set by any thread to end the fuzzing run.
+            errors (list): Receives exceptions that end the fuzzing run.
+            fuzz_data_logger (ifuzz_logger.IFuzzLogger): Shared session logger.
+            log_lock (threading.Lock): Lock that serializes writing to fuzz_data_logger.
+        """
+        self._worker_state.active = True
+        self._fuzz_data_logger = fuzz_logger.FuzzLogger(
+            fuzz_loggers=[fuzz_logger_buffer.FuzzLoggerBuffer(fuzz_logger=fuzz_data_logger, lock=log_lock)]
+        )
+        self.last_send = None
+        self.last_recv = None
+        target.set_fuzz_data_logger(fuzz_data_logger=self._fuzz_data_logger)
+        num_cases = 0
+
+        try:
+            self._start_target(target)
+
+            if self._reuse_target_connection:
+                target.open()
+            while not stop.is_set():
+                job = jobs.get()
+                if job is None:
+                    break
+                self.total_mutant_index, self.mutant_index, self.fuzz_node, self._mutant, mutation_context = job
+
+                if num_cases and self.restart_interval and num_cases % self.restart_interval == 0:
+                    self._fuzz_data_logger.open_test_step("restart interval of %d reached" % self.restart_interval)
+                    self._restart_target(target)
+
+                self._fuzz_current_case(mutation_context, target=target)
+
+                num_cases += 1
+                with self._shared_state_lock:
+                    self.num_cases_actually_fuzzed += 1
+
+            if self._reuse_target_connection:
+                target.close()
+        except exception.BoofuzzTargetConnectionFailedError:
+            # already logged; this target is lost but the other workers keep going
+            pass
+        except BaseException as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            self._fuzz_data_logger.close_test()
+            target.set_fuzz_data_logger(fuzz_data_logger=fuzz_data_logger)
+            self._worker_state.active = False
 
     def _generate_single_case_by_index(self, test_case_index):
-        fuzz_index = 1
-        for m in self._generate_mutations_indefinitely():
-            if fuzz_index >= test_case_index:
+        for m in self._generate_mutations_indefinitely(start_index=test_case_index):
+            if self.total_mutant_index >= test_case_index:
                 self.total_mutant_index = 1
                 yield m
                 break
-            fuzz_index += 1
 
-    def _generate_mutations_indefinitely(self, max_depth=None, path=None):
-        """Yield MutationContext with n mutations per message over all messages, with n increasing indefinitely."""
+    def _generate_mutations_indefinitely(self, max_depth=None, path=None, start_index=1):
+        """Yield MutationContext with n mutations per message over all messages, with n increasing indefinitely.
+
+        Args:
+            max_depth (int): Maximum number of mutations per message. Default None (unlimited).
+            path (list of Connection): Only fuzz the message at the end of this path. Default None (all messages).
+            start_index (int): Index of the first test case the caller is interested in. Earlier test cases with a
+                single mutation are skipped without generating them; later depths are still generated in full.
+        """
         depth = 1
         while max_depth is None or depth <= max_depth:
             valid_case_found_at_this_depth = False
-            for m in self._generate_n_mutations(depth=depth, path=path):
+            skipped_from = self.total_mutant_index
+            for m in self._generate_n_mutations(depth=depth, path=path, start_index=start_index):
                 valid_case_found_at_this_depth = True
                 yield m
-            if not valid_case_found_at_this_depth:
+            if not valid_case_found_at_this_depth and self.total_mutant_index == skipped_from:
                 break
             depth += 1
 
-    def _generate_n_mutations(self, depth, path):
-        """Yield MutationContext with n mutations per message over all messages."""
+    def _generate_n_mutations(self, depth, path, start_index=1):
+        """Yield MutationContext with n mutations per message over all messages.
+
+        For depth 1, messages and mutations before start_index are skipped using the mutation counts of each message
+        and a MutationIndex of the message containing start_index.
+        """
         for path in self._iterate_protocol_message_paths(path=path):
-            for m in self._generate_n_mutations_for_path(path, depth=depth):
+            start = 0
+            if depth == 1 and start_index > self.total_mutant_index + 1:
+                num_mutations = self.nodes[path[-1].dst].get_num_mutations()
+                if self.total_mutant_index + num_mutations < start_index:
+                    self.total_mutant_index += num_mutations
+                    continue
+                start = start_index - self.total_mutant_index - 1
+                self.total_mutant_index += start
+            for m in self._generate_n_mutations_for_path(path, depth=depth, start=start):
                 yield m
 
-    def _generate_n_mutations_for_path(self, path, depth):
+    def _generate_n_mutations_for_path(self, path, depth, start=0):
         """Yield MutationContext with n mutations for a specific message.
 
         Args:
             path (list of Connection): Nodes (Requests) along the path to the current one being fuzzed.
             depth (int): Yield sets of depth mutations.
+            start (int): Index of the first mutation of the message to yield. Only supported for depth 1.
 
         Yields:
             MutationContext: A MutationContext containing one mutation.
         """
-        for mutations in self._generate_n_mutations_for_path_recursive(path, depth=depth):
+        for mutations in self._generate_n_mutations_for_path_recursive(path, depth=depth, start=start):
             if not self._mutations_contain_duplicate(mutations):
                 self.total_mutant_index += 1
                 yield MutationContext(message_path=path, mutations={n.qualified_name: n for n in mutations})
 
-    def _generate_n_mutations_for_path_recursive(self, path, depth, skip_elements=None):
+    def _generate_n_mutations_for_path_recursive(self, path, depth, skip_elements=None, start=0):
         if skip_elements is None:
             skip_elements = set()
         if depth == 0:
             yield []
             return
         new_skip = skip_elements.copy()
-        for mutations in self._generate_mutations_for_request(path=path, skip_elements=skip_elements):
+        for mutations in self._generate_mutations_for_request(path=path, skip_elements=skip_elements, start=start):
             new_skip.update(m.qualified_name for m in mutations)
             for ms in self._generate_n_mutations_for_path_recursive(path, depth=depth - 1, skip_elements=new_skip):
                 yield mutations + ms
@@ -1238,12 +1635,13 @@ class Session(pgraph.Graph):
                 return True
         return False
 
-    def _generate_mutations_for_request(self, path, skip_elements=None):
+    def _generate_mutations_for_request(self, path, skip_elements=None, start=0):
         """Yield each mutation for a specific message (the last message in path).
 
         Args:
             path (list of Connection): Nodes (Requests) along the path to the current one being fuzzed.
-            path (iter of str): Qualified names of elements to skip while fuzzing.
+            skip_elements (iter of str): Qualified names of elements to skip while fuzzing.
+            start (int): Index of the first mutation to yield. Cannot be combined with skip_elements.
 
         Yields:
             Mutation: Mutation object describing a single mutation.
@@ -1251,10 +1649,16 @@ class Session(pgraph.Graph):
         if skip_elements is None:
             skip_elements = []
         self.fuzz_node = self.nodes[path[-1].dst]
-        self.mutant_index = 0
+        self.mutant_index = start
 
-        for mutations in self.fuzz_node.get_mutations(skip_elements=skip_elements):
+        if start > 0:
+            mutations_iterator = MutationIndex(self.fuzz_node).iter_from(start)
+        else:
+            mutations_iterator = self.fuzz_node.get_mutations(skip_elements=skip_elements)
+
+        for mutations in mutations_iterator:
             self.mutant_index += 1
+            self._mutant = self.fuzz_node.mutant
             yield mutations
 
             if self._skip_current_node_after_current_test_case:
@@ -1275,7 +1679,8 @@ class Session(pgraph.Graph):
             qualified_name, index = mutation_name.rsplit(":")
             index = int(index)
             fuzzable = self.fuzz_node.names[qualified_name]
-            mutations += next(itertools.islice(fuzzable.get_mutations(), index, index + 1))
+            mutations += next(fuzzable.get_mutations(start=index))
+        self._mutant = self.fuzz_node.mutant
         self.total_mutant_index += 1
         yield MutationContext(message_path=path, mutations={n.qualified_name: n for n in mutations})
 
@@ -1317,6 +1722,7 @@ class Session(pgraph.Graph):
         self._pause_if_pause_flag_is_set()
 
         test_case_name = self._test_case_name_feature_check(mutation_context)
+        num_mutations_element = self.fuzz_node.get_num_mutations()
 
         self._fuzz_data_logger.open_test_case(
             "{0}: {1}".format(self.total_mutant_index, test_case_name),
@@ -1324,8 +1730,9 @@ class Session(pgraph.Graph):
             index=self.total_mutant_index,
             num_mutations=self.total_num_mutations,
             current_index=self.mutant_index,
-            current_num_mutations=self.fuzz_node.get_num_mutations(),
+            current_num_mutations=num_mutations_element,
         )
+        self._publish_test_case(test_case_name, num_mutations_element)
 
         try:
             self._open_connection_keep_trying(target)
@@ -1340,7 +1747,9 @@ class Session(pgraph.Graph):
                 )
                 mutation_context.protocol_session = protocol_session
                 self._fuzz_data_logger.open_test_step("Prep Node '{0}'".format(node.name))
-                callback_data = self._callback_current_node(node=node, edge=e, test_case_context=protocol_session)
+                callback_data = self._callback_current_node(
+                    node=node, edge=e, test_case_context=protocol_session, target=target
+                )
                 self.transmit_normal(target, node, e, callback_data=callback_data, mutation_context=mutation_context)
 
             prev_node = self.nodes[mutation_context.message_path[-1].src]
@@ -1351,7 +1760,10 @@ class Session(pgraph.Graph):
             )
             mutation_context.protocol_session = protocol_session
             callback_data = self._callback_current_node(
-                node=self.fuzz_node, edge=mutation_context.message_path[-1], test_case_context=protocol_session
+                node=self.fuzz_node,
+                edge=mutation_context.message_path[-1],
+                test_case_context=protocol_session,
+                target=target,
             )
 
             self._fuzz_data_logger.open_test_step("Node Under Test '{0}'".format(self.fuzz_node.name))
@@ -1363,7 +1775,7 @@ class Session(pgraph.Graph):
                 mutation_context=mutation_context,
             )
 
-            self._check_for_passively_detected_failures(target)
+            self._check_for_passively_detected_failures(target, retrieve_data=True)
             if not self._reuse_target_connection:
                 target.close()
 
@@ -1381,21 +1793,24 @@ class Session(pgraph.Graph):
             self._fuzz_data_logger.close_test_case()
             self.export_file()
 
-    def _fuzz_current_case(self, mutation_context):
+    def _fuzz_current_case(self, mutation_context, target=None):
         """
         Fuzzes the current test case. Current test case is controlled by
         fuzz_case_iterator().
 
         Args:
             mutation_context (MutationContext): Current mutation context.
+            target (Target, optional): Target to fuzz. Default: The first target of the session.
 
         """
-        target = self.targets[0]
+        if target is None:
+            target = self.targets[0]
 
         self._pause_if_pause_flag_is_set()
 
         test_case_name = self._test_case_name(mutation_context)
         self.current_test_case_name = test_case_name
+        num_mutations_element = self.fuzz_node.get_num_mutations()
 
         self._fuzz_data_logger.open_test_case(
             "{0}: {1}".format(self.total_mutant_index, test_case_name),
@@ -1403,13 +1818,14 @@ class Session(pgraph.Graph):
             index=self.total_mutant_index,
             num_mutations=self.total_num_mutations,
             current_index=self.mutant_index,
-            current_num_mutations=self.fuzz_node.get_num_mutations(),
+            current_num_mutations=num_mutations_element,
         )
+        self._publish_test_case(test_case_name, num_mutations_element)
 
         if self.total_num_mutations is not None:
             self._fuzz_data_logger.log_info(
                 "Type: {0}. Case {1} of {2} overall.".format(
-                    type(self.fuzz_node.mutant).__name__,
+                    type(self._mutant).__name__,
                     self.total_mutant_index,
                     self.total_num_mutations,
                 )
@@ -1417,7 +1833,7 @@ class Session(pgraph.Graph):
         else:
             self._fuzz_data_logger.log_info(
                 "Type: {0}".format(
-                    type(self.fuzz_node.mutant).__name__,
+                    type(self._mutant).__name__,
                 )
             )
 
@@ -1434,7 +1850,9 @@ class Session(pgraph.Graph):
                     current_message=node,
                 )
                 mutation_context.protocol_session = protocol_session
-                callback_data = self._callback_current_node(node=node, edge=e, test_case_context=protocol_session)
+                callback_data = self._callback_current_node(
+                    node=node, edge=e, test_case_context=protocol_session, target=target
+                )
                 self._fuzz_data_logger.open_test_step("Transmit Prep Node '{0}'".format(node.name))
                 self.transmit_normal(target, node, e, callback_data=callback_data, mutation_context=mutation_context)
 
@@ -1446,7 +1864,10 @@ class Session(pgraph.Graph):
             )
             mutation_context.protocol_session = protocol_session
             callback_data = self._callback_current_node(
-                node=self.fuzz_node, edge=mutation_context.message_path[-1], test_case_context=protocol_session
+                node=self.fuzz_node,
+                edge=mutation_context.message_path[-1],
+                test_case_context=protocol_session,
+                target=target,
             )
             self._fuzz_data_logger.open_test_step("Fuzzing Node '{0}'".format(self.fuzz_node.name))
             self.transmit_fuzz(
@@ -1540,6 +1961,36 @@ class Session(pgraph.Graph):
     def _message_path_to_str(self, message_path):
         return "->".join([self.nodes[e.dst].name for e in message_path])
 
+    def crash_summary(self, limit):
+        """First failed test cases as (index, synopses) pairs (for use by web server).
+
+        Read from monitor_results, so unlike failures it includes the test cases the database logger has not written
+        yet.
+        """
+        with self._shared_state_lock:
+            monitor_results = dict(self.monitor_results)
+        return [(index, monitor_results[index]) for index in heapq.nsmallest(limit, monitor_results)]
+
+    def failures(self, **filters):
+        """Page of failed test cases stored in the database (for use by web server).
+
+        See FuzzLoggerDbReader.failures for the filters. Test cases that the database logger has not written yet are
+        missing.
+        """
+        return self._failure_reader().failures(**filters)
+
+    def failure_synopses(self, **filters):
+        """Distinct failure synopses stored in the database (for use by web server).
+
+        See FuzzLoggerDbReader.failure_synopses for the filters.
+        """
+        return self._failure_reader().failure_synopses(**filters)
+
+    def _failure_reader(self):
+        if self._db_reader is None:
+            self._db_reader = fuzz_logger_db.FuzzLoggerDbReader(db_filename=self._db_filename)
+        return self._db_reader
+
     def test_case_data(self, index):
         """Return test case data object (for use by web server)
 
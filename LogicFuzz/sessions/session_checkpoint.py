@@ -0,0 +1,186 @@
+import os
+import pickle
+import queue
+import struct
+import threading
+import time
+import zlib
+
+_RECORD_HEADER = struct.Struct(">II")  # payload length, crc32 of payload
+
+
+class SessionCheckpoint:
+    """Crash-consistent, asynchronous persistence of the Session state used for resuming a fuzzing run.
+
+    The state is kept in two files:
+
+    - The snapshot at ``filename``: the zlib-compressed, pickled state dict, in the format always used by
+      Session.export_file. It is replaced atomically.
+    - The journal at ``filename + ".journal"``: an append-only list of length-prefixed, checksummed records written
+      since the last snapshot. Each record holds the settings and resume point after one test case, plus the monitor
+      results of that test case.
+
+    :meth:`record` only enqueues; a background thread appends to the journal and writes a new snapshot every
+    ``snapshot_cases`` records or ``snapshot_seconds`` seconds, after which the journal starts over. :meth:`load`
+    reads the snapshot and replays the intact records of the journal, so a crash at any point loses at most the
+    records that were still queued.
+
+    Args:
+        filename (str): Snapshot filename. The journal is stored next to it.
+        snapshot_cases (int): Write a snapshot after this many records. Default 1000.
+        snapshot_seconds (float): Write a snapshot if the oldest unsnapshotted record is this old. Default 60.
+    """
+
+    def __init__(self, filename, snapshot_cases=1000, snapshot_seconds=60.0):
+        self.filename = filename
+        self.journal_filename = filename + ".journal"
+        self.snapshot_cases = snapshot_cases
+        self.snapshot_seconds = snapshot_seconds
+
+        self._state = None
+        self._journal_length = 0  # length of the intact part of an existing journal
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Read the most recent state: the snapshot, updated with all intact journal records.
+
+        Returns:
+            dict: State as passed to :meth:`record`, or None if neither a snapshot nor journal records exist.
+        """
+        state = None
+        try:
+            with open(self.filename, "rb") as f:
+                state = pickle.loads(zlib.decompress(f.read()))
+        except (IOError, zlib.error, pickle.UnpicklingError):
+            pass
+
+        self._journal_length = 0
+        try:
+            with open(self.journal_filename, "rb") as f:
+                journal = f.read()
+        except IOError:
+            journal = b""
+        for record, end in self._iter_records(journal):
+            if state is None:
+                state = {"monitor_results": {}}
+            self._apply(state, record)
+            self._journal_length = end
+
+        self._state = state
+        if state is None:
+            return None
+        return dict(state, monitor_results=dict(state.get("monitor_results", {})))
+
+    def record(self, data):
+        """Queue the state after a test case for persisting. Does not block.
+
+        Args:
+            data (dict): Session state. Its "monitor_results" entry holds only the results that are new since the
+                last record; they are merged into the accumulated results.
+        """
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="boofuzz-session-checkpoint")
+                self._thread.daemon = True
+                self._thread.start()
+        self._queue.put(data)
+
+    def snapshot(self):
+        """Block until all recorded state is written to a full snapshot."""
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        while not done.wait(timeout=0.1):
+            if not self._thread.is_alive():
+                return
+
+    def close(self):
+        """Write a final snapshot and stop the background thread. The next record starts it again."""
+        self.snapshot()
+        with self._lock:
+            if self._thread is not None:
+                self._queue.put(None)
+                self._thread.join()
+                self._thread = None
+
+    def _run(self):
+        journal = open(self.journal_filename, "ab")
+        journal.truncate(self._journal_length)
+        num_records = 0
+        oldest_record_time = None
+        try:
+            while True:
+                timeout = None
+                if oldest_record_time is not None:
+                    timeout = max(0.0, oldest_record_time + self.snapshot_seconds - time.time())
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = threading.Event()  # snapshot interval elapsed
+
+                if item is None:
+                    break
+                if isinstance(item, threading.Event):
+                    if num_records > 0:
+                        journal = self._write_snapshot(journal)
+                        num_records = 0
+                        oldest_record_time = None
+                    item.set()
+                    continue
+
+                if self._state is None:
+                    self._state = {"monitor_results": {}}
+                self._apply(self._state, item)
+                payload = pickle.dumps(item, protocol=pickle.HIGHEST_PROTOCOL)
+                journal.write(_RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload)
+                journal.flush()
+                num_records += 1
+                if oldest_record_time is None:
+                    oldest_record_time = time.time()
+
+                if num_records >= self.snapshot_cases:
+                    journal = self._write_snapshot(journal)
+                    num_records = 0
+                    oldest_record_time = None
+        finally:
+            # a restarted thread continues the journal from here
+            self._journal_length = journal.tell()
+            journal.close()
+
+    def _write_snapshot(self, journal):
+        tmp_filename = self.filename + ".tmp"
+        with open(tmp_filename, "wb") as f:
+            f.write(zlib.compress(pickle.dumps(self._state, protocol=2)))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_filename, self.filename)
+
+        # A crash before the journal is emptied is harmless: replaying its records on the new snapshot is a no-op.
+        journal.close()
+        return open(self.journal_filename, "wb")
+
+    @staticmethod
+    def _apply(state, record):
+        monitor_results = state.get("monitor_results", {})
+        state.update(record)
+        monitor_results.update(record.get("monitor_results", {}))
+        state["monitor_results"] = monitor_results
+
+    @staticmethod
+    def _iter_records(journal):
+        offset = 0
+        while offset + _RECORD_HEADER.size <= len(journal):
+            length, crc = _RECORD_HEADER.unpack_from(journal, offset)
+            start = offset + _RECORD_HEADER.size
+            payload = journal[start : start + length]
+            if len(payload) < length or zlib.crc32(payload) != crc:
+                return  # torn write at the end of the journal
+            try:
+                record = pickle.loads(payload)
+            except pickle.UnpicklingError:
+                return
+            offset = start + length
+            yield record, offset
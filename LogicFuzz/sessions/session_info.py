@@ -5,13 +5,18 @@ from ..fuzz_logger_db import FuzzLoggerDbReader
 
 class SessionInfo:
     """
+    Args:
+        db_filename (str): Name of the database file of the run.
+        pool_size (int): Read the database read-only through this many connections. See FuzzLoggerDbReader.
+            Default None.
+
     .. versionchanged:: 0.4.2
        This class has been moved into the sessions subpackage. The full path is now
        boofuzz.sessions.session_info.SessionInfo.
     """
 
-    def __init__(self, db_filename):
-        self._db_reader = FuzzLoggerDbReader(db_filename=db_filename)
+    def __init__(self, db_filename, pool_size=None):
+        self._db_reader = FuzzLoggerDbReader(db_filename=db_filename, pool_size=pool_size)
 
     @property
     def monitor_results(self):
@@ -48,8 +53,7 @@ class SessionInfo:
 
     @property
     def total_mutant_index(self):
-        x = next(self._db_reader.query("SELECT COUNT(*) FROM cases"))[0]
-        return x
+        return self._db_reader.run_statistics["num_cases"]
 
     @property
     def mutant_index(self):
@@ -66,6 +70,18 @@ class SessionInfo:
         """
         return self._db_reader.get_test_case_data(index=index)
 
+    def crash_summary(self, limit):
+        """First failed test cases as (index, synopses) pairs (for use by web server)."""
+        return [(failure["index"], failure["synopsis"].split("\n")) for failure in self.failures(limit=limit)]
+
+    def failures(self, **filters):
+        """Page of failed test cases (for use by web server). See FuzzLoggerDbReader.failures."""
+        return self._db_reader.failures(**filters)
+
+    def failure_synopses(self, **filters):
+        """Distinct failure synopses (for use by web server). See FuzzLoggerDbReader.failure_synopses."""
+        return self._db_reader.failure_synopses(**filters)
+
     @property
     def is_paused(self):
         return False
@@ -161,30 +161,43 @@ class Target:
         """
         Send data to the target. Only valid after calling open!
 
+        Data may be given as a list of bytes-like segments (see Fuzzable.render_segments), which the connection
+        transmits without concatenating them first if it supports scatter/gather I/O (see
+        ITargetConnection.send_segments).
+
         Args:
-            data: Data to send.
+            data: Data to send, bytes or list of segments.
 
         Returns:
-            None
+            bytes: The data, with segments joined once for the logger and the caller.
         """
+        if isinstance(data, list):
+            send = self._target_connection.send_segments
+            data_length = sum(len(segment) for segment in data)
+        else:
+            send = self._target_connection.send
+            data_length = len(data)
         num_sent = 0
         if self._fuzz_data_logger is not None:
             repeat = ""
             if self.repeater is not None:
                 repeat = ", " + self.repeater.log_message()
 
-            self._fuzz_data_logger.log_info("Sending {0} bytes{1}...".format(len(data), repeat))
+            self._fuzz_data_logger.log_info("Sending {0} bytes{1}...".format(data_length, repeat))
 
         if self.repeater is not None:
             self.repeater.start()
             while self.repeater.repeat():
-                num_sent = self._target_connection.send(data=data)
+                num_sent = send(data)
             self.repeater.reset()
         else:
-            num_sent = self._target_connection.send(data=data)
+            num_sent = send(data)
 
+        if isinstance(data, list):
+            data = b"".join(data)
         if self._fuzz_data_logger is not None:
             self._fuzz_data_logger.log_send(data[:num_sent])
+        return data
 
     def set_fuzz_data_logger(self, fuzz_data_logger):
         """
@@ -1,11 +1,12 @@
+import concurrent.futures
 import threading
 
 from tornado.httpserver import HTTPServer
 from tornado.ioloop import IOLoop
-from tornado.wsgi import WSGIContainer
 
 from boofuzz import constants
-from boofuzz.web.app import app
+from boofuzz.web import event_stream
+from boofuzz.web.app import app, CRASH_SUMMARY_LIMIT
 
 
 class WebApp:
@@ -16,21 +17,40 @@ class WebApp:
         web_port (int):         Port for monitoring fuzzing campaign via a web browser. Default 26000.
         web_address (string):   Address binded to port for monitoring fuzzing campaign via a web browser.
                                 Default 'localhost'.
+        num_threads (int):      Number of threads serving requests. Default None (the thread of the HTTP server).
 
     .. versionchanged:: 0.4.2
        This class has been moved into the sessions subpackage. The full path is now boofuzz.sessions.web_app.WebApp.
     """
 
     def __init__(
-        self, session_info, web_port=constants.DEFAULT_WEB_UI_PORT, web_address=constants.DEFAULT_WEB_UI_ADDRESS
+        self,
+        session_info,
+        web_port=constants.DEFAULT_WEB_UI_PORT,
+        web_address=constants.DEFAULT_WEB_UI_ADDRESS,
+        num_threads=None,
     ):
         self._session_info = session_info
+        self._event_bus = event_stream.EventBus()
+        self._event_bus.publish(
+            is_paused=session_info.is_paused,
+            current_index=session_info.total_mutant_index,
+            num_mutations=session_info.total_num_mutations,
+            current_test_case_name=session_info.current_test_case_name,
+            runtime=session_info.runtime,
+            exec_speed=session_info.exec_speed,
+        )
+        for index, synopses in session_info.crash_summary(limit=CRASH_SUMMARY_LIMIT):
+            self._event_bus.publish_failure(index, synopses)
+        self._executor = None
+        if num_threads is not None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=num_threads)
         self._web_interface_thread = self._build_webapp_thread(port=web_port, address=web_address)
         pass
 
     def _build_webapp_thread(self, port, address):
         app.session = self._session_info
-        http_server = HTTPServer(WSGIContainer(app))
+        http_server = HTTPServer(event_stream.make_application(app, self._event_bus, executor=self._executor))
         http_server.listen(port, address=address)
         flask_thread = threading.Thread(target=IOLoop.instance().start)
         flask_thread.daemon = True
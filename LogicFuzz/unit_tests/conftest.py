@@ -7,3 +7,20 @@ def context():
         pass
 
     return Context()
+
+
+@pytest.fixture
+def log_test_case():
+    """Log a test case of one step to a fuzz logger: send data, receive reply if given, and fail if asked to."""
+
+    def log(logger, index, data=b"data", reply=None, fail=False):
+        logger.open_test_case("case{0}".format(index), name="case{0}".format(index), index=index)
+        logger.open_test_step("step")
+        logger.log_send(data)
+        if reply is not None:
+            logger.log_recv(reply)
+        if fail:
+            logger.log_fail("failed")
+        logger.close_test_case()
+
+    return log
@@ -0,0 +1,46 @@
+import struct
+
+import pytest
+
+from boofuzz import BIG_ENDIAN, LITTLE_ENDIAN, BitField
+from boofuzz.primitives.bit_field import binary_string_to_int, int_to_binary_string
+
+
+def _render_int_bit_string(value, output_format, bit_width, endian, signed):
+    """The former bit string implementation of BitField._render_int, as reference."""
+    if output_format == "binary":
+        bit_stream = "0" * (-bit_width % 8) + int_to_binary_string(value, bit_width)
+        rendered = b"".join(
+            struct.pack("B", binary_string_to_int(bit_stream[i : i + 8])) for i in range(0, len(bit_stream), 8)
+        )
+        return rendered[::-1] if endian == LITTLE_ENDIAN else rendered
+    if signed and int_to_binary_string(value, bit_width)[0] == "1":
+        max_num = binary_string_to_int("1" + "0" * (bit_width - 1))
+        val = max_num - (value & binary_string_to_int("1" * (bit_width - 1))) - 1
+        return ("%d" % ~val).encode()
+    return ("%d" % value).encode()
+
+
+def _values(bit_width):
+    top = 1 << bit_width
+    return [0, 1, 2, 0x7F, top // 2 - 1, top // 2, top // 2 + 1, top - 2, top - 1, top, top + 5, 3 * top + 1, -1, -2]
+
+
+@pytest.mark.parametrize("bit_width", [1, 3, 7, 8, 9, 12, 16, 24, 31, 32, 33, 48, 64, 65, 128])
+@pytest.mark.parametrize("endian", [LITTLE_ENDIAN, BIG_ENDIAN])
+@pytest.mark.parametrize("output_format", ["binary", "ascii"])
+@pytest.mark.parametrize("signed", [False, True])
+def test_render_int_matches_bit_string_rendering(bit_width, endian, output_format, signed):
+    if output_format == "ascii" and signed and bit_width == 1:
+        pytest.skip("the bit string rendering fails on 1 bit signed fields")
+    for value in _values(bit_width):
+        assert BitField._render_int(
+            value, output_format=output_format, bit_width=bit_width, endian=endian, signed=signed
+        ) == _render_int_bit_string(value, output_format, bit_width, endian, signed), value
+
+
+def test_encode():
+    assert BitField(width=16, endian=BIG_ENDIAN).encode(0x0102, None) == b"\x01\x02"
+    assert BitField(width=12).encode(0xABC, None) == b"\xbc\x0a"
+    assert BitField(width=8, output_format="ascii", signed=True).encode(0xFF, None) == b"-1"
+    assert BitField(width=8, output_format="ascii").encode(0xFF, None) == b"255"
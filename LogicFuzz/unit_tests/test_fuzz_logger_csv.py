@@ -1,4 +1,5 @@
 import io
+import logging
 import re
 import unittest
 
@@ -589,6 +590,67 @@ class TestFuzzLoggerCsv(unittest.TestCase):
             ),
         )
 
+    def test_log_level(self):
+        """
+        Given: FuzzLoggerCsv with log_level ERROR.
+        When: Logging a test case with received data and a failure.
+        Then: Only the failure is logged.
+        """
+        # Given
+        self.logger = fuzz_logger_csv.FuzzLoggerCsv(file_handle=self.virtual_file, log_level=logging.ERROR)
+
+        # When
+        self.logger.open_test_case(
+            self.some_test_case_id, name=self.some_test_case_name, index=self.some_test_case_index
+        )
+        self.logger.log_recv(self.some_recv_data)
+        self.logger.log_fail(self.some_log_fail_msg)
+
+        # Then
+        self.virtual_file.seek(0)
+        self.assertRegex(
+            self.virtual_file.read(),
+            "^" + LOGGER_PREAMBLE + re.escape("fail,,," + self.some_log_fail_msg + "\r\n") + "$",
+        )
+
+    def test_max_data_bytes_and_flush_interval(self):
+        """
+        Given: FuzzLoggerCsv with max_data_bytes 2 and a flush_interval of an hour.
+        When: Calling log_send with some data.
+        Then: Nothing is written until close_test.
+         and: The row holds the full length, but only the first 2 bytes.
+        """
+        # Given
+        self.logger = fuzz_logger_csv.FuzzLoggerCsv(
+            file_handle=self.virtual_file, max_data_bytes=2, flush_interval=3600
+        )
+
+        # When
+        self.logger.log_send(self.some_send_data)
+
+        # Then
+        self.assertEqual("", self.virtual_file.getvalue())
+        self.logger.close_test()
+        self.virtual_file.seek(0)
+        self.assertRegex(self.virtual_file.readline(), LOGGER_PREAMBLE + re.escape("send,3,31 32,b'12'\r\n"))
+
+    def test_failure_is_written_right_away(self):
+        """
+        Given: FuzzLoggerCsv with a flush_interval of an hour.
+        When: Calling log_send, then log_fail.
+        Then: Both rows are written right away.
+        """
+        # Given
+        self.logger = fuzz_logger_csv.FuzzLoggerCsv(file_handle=self.virtual_file, flush_interval=3600)
+
+        # When
+        self.logger.log_send(self.some_send_data)
+        self.logger.log_fail(self.some_log_fail_msg)
+
+        # Then
+        self.virtual_file.seek(0)
+        self.assertEqual(2, len(self.virtual_file.readlines()))
+
 
 if __name__ == "__main__":
     unittest.main()
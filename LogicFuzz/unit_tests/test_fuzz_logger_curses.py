@@ -0,0 +1,58 @@
+import mock
+
+from boofuzz import fuzz_logger_curses
+
+
+def _logger(max_log_lines=500):
+    # without __init__, which takes over the terminal
+    logger = fuzz_logger_curses.FuzzLoggerCurses.__new__(fuzz_logger_curses.FuzzLoggerCurses)
+    logger._state = fuzz_logger_curses._LogState(max_log_lines)
+    return logger
+
+
+def test_logging_only_records_events():
+    logger = _logger()
+
+    with mock.patch("boofuzz.helpers.format_log_msg") as format_log_msg:
+        logger.open_test_case("case 1", name="case 1", index=1, num_mutations=10)
+        logger.open_test_step("step")
+        logger.log_send(b"\x01" * 100000)
+        logger.log_fail("crashed\n")
+        logger.close_test_case()
+
+    format_log_msg.assert_not_called()
+    state = logger._state
+    assert [event[0] for event in state.case_events] == ["test_case", "step", "send", "fail"]
+    assert (state.num_case_events, state.num_fail_events, state.num_closed_cases) == (4, 1, 1)
+    assert state.status == (0, 0, 1, 10)
+
+
+def test_ring_buffers_keep_last_events():
+    logger = _logger(max_log_lines=3)
+    logger.open_test_case("case 1", name="case 1", index=1)
+    logger.log_error("error")
+    logger.open_test_case("case 2", name="case 2", index=2)
+    for i in range(5):
+        logger.log_info("info {0}".format(i))
+        logger.log_fail("fail {0}".format(i))
+
+    case_lines = fuzz_logger_curses._format_case_events(logger._state.case_events, max_data_bytes=4)
+    fail_lines = fuzz_logger_curses._format_failures(logger._state.fail_events, indent_size=2)
+
+    assert [line[0].split(" ", 2)[2].strip() for line in case_lines] == [
+        "Check Failed: fail 3",
+        "Info: info 4",
+        "Check Failed: fail 4",
+    ]
+    assert [line[0] for line in fail_lines] == ["#2        fail 2", "#2        fail 3", "#2        fail 4"]
+
+
+def test_format_case_events_caps_data():
+    logger = _logger()
+    logger.open_test_case("case 1", name="case 1", index=1)
+    logger.log_recv(b"abcdefgh")
+
+    line, color = fuzz_logger_curses._format_case_events(logger._state.case_events, max_data_bytes=4)[1]
+
+    assert line.endswith("Received: 61 62 63 64 b'abcd' ... (4 more bytes)")
+    assert color == fuzz_logger_curses.COLOR_PAIR_CYAN
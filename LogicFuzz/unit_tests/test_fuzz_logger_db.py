@@ -0,0 +1,353 @@
+import sqlite3
+import threading
+
+import mock
+import pytest
+
+from boofuzz import fuzz_logger_db
+
+
+def _case_numbers(db_filename):
+    reader = fuzz_logger_db.FuzzLoggerDbReader(db_filename)
+    return [row[0] for row in reader.query("SELECT number FROM cases ORDER BY number")]
+
+
+def test_rows_are_written_by_writer_thread(tmp_path, log_test_case):
+    db_filename = str(tmp_path / "test.db")
+    logger = fuzz_logger_db.FuzzLoggerDb(db_filename=db_filename)
+    fuzzing_thread = threading.current_thread()
+    writing_threads = set()
+    executemany = logger._db_cursor.executemany
+
+    def record_thread(*args):
+        writing_threads.add(threading.current_thread())
+        return executemany(*args)
+
+    with mock.patch.object(logger, "_db_cursor") as cursor:
+        cursor.executemany.side_effect = record_thread
+        for i in range(1, 21):
+            log_test_case(logger, i)
+        logger.close_test()
+
+    assert writing_threads and fuzzing_thread not in writing_threads
+    assert _case_numbers(db_filename) == list(range(1, 21))
+    assert next(logger._database_connection.execute("PRAGMA journal_mode"))[0] == "wal"
+
+
+def test_get_test_case_data(tmp_path, log_test_case):
+    logger = fuzz_logger_db.FuzzLoggerDb(db_filename=str(tmp_path / "test.db"))
+    log_test_case(logger, 1, data=b"\x01\x02")
+
+    test_case = logger.get_test_case_data(1)
+
+    assert test_case.name == "case1"
+    assert [(step.type, step.data) for step in test_case.steps] == [("step", b""), ("send", b"\x01\x02")]
+    assert logger.get_test_case_data(2) is None
+
+
+def test_keep_only_n_cases_before_failure(tmp_path, log_test_case):
+    db_filename = str(tmp_path / "test.db")
+    logger = fuzz_logger_db.FuzzLoggerDb(db_filename=db_filename, num_log_cases=2, queue_size=1)
+    for i in range(1, 8):
+        log_test_case(logger, i, fail=i == 6)
+    logger.close_test()
+
+    assert _case_numbers(db_filename) == [1, 5, 6, 7]
+
+
+def test_writer_errors_are_raised_on_flush(tmp_path, log_test_case):
+    logger = fuzz_logger_db.FuzzLoggerDb(db_filename=str(tmp_path / "test.db"))
+    logger._database_connection.execute("DROP TABLE test_steps")
+
+    log_test_case(logger, 1)
+
+    with pytest.raises(sqlite3.Error):
+        logger.close_test()
+
+
+def test_writer_thread_survives_other_errors(tmp_path, log_test_case):
+    db_filename = str(tmp_path / "test.db")
+    logger = fuzz_logger_db.FuzzLoggerDb(db_filename=db_filename, queue_size=1)
+
+    with mock.patch.object(logger, "_replace_data_by_hash", side_effect=ValueError("bad data")):
+        log_test_case(logger, 1)
+        with pytest.raises(ValueError):
+            logger.flush()
+
+    assert logger._writer_thread.is_alive()
+    for i in range(2, 6):
+        log_test_case(logger, i)
+    logger.close_test()
+    assert _case_numbers(db_filename) == [2, 3, 4, 5]
+
+
+def _create_version_0_db(db_filename):
+    connection = sqlite3.connect(db_filename)
+    connection.execute("CREATE TABLE cases (name text, number integer, timestamp TEXT)")
+    connection.execute(
+        "CREATE TABLE steps (test_case_index integer, type text, description text, data blob, timestamp TEXT,"
+        " is_truncated BOOLEAN)"
+    )
+    connection.executemany("INSERT INTO cases VALUES(?, ?, ?)", [("case1", 1, "t1"), ("case2", 2, "t2")])
+    connection.executemany(
+        "INSERT INTO steps VALUES(?, ?, ?, ?, ?, ?)",
+        [
+            (1, "send", "", b"\x01", "t1", False),
+            (2, "fail", "crashed", b"", "t2", False),
+            (2, "pass", "", b"", "t2", 0),
+        ],
+    )
+    connection.commit()
+    connection.close()
+
+
+def test_migrate_version_0(tmp_path, log_test_case):
+    db_filename = str(tmp_path / "run-old.db")
+    _create_version_0_db(db_filename)
+
+    reader = fuzz_logger_db.FuzzLoggerDbReader(db_filename)
+
+    assert next(reader.query("PRAGMA user_version"))[0] == fuzz_logger_db.SCHEMA_VERSION
+    assert reader.num_test_cases == 2
+    assert reader.failure_map == {2: ["crashed"]}
+    assert [step.type for step in reader.get_test_case_data(2).steps] == ["fail", "pass"]
+    assert reader.get_test_case_data(1).steps[0].data == b"\x01"
+
+    logger = fuzz_logger_db.FuzzLoggerDb(db_filename=db_filename)
+    log_test_case(logger, 3, fail=True)
+    logger.close_test()
+    assert reader.num_test_cases == 3
+    assert sorted(reader.failure_map) == [2, 3]
+
+
+def test_summary(tmp_path, log_test_case):
+    db_filename = str(tmp_path / "test.db")
+    logger = fuzz_logger_db.FuzzLoggerDb(db_filename=db_filename)
+    for i in range(1, 6):
+        log_test_case(logger, i, fail=i == 4)
+    logger.close_test()
+    reader = fuzz_logger_db.FuzzLoggerDbReader(db_filename)
+
+    assert list(reader.query("SELECT num_cases, num_steps, last_case_number FROM summary")) == [(5, 11, 5)]
+    assert dict(reader.query("SELECT name, num_steps FROM step_types WHERE num_steps > 0")) == {
+        "step": 5,
+        "send": 5,
+        "fail": 1,
+    }
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "SELECT * FROM cases WHERE number = 1",
+        "SELECT * FROM steps WHERE test_case_index = 1",
+        "SELECT test_case_index, description FROM steps WHERE type = 'fail'",
+    ],
+)
+def test_queries_use_indexes(tmp_path, query):
+    reader = fuzz_logger_db.FuzzLoggerDbReader(str(tmp_path / "test.db"))
+
+    plan = " ".join(row[-1] for row in reader.query("EXPLAIN QUERY PLAN " + query))
+
+    assert "SCAN" not in plan
+
+
+def test_payloads_are_stored_once(tmp_path, log_test_case):
+    db_filename = str(tmp_path / "test.db")
+    logger = fuzz_logger_db.FuzzLoggerDb(db_filename=db_filename, compression="zlib", compression_threshold=100)
+    for i in range(1, 11):
+        log_test_case(logger, i, data=b"login" * 100)
+        log_test_case(logger, 100 + i, data=b"short")
+    log_test_case(logger, 200, data=bytes(range(256)))  # incompressible
+    logger.close_test()
+    reader = fuzz_logger_db.FuzzLoggerDbReader(db_filename)
+
+    blobs = sorted(reader.query("SELECT compression, length(data) FROM blobs"))
+    assert [compression for compression, _ in blobs] == [0, 0, 1]
+    assert blobs[0][1] == 5 and blobs[1][1] == 256 and blobs[2][1] < 100
+    assert reader.get_test_case_data(3).steps[1].data == b"login" * 100
+    assert reader.get_test_case_data(105).steps[1].data == b"short"
+    assert reader.get_test_case_data(200).steps[1].data == bytes(range(256))
+    assert reader.get_test_case_data(200).steps[0].data == b""
+
+
+def test_unknown_compression(tmp_path):
+    with pytest.raises(ValueError):
+        fuzz_logger_db.FuzzLoggerDb(db_filename=str(tmp_path / "test.db"), compression="lzma")
+
+
+def test_migrate_version_1(tmp_path):
+    db_filename = str(tmp_path / "run-v1.db")
+    connection = sqlite3.connect(db_filename)
+    connection.executescript("""
+        CREATE TABLE step_types (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE, num_steps INTEGER DEFAULT 0);
+        CREATE TABLE test_cases (id INTEGER PRIMARY KEY, name TEXT, number INTEGER, timestamp TEXT);
+        CREATE TABLE test_steps (id INTEGER PRIMARY KEY, test_case_index INTEGER, type_id INTEGER, description TEXT,
+            data BLOB, timestamp TEXT, is_truncated BOOLEAN);
+        CREATE INDEX test_cases_number ON test_cases (number);
+        CREATE INDEX test_steps_test_case_index ON test_steps (test_case_index);
+        CREATE INDEX test_steps_type ON test_steps (type_id, test_case_index);
+        CREATE TABLE summary (id INTEGER PRIMARY KEY, num_cases INTEGER, num_steps INTEGER, last_case_number INTEGER);
+        INSERT INTO summary VALUES (1, 2, 3, 2);
+        CREATE TRIGGER test_cases_summary AFTER INSERT ON test_cases BEGIN UPDATE summary SET num_cases = 0; END;
+        CREATE TRIGGER test_steps_summary AFTER INSERT ON test_steps BEGIN UPDATE summary SET num_steps = 0; END;
+        CREATE VIEW cases AS SELECT name, number, timestamp FROM test_cases;
+        CREATE VIEW steps AS SELECT * FROM test_steps;
+        INSERT INTO step_types (id, name) VALUES (5, 'send'), (7, 'fail');
+        INSERT INTO test_cases (name, number, timestamp) VALUES ('case1', 1, 't'), ('case2', 2, 't');
+        INSERT INTO test_steps (test_case_index, type_id, description, data, timestamp, is_truncated)
+            VALUES (1, 5, '', X'0102', 't', 0), (2, 5, '', X'0102', 't', 0), (2, 7, 'crashed', X'', 't', 0);
+        PRAGMA user_version = 1;
+        """)
+    connection.close()
+
+    reader = fuzz_logger_db.FuzzLoggerDbReader(db_filename)
+
+    assert next(reader.query("PRAGMA user_version"))[0] == fuzz_logger_db.SCHEMA_VERSION
+    assert list(reader.query("SELECT num_cases, num_steps, last_case_number FROM summary")) == [(2, 3, 2)]
+    assert list(reader.query("SELECT data FROM blobs")) == [(b"\x01\x02",)]
+    assert reader.failure_map == {2: ["crashed"]}
+    assert [(failure["index"], failure["node"], failure["synopsis"]) for failure in reader.failures()] == [
+        (2, "case2", "crashed")
+    ]
+    assert [(step.type, step.data) for step in reader.get_test_case_data(2).steps] == [
+        ("send", b"\x01\x02"),
+        ("fail", b""),
+    ]
+
+
+def _log_test_case_with_response(logger, index, response, fail=False):
+    logger.open_test_case("case{0}".format(index), name="case{0}".format(index), index=index)
+    logger.log_send(b"request")
+    logger.log_recv(response)
+    if fail:
+        logger.log_fail("failed")
+    logger.close_test_case()
+
+
+@pytest.mark.parametrize(
+    "kwargs, stored",
+    [
+        ({}, list(range(1, 21))),
+        ({"num_log_cases": 3}, [1, 10, 11, 12, 19, 20]),
+        ({"keep_every_nth_pass": 5}, [1, 5, 10, 12, 16]),
+        ({"keep_every_nth_pass": 5, "num_log_cases": 2}, [1, 5, 10, 11, 12, 16, 20]),
+        ({"keep_changed_responses": True}, [1, 7, 12]),
+    ],
+)
+def test_retention_policies(tmp_path, kwargs, stored):
+    db_filename = str(tmp_path / "test.db")
+    logger = fuzz_logger_db.FuzzLoggerDb(db_filename=db_filename, **kwargs)
+    for i in range(1, 21):
+        _log_test_case_with_response(logger, i, b"changed" if i == 7 else b"ok", fail=i == 12)
+    logger.close_test()
+    reader = fuzz_logger_db.FuzzLoggerDbReader(db_filename)
+
+    assert _case_numbers(db_filename) == stored
+    assert reader.run_statistics == {"num_cases": 20, "num_dropped_cases": 20 - len(stored), "num_failed_cases": 1}
+
+
+def test_keep_pass_interval(tmp_path, log_test_case):
+    db_filename = str(tmp_path / "test.db")
+    logger = fuzz_logger_db.FuzzLoggerDb(db_filename=db_filename, keep_pass_interval=10)
+    with mock.patch.object(fuzz_logger_db, "time") as time:
+        time.time.side_effect = [5, 6, 12, 19, 25, 31, 32]
+        for i in range(1, 8):
+            log_test_case(logger, i)
+    logger.close_test()
+
+    assert _case_numbers(db_filename) == [1, 3, 5, 6]
+
+
+@pytest.mark.parametrize(
+    "version, downgrade, run_statistics",
+    [
+        (2, "DROP TABLE run_statistics; DROP TABLE failures;", (3, 0, 1)),
+        (3, "DROP TABLE failures; UPDATE run_statistics SET num_cases = 10, num_dropped_cases = 7;", (10, 7, 1)),
+    ],
+)
+def test_upgrade(tmp_path, version, downgrade, run_statistics, log_test_case):
+    db_filename = str(tmp_path / "test.db")
+    logger = fuzz_logger_db.FuzzLoggerDb(db_filename=db_filename)
+    for i in range(1, 4):
+        log_test_case(logger, i, fail=i == 2)
+    logger.close_test()
+    connection = sqlite3.connect(db_filename)
+    connection.executescript("{0} PRAGMA user_version = {1};".format(downgrade, version))
+    connection.close()
+
+    reader = fuzz_logger_db.FuzzLoggerDbReader(db_filename)
+
+    assert next(reader.query("PRAGMA user_version"))[0] == fuzz_logger_db.SCHEMA_VERSION
+    assert reader.run_statistics == dict(zip(("num_cases", "num_dropped_cases", "num_failed_cases"), run_statistics))
+    assert [failure["index"] for failure in reader.failures()] == [2]
+    assert reader.get_test_case_data(2).steps[1].data == b"data"
+
+
+def _log_fuzz_case(logger, index, node, element, failures=()):
+    name = "setup->{0}:[{0}.{1}:{2}]".format(node, element, index)
+    logger.open_test_case("{0}: {1}".format(index, name), name=name, index=index)
+    logger.log_send(b"data")
+    for description in failures:
+        logger.log_fail(description)
+    logger.close_test_case()
+
+
+def test_failures(tmp_path):
+    db_filename = str(tmp_path / "test.db")
+    logger = fuzz_logger_db.FuzzLoggerDb(db_filename=db_filename, num_log_cases=1)
+    with mock.patch("boofuzz.helpers.time.time", side_effect=lambda: 1000.0 + index):
+        for index in range(1, 101):
+            node, element = ("login", "user.name") if index % 2 else ("cmd", "arg.value")
+            failures = ["timeout"] if index % 10 == 0 else (["crash", "no reply"] if index % 7 == 0 else [])
+            _log_fuzz_case(logger, index, node, element, failures)
+    logger.close_test()
+    reader = fuzz_logger_db.FuzzLoggerDbReader(db_filename)
+
+    page = reader.failures(limit=5)
+    assert [failure["index"] for failure in page] == [7, 10, 14, 20, 21]
+    assert page[0] == {
+        "index": 7,
+        "node": "login",
+        "element": "login.user.name",
+        "synopsis": "crash\nno reply",
+        "synopsis_hash": fuzz_logger_db.synopsis_hash("crash\nno reply"),
+        "timestamp": page[0]["timestamp"],
+    }
+    assert [failure["index"] for failure in reader.failures(after=21, limit=3)] == [28, 30, 35]
+    assert [failure["index"] for failure in reader.failures(node="login")] == [7, 21, 35, 49, 63, 77, 91]
+    assert [failure["index"] for failure in reader.failures(element="cmd.arg.value", limit=4)] == [10, 14, 20, 28]
+    timeout = fuzz_logger_db.synopsis_hash("timeout")
+    assert [failure["index"] for failure in reader.failures(synopsis_hash=timeout, since=1030, until=1060)] == [
+        30,
+        40,
+        50,
+    ]
+    assert [
+        (synopsis["synopsis"], synopsis["count"], synopsis["first_index"]) for synopsis in reader.failure_synopses()
+    ] == [
+        ("crash\nno reply", 13, 7),
+        ("timeout", 10, 10),
+    ]
+    assert [synopsis["count"] for synopsis in reader.failure_synopses(node="cmd")] == [10, 6]
+
+
+def test_read_only_pool(tmp_path, log_test_case):
+    db_filename = str(tmp_path / "test.db")
+    logger = fuzz_logger_db.FuzzLoggerDb(db_filename=db_filename)
+    for i in range(1, 4):
+        log_test_case(logger, i, fail=i == 2)
+    logger.close_test()
+
+    reader = fuzz_logger_db.FuzzLoggerDbReader(db_filename, pool_size=2)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(reader.failure_map)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [{2: ["failed"]}] * 4
+    assert reader.get_test_case_data(2).steps[-1].description == "failed"
+    with pytest.raises(sqlite3.OperationalError):
+        reader.query("DELETE FROM test_cases")
@@ -0,0 +1,146 @@
+import io
+import threading
+
+import pytest
+
+from boofuzz import fuzz_logger, fuzz_logger_queue, fuzz_logger_text, ifuzz_logger_backend, Session
+
+
+class RecordingLogger(ifuzz_logger_backend.IFuzzLoggerBackend):
+    def __init__(self, gate=None):
+        self.events = []
+        self.threads = set()
+        self.gate = gate
+
+    def _record(self, *event):
+        if self.gate is not None:
+            self.gate.wait()
+        self.threads.add(threading.current_thread())
+        self.events.append(event)
+
+    def open_test_case(self, test_case_id, name, index, *args, **kwargs):
+        self._record("open_test_case", index)
+
+    def open_test_step(self, description):
+        self._record("open_test_step", description)
+
+    def log_send(self, data):
+        self._record("log_send", data)
+
+    def log_recv(self, data):
+        self._record("log_recv", data)
+
+    def log_check(self, description):
+        self._record("log_check", description)
+
+    def log_pass(self, description=""):
+        self._record("log_pass", description)
+
+    def log_fail(self, description=""):
+        self._record("log_fail", description)
+
+    def log_info(self, description):
+        self._record("log_info", description)
+
+    def log_error(self, description):
+        self._record("log_error", description)
+
+    def close_test_case(self):
+        self._record("close_test_case")
+
+    def close_test(self):
+        self._record("close_test")
+
+
+def _log_test_case(logger, index):
+    logger.open_test_case("case{0}".format(index), name="case{0}".format(index), index=index)
+    logger.open_test_step("step")
+    logger.log_send(b"data")
+    logger.log_recv(b"reply")
+    logger.log_pass()
+    logger.close_test_case()
+
+
+def test_threaded_loggers_keep_order():
+    backends = [RecordingLogger(), RecordingLogger()]
+    logger = fuzz_logger.FuzzLogger(fuzz_loggers=backends, threaded=True)
+    for i in range(100):
+        _log_test_case(logger, i)
+    logger.log_fail("failure")
+    logger.close_test()
+
+    reference = RecordingLogger()
+    for i in range(100):
+        _log_test_case(reference, i)
+    reference.log_fail("failure")
+    reference.close_test()
+    for backend in backends:
+        assert backend.events == reference.events
+        assert threading.current_thread() not in backend.threads
+    assert logger.failed_test_cases == {"case99": ["failure"]}
+    assert [stats["processed"] for stats in logger.queue_stats] == [602, 602]
+
+
+def test_session_does_not_queue_db_logger(tmp_path):
+    backend = RecordingLogger()
+    session = Session(
+        web_port=None, fuzz_loggers=[backend], db_filename=str(tmp_path / "run.db"), threaded_fuzz_loggers=True
+    )
+    db_logger, queued_logger = session._fuzz_data_logger._fuzz_loggers
+
+    _log_test_case(session._fuzz_data_logger, 1)
+
+    assert db_logger is session._db_logger
+    assert isinstance(queued_logger, fuzz_logger_queue.FuzzLoggerQueue) and queued_logger.fuzz_logger is backend
+    assert session.test_case_data(1).name == "case1"
+    session._fuzz_data_logger.close_test()
+
+
+def test_slow_logger_does_not_block_others():
+    gate = threading.Event()
+    slow = fuzz_logger_queue.FuzzLoggerQueue(RecordingLogger(gate=gate), queue_size=10, overflow="drop")
+    fast = RecordingLogger()
+    logger = fuzz_logger.FuzzLogger(fuzz_loggers=[slow, fast], threaded=True)
+
+    for i in range(50):
+        _log_test_case(logger, i)
+    logger._fuzz_loggers[1].flush()
+
+    assert len(fast.events) == 300
+    stats = logger.queue_stats[0]
+    assert stats["logger"] == "RecordingLogger" and stats["dropped"] > 0 and stats["max_depth"] <= 11
+
+    gate.set()
+    logger.close_test()
+    # test cases are still opened and closed in pairs
+    events = [event[0] for event in slow.fuzz_logger.events if event[0] in ("open_test_case", "close_test_case")]
+    assert 0 < len(events) < 100
+    assert events == ["open_test_case", "close_test_case"] * (len(events) // 2)
+    assert slow.fuzz_logger.events[-1] == ("close_test",)
+
+
+def test_errors_are_raised_on_close_test():
+    backend = RecordingLogger()
+    backend.log_info = None  # not callable
+    logger = fuzz_logger_queue.FuzzLoggerQueue(backend)
+    logger.log_info("info")
+    logger.log_pass()
+
+    with pytest.raises(TypeError):
+        logger.close_test()
+    assert backend.events == [("log_pass", ""), ("close_test",)]
+
+
+def test_flush_flushes_wrapped_logger():
+    output = io.StringIO()
+    logger = fuzz_logger_queue.FuzzLoggerQueue(fuzz_logger_text.FuzzLoggerText(output, flush_interval=3600))
+    _log_test_case(logger, 1)
+
+    logger.flush()
+    assert len(output.getvalue().splitlines()) == 5
+    assert logger.stats["queued"] == logger.stats["processed"]
+
+
+def test_unknown_overflow_policy():
+    with pytest.raises(ValueError):
+        fuzz_logger_queue.FuzzLoggerQueue(RecordingLogger(), overflow="ignore")
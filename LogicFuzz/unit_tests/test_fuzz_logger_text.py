@@ -1,7 +1,10 @@
+import logging
 import unittest
 from builtins import bytes, chr
 from io import StringIO
 
+import mock
+
 import boofuzz.helpers
 from boofuzz import fuzz_logger_text
 
@@ -486,6 +489,67 @@ class TestFuzzLoggerText(unittest.TestCase):
         self.assertTrue(self.some_test_case_id in self.virtual_file.readline())
         self.assertTrue(hex_to_str(self.some_recv_data) in self.virtual_file.readline())
 
+    def test_log_level(self):
+        """
+        Given: FuzzLoggerText with log_level INFO.
+        When: Logging a test case with sent data, an info message and a failure.
+        Then: Everything but the sent data is logged, and the data is not formatted.
+        """
+        # Given
+        self.logger = fuzz_logger_text.FuzzLoggerText(file_handle=self.virtual_file, log_level=logging.INFO)
+
+        # When
+        with mock.patch("boofuzz.helpers.hex_to_hexstr") as hex_to_hexstr:
+            self.logger.open_test_case(self.some_test_case_id, self.some_test_case_name, self.some_test_case_index)
+            self.logger.log_send(self.some_send_data)
+            self.logger.log_info(self.some_log_info_msg)
+            self.logger.log_fail(self.some_log_fail_msg)
+
+        # Then
+        hex_to_hexstr.assert_not_called()
+        lines = self.virtual_file.getvalue().splitlines()
+        self.assertEqual(3, len(lines))
+        self.assertTrue(self.some_log_info_msg in lines[1])
+        self.assertTrue(self.some_log_fail_msg in lines[2])
+
+    def test_max_data_bytes(self):
+        """
+        Given: FuzzLoggerText with max_data_bytes 4.
+        When: Calling log_send with 1000 bytes.
+        Then: Only the first 4 bytes are rendered, with the full length and the number of omitted bytes.
+        """
+        # Given
+        self.logger = fuzz_logger_text.FuzzLoggerText(file_handle=self.virtual_file, max_data_bytes=4)
+
+        # When
+        self.logger.log_send(b"abcd" + b"x" * 996)
+
+        # Then
+        line = self.virtual_file.getvalue()
+        self.assertTrue("Transmitted 1000 bytes: 61 62 63 64 b'abcd' ... (996 more bytes)" in line)
+
+    def test_flush_interval(self):
+        """
+        Given: FuzzLoggerText with a flush_interval of an hour.
+        When: Logging a test case, then a failure.
+        Then: Nothing is written until the failure.
+         and: The failure is written right away, along with the messages before.
+        """
+        # Given
+        self.logger = fuzz_logger_text.FuzzLoggerText(file_handle=self.virtual_file, flush_interval=3600)
+
+        # When
+        self.logger.open_test_case(self.some_test_case_id, self.some_test_case_name, self.some_test_case_index)
+        self.logger.log_recv(self.some_recv_data)
+        self.assertEqual("", self.virtual_file.getvalue())
+        self.logger.log_fail(self.some_log_fail_msg)
+
+        # Then
+        lines = self.virtual_file.getvalue().splitlines()
+        self.assertEqual(3, len(lines))
+        self.assertTrue(self.some_test_case_id in lines[0])
+        self.assertTrue(self.some_log_fail_msg in lines[2])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,100 @@
+import os
+
+import pytest
+
+from boofuzz import exception, fuzz_logger_db, fuzz_logger_trace
+from boofuzz.sessions import SessionInfo
+
+
+def test_get_test_case_data(tmp_path, log_test_case):
+    filename = str(tmp_path / "run.trace")
+    logger = fuzz_logger_trace.FuzzLoggerTrace(filename)
+    for i in range(1, 4):
+        log_test_case(logger, i, data=b"\x00" * i, reply=b"reply", fail=i == 2)
+    logger.close_test()
+    reader = fuzz_logger_trace.FuzzLoggerTraceReader(filename)
+
+    test_case = reader.get_test_case_data(2)
+
+    assert (test_case.name, test_case.index) == ("case2", 2)
+    assert [(step.type, step.description, step.data) for step in test_case.steps] == [
+        ("step", "step", b""),
+        ("send", "", b"\x00\x00"),
+        ("receive", "", b"reply"),
+        ("fail", "failed", b""),
+    ]
+    assert reader.num_test_cases == 3
+    assert reader.failure_map == {2: ["failed"]}
+    with pytest.raises(exception.BoofuzzNoSuchTestCase):
+        reader.get_test_case_data(4)
+
+
+def test_segments_rotate(tmp_path, log_test_case):
+    filename = str(tmp_path / "run.trace")
+    logger = fuzz_logger_trace.FuzzLoggerTrace(filename, segment_size=200)
+    for i in range(1, 21):
+        log_test_case(logger, i, data=bytes([i]) * 10)
+    log_test_case(logger, 21, data=b"\xff" * 1000)  # larger than a segment
+    logger.close_test()
+    reader = fuzz_logger_trace.FuzzLoggerTraceReader(filename)
+
+    assert os.path.getsize(fuzz_logger_trace.segment_filename(filename, 0)) <= 200
+    assert os.path.exists(fuzz_logger_trace.segment_filename(filename, 3))
+    assert [test_case.index for test_case in reader.iter_test_cases()] == list(range(1, 22))
+    for i in range(1, 21):
+        assert reader.get_test_case_data(i).steps[1].data == bytes([i]) * 10
+    assert reader.get_test_case_data(21).steps[1].data == b"\xff" * 1000
+
+
+def test_read_while_logging(tmp_path, log_test_case):
+    filename = str(tmp_path / "run.trace")
+    logger = fuzz_logger_trace.FuzzLoggerTrace(filename)
+    log_test_case(logger, 1)
+    logger.flush()
+    reader = fuzz_logger_trace.FuzzLoggerTraceReader(filename)
+    assert [len(test_case.steps) for test_case in reader.iter_test_cases()] == [2]
+
+    log_test_case(logger, 2)
+    logger.flush()
+
+    assert reader.get_test_case_data(2).steps[1].data == b"data"
+
+    # a new logger continues the trace in a new segment
+    logger = fuzz_logger_trace.FuzzLoggerTrace(filename)
+    log_test_case(logger, 3)
+    logger.close_test()
+    assert [test_case.index for test_case in reader.iter_test_cases()] == [1, 2, 3]
+
+
+def test_import_to_db(tmp_path, log_test_case):
+    filename = str(tmp_path / "run.trace")
+    db_filename = str(tmp_path / "run.db")
+    logger = fuzz_logger_trace.FuzzLoggerTrace(filename)
+    for i in range(1, 6):
+        log_test_case(logger, i, data=b"x" * 1000, reply=b"reply", fail=i == 4)
+    logger.close_test()
+    trace_reader = fuzz_logger_trace.FuzzLoggerTraceReader(filename)
+
+    assert trace_reader.import_to_db(db_filename, batch_size=2) == 5
+
+    db_reader = fuzz_logger_db.FuzzLoggerDbReader(db_filename)
+    assert db_reader.num_test_cases == 5
+    assert db_reader.failure_map == {4: ["failed"]}
+    assert db_reader.get_test_case_data(3) == trace_reader.get_test_case_data(3)
+    assert list(db_reader.query("SELECT count(*) FROM blobs")) == [(2,)]
+
+
+def test_import_to_db_failures_and_statistics(tmp_path, log_test_case):
+    filename = str(tmp_path / "run.trace")
+    db_filename = str(tmp_path / "run.db")
+    logger = fuzz_logger_trace.FuzzLoggerTrace(filename)
+    for i in range(1, 7):
+        log_test_case(logger, i, fail=i % 2 == 1)
+    logger.close_test()
+
+    fuzz_logger_trace.FuzzLoggerTraceReader(filename).import_to_db(db_filename, batch_size=4)
+
+    db_reader = fuzz_logger_db.FuzzLoggerDbReader(db_filename)
+    assert [(f["index"], f["synopsis"]) for f in db_reader.failures()] == [(1, "failed"), (3, "failed"), (5, "failed")]
+    assert db_reader.run_statistics == {"num_cases": 6, "num_dropped_cases": 0, "num_failed_cases": 3}
+    assert SessionInfo(db_filename).total_mutant_index == 6
@@ -1,8 +1,19 @@
+import os
+import pickle
+import shutil
+import socket
+import struct
+import tempfile
+import threading
 import time
 import unittest
+import uuid
 from multiprocessing import Process
 
-from boofuzz.monitors import NetworkMonitor, pedrpc, ProcessMonitor
+import mock
+
+from boofuzz import exception, ifuzz_logger_backend, Session, Target
+from boofuzz.monitors import BaseMonitor, NetworkMonitor, pedrpc, ProcessMonitor
 
 RPC_HOST = "localhost"
 RPC_PORT = 31337
@@ -10,8 +21,8 @@ RPC_PORT = 31337
 
 # noinspection PyMethodMayBeStatic
 class MockRPCServer(pedrpc.Server):
-    def __init__(self, host, port):
-        super(MockRPCServer, self).__init__(host, port)
+    def __init__(self, host, port, codec="pickle"):
+        super(MockRPCServer, self).__init__(host, port, codec=codec)
         self.foobar = "barbaz"
 
     def alive(self):
@@ -35,6 +46,9 @@ class MockRPCServer(pedrpc.Server):
     def retrieve_data(self):
         return b"YES"
 
+    def retrieve(self, test_number):
+        return "pcap {0}".format(test_number).encode()
+
     def set_test(self, value):
         assert value is not None
 
@@ -52,6 +66,38 @@ class MockRPCServer(pedrpc.Server):
     def get_foobar(self):
         return self.foobar
 
+    def num_clients(self):
+        return len(self._Server__clients)
+
+    def get_pcap(self, size):
+        return pedrpc.StreamedBytes(bytes([i % 256]) * 1000 for i in range(size // 1000))
+
+    def get_broken_pcap(self, chunk_size):
+        def chunks():
+            yield b"x" * chunk_size
+            raise IOError("pcap file vanished")
+
+        return pedrpc.StreamedBytes(chunks())
+
+    def get_unencodable(self):
+        return lambda: None
+
+    def sleep(self, seconds):
+        return pedrpc.Blocking(lambda: time.sleep(seconds) or seconds)
+
+
+class SlowRPCServer(MockRPCServer):
+    def __init__(self, host, port, alive=True):
+        super(SlowRPCServer, self).__init__(host, port)
+        self.is_alive = alive
+
+    def post_send(self):
+        time.sleep(0.2)
+        return self.is_alive
+
+    def get_crash_synopsis(self):
+        return "" if self.is_alive else "crashed"
+
 
 def _start_rpc(server):
     server.serve_forever()
@@ -130,6 +176,252 @@ class TestNetworkMonitor(unittest.TestCase):
 
         self.assertEqual(self.rpc_server_process.exitcode, 0)
 
+    def test_retrieve_data_of_last_test_case(self):
+        self.assertIsNone(self.network_monitor.retrieve_data())
+
+        self.network_monitor.pre_send(session=mock.MagicMock(total_mutant_index=12))
+
+        self.assertEqual(self.network_monitor.retrieve_data(), b"pcap 12")
+
+
+class TestPedrpcConnections(unittest.TestCase):
+    codec = "pickle"
+
+    def setUp(self):
+        self.rpc_server = MockRPCServer(RPC_HOST, RPC_PORT, codec=self.codec)
+        self.rpc_server_thread = threading.Thread(target=self.rpc_server.serve_forever)
+        self.rpc_server_thread.start()
+
+    def tearDown(self):
+        self.rpc_server.stop()
+        self.rpc_server_thread.join()
+
+    def test_connection_is_kept(self):
+        client = pedrpc.Client(RPC_HOST, RPC_PORT)
+        other_client = pedrpc.Client(RPC_HOST, RPC_PORT)
+
+        client.set_foobar("bazbar")
+        self.assertEqual(other_client.get_foobar(), "bazbar")
+        self.assertEqual(client.alive(), True)
+        self.assertEqual(client.num_clients(), 2)
+
+    def test_pipeline_calls(self):
+        client = pedrpc.Client(RPC_HOST, RPC_PORT)
+
+        results = client.pipeline_calls([("set_foobar", ("bazbar",), {}), ("get_foobar", (), {}), ("alive", (), {})])
+
+        self.assertEqual(results, [None, "bazbar", True])
+        self.assertEqual(client.num_clients(), 1)
+
+    def test_reconnect_after_server_closed_connection(self):
+        client = pedrpc.Client(RPC_HOST, RPC_PORT)
+        self.assertEqual(client.alive(), True)
+        self.rpc_server.stop()
+        self.rpc_server_thread.join()
+        self.rpc_server = MockRPCServer(RPC_HOST, RPC_PORT, codec=self.codec)
+        self.rpc_server_thread = threading.Thread(target=self.rpc_server.serve_forever)
+        self.rpc_server_thread.start()
+
+        self.assertEqual(client.get_foobar(), "barbaz")
+
+    def test_streamed_bytes(self):
+        client = pedrpc.Client(RPC_HOST, RPC_PORT)
+        expected = b"".join(bytes([i % 256]) * 1000 for i in range(3000))
+
+        self.assertEqual(client.pipeline_calls([("get_pcap", (3000000,), {}), ("alive", (), {})]), [expected, True])
+        self.assertEqual(pedrpc.Client(RPC_HOST, RPC_PORT, persistent=False).get_pcap(3000000), expected)
+
+    def test_version_1_client(self):
+        client = pedrpc.Client(RPC_HOST, RPC_PORT, persistent=False)
+
+        self.assertEqual(
+            client.pipeline_calls([("set_foobar", ("bazbar",), {}), ("get_foobar", (), {})]), [None, "bazbar"]
+        )
+        self.assertEqual(client.num_clients(), 1)  # the one asking, the others disconnected
+
+    def test_clients_do_not_wait_for_each_other(self):
+        stalled = socket.create_connection((RPC_HOST, RPC_PORT))
+        stalled.sendall(b"\x10\x00")  # half a frame header
+        not_reading = pedrpc.Client(RPC_HOST, RPC_PORT)
+        not_reading._Client__open()
+        not_reading._Client__send_messages([(1, "get_pcap", (20000000,), {})])  # without reading the reply
+        client = pedrpc.Client(RPC_HOST, RPC_PORT)
+
+        self.assertEqual(client.alive(), True)
+        stalled.close()
+
+    def test_blocking_call_does_not_hold_up_other_clients(self):
+        client = pedrpc.Client(RPC_HOST, RPC_PORT)
+        results = []
+        thread = threading.Thread(
+            target=lambda: results.append(client.pipeline_calls([("sleep", (1,), {}), ("alive", (), {})]))
+        )
+        thread.start()
+        time.sleep(0.1)
+
+        start = time.time()
+        self.assertEqual(pedrpc.Client(RPC_HOST, RPC_PORT).alive(), True)
+        self.assertLess(time.time() - start, 0.5)
+        thread.join()
+        self.assertEqual(results, [[1, True]])
+
+    def test_failed_call_drops_client_only(self):
+        client = pedrpc.Client(RPC_HOST, RPC_PORT)
+
+        self.assertIsNone(client.pre_send(None))  # the assertion in pre_send fails on the server
+        self.assertEqual(client.alive(), True)
+
+    def test_failed_stream_or_reply_drops_client_only(self):
+        client = pedrpc.Client(RPC_HOST, RPC_PORT)
+
+        # the stream fails after the first chunk, while handling the request or after the write buffer drained
+        for chunk_size in (1000, 16 * 1024 * 1024):
+            errors = []
+            thread = threading.Thread(target=self._call_broken_pcap, args=(client, chunk_size, errors))
+            thread.start()
+            thread.join(timeout=10)
+            self.assertFalse(thread.is_alive())
+            self.assertEqual([exception.BoofuzzRpcError], [type(e) for e in errors])
+        self.assertIsNone(client.get_unencodable())
+        self.assertEqual(client.alive(), True)
+        self.assertEqual(client.num_clients(), 1)
+        self.assertTrue(self.rpc_server_thread.is_alive())
+
+    @staticmethod
+    def _call_broken_pcap(client, chunk_size, errors):
+        try:
+            client.get_broken_pcap(chunk_size)
+        except Exception as e:
+            errors.append(e)
+
+
+class TestPostTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.rpc_servers = [SlowRPCServer(RPC_HOST, RPC_PORT, alive=False), SlowRPCServer(RPC_HOST, RPC_PORT + 1)]
+        self.rpc_server_threads = [threading.Thread(target=server.serve_forever) for server in self.rpc_servers]
+        for thread in self.rpc_server_threads:
+            thread.start()
+        self.logger = mock.MagicMock(spec=ifuzz_logger_backend.IFuzzLoggerBackend)
+
+    def tearDown(self):
+        for server, thread in zip(self.rpc_servers, self.rpc_server_threads):
+            server.stop()
+            thread.join()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_base_monitor_post_test_case(self):
+        monitor = BaseMonitor()
+        monitor.post_send = mock.MagicMock(return_value=False)
+        monitor.get_crash_synopsis = mock.MagicMock(return_value="crashed")
+        monitor.retrieve_data = mock.MagicMock(return_value=b"data")
+
+        self.assertEqual(monitor.post_test_case(retrieve_data=True), (False, "crashed", b"data"))
+        monitor.post_send.return_value = True
+        self.assertEqual(monitor.post_test_case(), (True, None, None))
+        self.assertEqual(monitor.retrieve_data.call_count, 1)
+
+    def test_remote_monitors_are_queried_concurrently(self):
+        session = Session(web_port=None, fuzz_loggers=[self.logger], db_filename=os.path.join(self.tmp_dir, "run.db"))
+        target = Target(
+            connection=mock.MagicMock(),
+            monitors=[ProcessMonitor(RPC_HOST, RPC_PORT), NetworkMonitor(RPC_HOST, RPC_PORT + 1)],
+        )
+        session.add_target(target)
+        session.total_mutant_index = 7
+
+        start = time.time()
+        has_crashed = session._check_for_passively_detected_failures(target, retrieve_data=True)
+        duration = time.time() - start
+        session._get_monitor_data(target)
+
+        self.assertTrue(has_crashed)
+        self.assertLess(duration, 0.35)
+        fails = [c.kwargs["description"] for c in self.logger.log_fail.call_args_list]
+        self.assertEqual(len(fails), 1)
+        self.assertTrue(fails[0].endswith("detected crash on test case #7: crashed"))
+        self.assertEqual(session.monitor_data, {7: [b"pcap 7"]})
+
+    def test_network_monitor_reports_crash_with_synopsis(self):
+        session = Session(web_port=None, fuzz_loggers=[self.logger], db_filename=os.path.join(self.tmp_dir, "run.db"))
+        target = Target(connection=mock.MagicMock(), monitors=[NetworkMonitor(RPC_HOST, RPC_PORT)])
+        session.add_target(target)
+        session.total_mutant_index = 3
+
+        self.assertTrue(session._check_for_passively_detected_failures(target, retrieve_data=True))
+
+        fails = [c.kwargs["description"] for c in self.logger.log_fail.call_args_list]
+        self.assertEqual(len(fails), 1)
+        self.assertTrue(fails[0].endswith("detected crash on test case #3: crashed"))
+
+
+class TestPedrpcStructCodec(TestPedrpcConnections):
+    codec = "struct"
+
+    def test_client_requires_codec(self):
+        self.assertEqual(pedrpc.Client(RPC_HOST, RPC_PORT, codec="struct").alive(), True)
+
+        self.rpc_server.stop()
+        self.rpc_server_thread.join()
+        self.rpc_server = MockRPCServer(RPC_HOST, RPC_PORT)
+        self.rpc_server_thread = threading.Thread(target=self.rpc_server.serve_forever)
+        self.rpc_server_thread.start()
+
+        with self.assertRaises(exception.BoofuzzRpcError):
+            pedrpc.Client(RPC_HOST, RPC_PORT, codec="struct").alive()
+
+
+class TestPedrpcVersion1Server(unittest.TestCase):
+    def setUp(self):
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.listener.bind((RPC_HOST, RPC_PORT))
+        self.listener.listen(1)
+        self.requests = []
+        self.server_thread = threading.Thread(target=self._serve, args=(2,))
+        self.server_thread.start()
+
+    def tearDown(self):
+        self.server_thread.join()
+        self.listener.close()
+
+    def _serve(self, num_calls):
+        """Serve calls like a server of protocol version 1, one connection per call."""
+        instance = uuid.uuid4()
+        for _ in range(num_calls):
+            client_sock, _ = self.listener.accept()
+            _send(client_sock, instance)
+            self.requests.append(_recv(client_sock))
+            _send(client_sock, len(self.requests))
+            client_sock.close()
+
+    def test_client_falls_back_to_version_1(self):
+        client = pedrpc.Client(RPC_HOST, RPC_PORT)
+
+        self.assertEqual(client.alive(), 1)
+        self.assertEqual(client.set_foobar("bazbar"), 2)
+        self.assertEqual(self.requests, [("alive", ((), {})), ("set_foobar", (("bazbar",), {}))])
+
+    def test_process_monitor_asks_version_1_agent_for_synopsis_after_crash_only(self):
+        monitor = ProcessMonitor(RPC_HOST, RPC_PORT)
+
+        self.assertEqual(monitor.post_test_case(), (1, None, None))
+        self.assertEqual(monitor.alive(), 2)
+        self.assertEqual(self.requests, [("post_send", ((), {})), ("alive", ((), {}))])
+
+
+def _send(sock, data):
+    data = pickle.dumps(data, protocol=2)
+    sock.sendall(struct.pack("<L", len(data)) + data)
+
+
+def _recv(sock):
+    length = struct.unpack("<L", sock.recv(4))[0]
+    received = b""
+    while len(received) < length:
+        received += sock.recv(length - len(received))
+    return pickle.loads(received)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,96 @@
+import itertools
+
+import mock
+import pytest
+
+from boofuzz import *
+from boofuzz.mutation_context import MutationContext
+from boofuzz.mutation_index import MutationIndex
+
+
+@pytest.fixture(autouse=True)
+def clear_requests():
+    yield
+    blocks.REQUESTS = {}
+    blocks.CURRENT = None
+
+
+@pytest.fixture
+def request_with_groups():
+    s_initialize("index")
+    s_group("opcode", values=[b"\x01", b"\x02", b"\x03"])
+    s_byte(0x10, name="flags")
+    s_static(b"\x00")
+    if s_block_start("body", group="opcode"):
+        s_string("abc", max_len=20, name="text")
+        s_delim(" ", name="space", fuzzable=False)
+        if s_block_start("inner"):
+            s_word(0x1234, name="length", fuzz_values=[b"\xff\xff"])
+            s_bytes(b"\x00\x01", max_len=8, name="raw")
+        s_block_end()
+    s_block_end()
+    s_size("body", length=2, name="size")
+    return s_get("index")
+
+
+def _describe(request, mutations):
+    mutation_context = MutationContext(mutations=mutations)
+    return (
+        [(m.qualified_name, m.index) for m in mutations],
+        request.render(mutation_context),
+        request.mutant.qualified_name,
+    )
+
+
+def _all_mutations(request):
+    return [_describe(request, mutations) for mutations in request.get_mutations()]
+
+
+def test_num_mutations_matches_request(request_with_groups):
+    index = MutationIndex(request_with_groups)
+
+    assert index.num_mutations == request_with_groups.get_num_mutations()
+    assert index.num_mutations == len(_all_mutations(request_with_groups))
+
+
+def test_iter_from_matches_full_enumeration(request_with_groups):
+    expected = _all_mutations(request_with_groups)
+    index = MutationIndex(request_with_groups)
+
+    for start in itertools.chain(range(0, len(expected), len(expected) // 7 + 1), [len(expected) - 1]):
+        actual = [_describe(request_with_groups, m) for m in index.iter_from(start)]
+        assert actual == expected[start:]
+
+
+def test_locate(request_with_groups):
+    index = MutationIndex(request_with_groups)
+
+    for i, mutations in enumerate(request_with_groups.get_mutations()):
+        assert index.locate(i) == (mutations[-1].qualified_name, mutations[-1].index)
+
+
+def test_locate_out_of_range(request_with_groups):
+    index = MutationIndex(request_with_groups)
+
+    with pytest.raises(IndexError):
+        index.locate(index.num_mutations)
+
+
+def test_session_start_index_skips_to_same_test_case(request_with_groups, tmp_path):
+    s_initialize("second")
+    s_byte(0, name="b")
+    session = Session(web_port=None, fuzz_loggers=[], db_filename=str(tmp_path / "run.db"))
+    session.add_target(Target(connection=mock.MagicMock()))
+    session.connect(request_with_groups)
+    session.connect(request_with_groups, s_get("second"))
+
+    def names(start_index):
+        session.total_mutant_index = 0
+        return [
+            (session.total_mutant_index, session._test_case_name(m))
+            for m in session._generate_mutations_indefinitely(max_depth=1, start_index=start_index)
+        ]
+
+    expected = names(1)
+    for start_index in (2, 50, len(expected) - 3, len(expected)):
+        assert names(start_index) == expected[start_index - 1 :]
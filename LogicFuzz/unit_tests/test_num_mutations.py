@@ -0,0 +1,95 @@
+"""Consistency harness: the arithmetic mutation counts must match the number of mutations actually yielded."""
+
+import pytest
+
+from boofuzz import *
+
+
+@pytest.fixture(autouse=True)
+def clear_requests():
+    yield
+    blocks.REQUESTS = {}
+    blocks.CURRENT = None
+
+
+def assert_count_matches_enumeration(element):
+    assert element.get_num_mutations() == sum(1 for _ in element.get_mutations()), element
+
+
+@pytest.mark.parametrize("max_len", [None, 0, 1, 2, 5, 6, 7, 10, 17, 64, 66, 300, 65535, 65537, 99999, 100001])
+@pytest.mark.parametrize("default_value", ["", "C", "CCC", "abc", "id", "\xde\xad\xbe\xef" * 3])
+def test_string(max_len, default_value):
+    assert_count_matches_enumeration(String(default_value=default_value, max_len=max_len))
+
+
+@pytest.mark.parametrize("size", [1, 4, 6, 100])
+def test_string_with_size(size):
+    assert_count_matches_enumeration(String(default_value="CC", size=size))
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {},
+        {"min_length": 2, "max_length": 10, "max_mutations": 7},
+        {"min_length": 2, "max_length": 10, "step": 3},
+        {"max_length": 4, "fuzz_values": [b"\x00", b"\xff"]},
+    ],
+)
+def test_random_data(kwargs):
+    assert_count_matches_enumeration(RandomData(default_value=b"abc", **kwargs))
+
+
+def test_from_file(tmp_path):
+    (tmp_path / "a.txt").write_bytes(b"one\ntwo\n\nthree\n")
+    (tmp_path / "b.txt").write_bytes(b"four\nfive")
+    assert_count_matches_enumeration(FromFile(filename=str(tmp_path / "*.txt")))
+    assert_count_matches_enumeration(FromFile(filename=str(tmp_path / "*.txt"), max_len=4))
+
+
+def test_group():
+    assert_count_matches_enumeration(Group(values=[b"a", b"b", b"c"]))
+    assert_count_matches_enumeration(Group(values=["a", "b", "c"], default_value="b"))
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"f_min": 0.0, "f_max": 0.05, "max_mutations": 50}, {"seed": 1}])
+def test_float(kwargs):
+    assert_count_matches_enumeration(Float(default_value=1.5, **kwargs))
+
+
+@pytest.mark.parametrize("width", [1, 3, 4, 5, 8, 16, 32])
+@pytest.mark.parametrize("max_num", [None, 1, 7, 100])
+def test_bit_field(width, max_num):
+    assert_count_matches_enumeration(BitField(width=width, max_num=max_num))
+
+
+def test_bit_field_full_range():
+    assert_count_matches_enumeration(BitField(width=10, full_range=True))
+
+
+def test_other_primitives():
+    assert_count_matches_enumeration(Bytes(default_value=b"\x01\x02\x03\x04\x05", max_len=3))
+    assert_count_matches_enumeration(Delim(default_value=":"))
+    assert_count_matches_enumeration(Simple(default_value=b"x", fuzz_values=[b"a", b"b"]))
+
+
+def test_blocks_and_references():
+    s_initialize("num_mutations")
+    s_group("opcode", values=[b"\x01", b"\x02", b"\x03"])
+    if s_block_start("body", group="opcode"):
+        s_byte(0, name="flags")
+        s_string("abc", max_len=8, name="text")
+        s_random(b"xy", min_length=1, max_length=3, num_mutations=4, name="random")
+    s_block_end()
+    with s_aligned(4, name="aligned"):
+        s_bytes(b"\x00\x01", name="raw")
+    s_repeat("body", min_reps=1, max_reps=9, step=2, name="repeat")
+    s_checksum("body", algorithm="crc32", name="crc")
+    s_checksum("body", algorithm="sha1", name="sha1")
+    s_mirror("text", name="mirror")
+    s_size("body", name="size")
+    request = s_get("num_mutations")
+
+    for name in ("opcode", "body", "aligned", "repeat", "crc", "sha1", "mirror", "size"):
+        assert_count_matches_enumeration(request.names["num_mutations." + name])
+    assert_count_matches_enumeration(request)
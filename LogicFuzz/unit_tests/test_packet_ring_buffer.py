@@ -0,0 +1,99 @@
+import struct
+import threading
+import time
+
+from boofuzz.utils.packet_ring_buffer import PacketRingBuffer
+
+DLT_EN10MB = 1
+
+
+def parse_pcap(data):
+    magic, major, minor, _, _, snaplen, linktype = struct.unpack_from("<IHHiIII", data)
+    assert (magic, major, minor, snaplen, linktype) == (0xA1B2C3D4, 2, 4, 65535, DLT_EN10MB)
+    packets = []
+    position = 24
+    while position < len(data):
+        ts_sec, ts_usec, incl_len, orig_len = struct.unpack_from("<IIII", data, position)
+        position += 16
+        packets.append((ts_sec, ts_usec, data[position : position + incl_len], orig_len))
+        position += incl_len
+    return packets
+
+
+def test_packets_are_tagged_with_test_case():
+    ring = PacketRingBuffer(DLT_EN10MB, 65535)
+    ring.start_test_case(1)
+    ring.append(10, 1, b"a" * 10)
+    ring.append(10, 2, b"b" * 5, length=100)
+    ring.start_test_case(2)
+    ring.append(11, 0, b"c" * 7)
+
+    assert ring.case_bytes(1) == 15
+    assert ring.case_bytes(2) == 7
+    assert parse_pcap(b"".join(ring.pcap_chunks(1))) == [(10, 1, b"a" * 10, 10), (10, 2, b"b" * 5, 100)]
+    assert parse_pcap(b"".join(ring.pcap_chunks(2))) == [(11, 0, b"c" * 7, 7)]
+    assert parse_pcap(b"".join(ring.pcap_chunks(3))) == []
+
+
+def test_oldest_packets_are_dropped():
+    ring = PacketRingBuffer(DLT_EN10MB, 65535, max_bytes=25)
+    for test_number in range(1, 4):
+        ring.start_test_case(test_number)
+        ring.append(test_number, 0, b"x" * 10)
+
+    assert ring.num_bytes == 20
+    assert ring.num_dropped == 1
+    assert ring.case_bytes(1) == 0
+    assert parse_pcap(b"".join(ring.pcap_chunks(1))) == []
+    assert [p[0] for p in parse_pcap(b"".join(ring.pcap_chunks(2)))] == [2]
+
+
+def test_counters_of_old_test_cases_are_removed():
+    ring = PacketRingBuffer(DLT_EN10MB, 65535, max_bytes=10)
+    for test_number in range(1000):
+        ring.start_test_case(test_number)
+        if test_number % 2:
+            ring.append(0, 0, b"x" * 10)
+
+    assert len(ring._case_bytes) <= 2
+
+
+def test_wait_for_capture_includes_late_packets():
+    ring = PacketRingBuffer(DLT_EN10MB, 65535)
+    ring.start_test_case(1)
+    waiting = threading.Event()
+
+    def capture():
+        # like a pcap dispatch that hands over packets sent before post_send only after it started waiting
+        waiting.wait()
+        time.sleep(0.05)
+        ring.append(0, 0, b"late reply")
+        ring.end_dispatch()
+
+    thread = threading.Thread(target=capture)
+    thread.start()
+    waiting.set()
+    assert ring.wait_for_capture(timeout=5)
+    thread.join()
+
+    assert ring.case_bytes(1) == len(b"late reply")
+    assert len(parse_pcap(b"".join(ring.pcap_chunks(1)))) == 1
+
+
+def test_wait_for_capture_times_out():
+    ring = PacketRingBuffer(DLT_EN10MB, 65535)
+    ring.end_dispatch()
+
+    assert not ring.wait_for_capture(timeout=0.01)
+
+
+def test_write_pcap(tmp_path):
+    ring = PacketRingBuffer(DLT_EN10MB, 65535)
+    ring.start_test_case(5)
+    ring.append(1, 2, b"packet")
+    filename = str(tmp_path / "5.pcap")
+
+    assert ring.write_pcap(5, filename) == 1
+    with open(filename, "rb") as f:
+        assert parse_pcap(f.read()) == [(1, 2, b"packet", 6)]
+    assert ring.write_pcap(6, str(tmp_path / "6.pcap")) == 0
@@ -0,0 +1,50 @@
+import pickle
+
+import pytest
+
+from boofuzz import exception
+from boofuzz.monitors import pedrpc_codec
+
+MESSAGE = (
+    7,
+    "post_send",
+    (None, True, False, -(2**70), 2**63 - 1, 1.5, "é", b"\x00\xff" * 3, [1, [2]], ()),
+    {"key": {"nested": b""}},
+)
+
+
+@pytest.mark.parametrize("codec_name", ["pickle", "struct"])
+def test_round_trip(codec_name):
+    codec = pedrpc_codec.get_codec(codec_name)
+    payload = codec.encode(MESSAGE, protocol_version=3)
+
+    assert codec.decode(bytearray(payload)) == MESSAGE
+    assert pedrpc_codec.codec_of_frame(payload) is codec
+
+
+def test_pickle_protocol_depends_on_peer_version():
+    codec = pedrpc_codec.get_codec("pickle")
+
+    assert codec.encode(b"data", protocol_version=2)[:2] == b"\x80\x02"
+    assert codec.encode(b"data", protocol_version=3)[:2] == b"\x80" + bytes([pickle.HIGHEST_PROTOCOL])
+
+
+def test_struct_codec_rejects_other_objects():
+    codec = pedrpc_codec.get_codec("struct")
+
+    with pytest.raises(TypeError):
+        codec.encode(object())
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [b"", b"s\x05\x00\x00\x00abc", b"x", b"NN", b"l\x01\x00\x00\x00", pickle.dumps(("a", 1), protocol=2)],
+)
+def test_struct_codec_rejects_invalid_messages(payload):
+    with pytest.raises(exception.BoofuzzRpcError):
+        pedrpc_codec.get_codec("struct").decode(payload)
+
+
+def test_unknown_codec():
+    with pytest.raises(exception.BoofuzzRpcError):
+        pedrpc_codec.get_codec("json")
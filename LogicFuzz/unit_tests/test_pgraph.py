@@ -0,0 +1,89 @@
+import pytest
+
+from boofuzz import pgraph
+
+
+def _scan_from(graph, node_id):
+    return [edge for edge in graph.edges.values() if edge.src == node_id]
+
+
+def _scan_to(graph, node_id):
+    return [edge for edge in graph.edges.values() if edge.dst == node_id]
+
+
+def _node(node_id, name=None):
+    node = pgraph.Node(node_id)
+    node.name = name if name is not None else "node{0}".format(node_id)
+    return node
+
+
+@pytest.fixture
+def graph():
+    g = pgraph.Graph()
+    for i in range(6):
+        g.add_node(_node(i))
+    for src, dst in [(0, 1), (0, 2), (1, 3), (2, 3), (3, 4), (4, 1), (2, 2), (0, 5)]:
+        g.add_edge(pgraph.Edge(src, dst))
+    return g
+
+
+def _assert_adjacency_matches_scan(graph):
+    for node_id in list(graph.nodes) + [99]:
+        assert graph.edges_from(node_id) == _scan_from(graph, node_id)
+        assert graph.edges_to(node_id) == _scan_to(graph, node_id)
+
+
+def test_adjacency(graph):
+    _assert_adjacency_matches_scan(graph)
+    assert [edge.dst for edge in graph.edges_from(0)] == [1, 2, 5]
+
+
+def test_adjacency_after_changes(graph):
+    graph.del_edge(src=0, dst=2)
+    graph.add_edge(pgraph.Edge(5, 0))
+    graph.add_edge(pgraph.Edge(0, 1), prevent_dups=False)
+    graph.update_node_id(2, 7)
+    _assert_adjacency_matches_scan(graph)
+
+    # edges added to the dictionary directly are picked up as well
+    edge = pgraph.Edge(5, 3)
+    graph.edges[edge.id] = edge
+    _assert_adjacency_matches_scan(graph)
+
+
+def test_add_edge_requires_nodes(graph):
+    graph.add_edge(pgraph.Edge(0, 42))
+
+    assert graph.edges_to(42) == []
+
+
+def test_find_node(graph):
+    assert graph.find_node("name", "node3") is graph.nodes[3]
+    assert graph.find_node("name", "missing") is None
+
+    graph.add_node(_node(6, name="node3"))
+    graph.add_node(_node(7, name="new"))
+    assert graph.find_node("name", "node3") is graph.nodes[3]
+    assert graph.find_node("name", "new") is graph.nodes[7]
+
+    graph.del_node(3)
+    assert graph.find_node("name", "node3") is graph.nodes[6]
+
+    graph.update_node_id(7, 8)
+    assert graph.find_node("name", "new") is graph.nodes[8]
+
+
+def test_find_edge(graph):
+    assert graph.find_edge("dst", 3).src == 1
+    graph.del_edge(src=1, dst=3)
+    assert graph.find_edge("dst", 3).src == 2
+    assert graph.find_edge("dst", 42) is None
+
+
+def test_graph_down_and_up(graph):
+    assert sorted(graph.graph_down(2).nodes) == [1, 2, 3, 4]
+    assert sorted(graph.graph_down(0, max_depth=2).nodes) == [0, 1, 2, 3, 5]
+    assert sorted(graph.graph_up(3).nodes) == [0, 1, 2, 3, 4]
+    assert sorted(graph.graph_up(3).edges) == sorted(
+        edge.id for edge in graph.edges.values() if (edge.src, edge.dst) != (0, 5)
+    )
@@ -0,0 +1,40 @@
+import itertools
+
+import mock
+
+from boofuzz import *
+
+
+def test_mutations_are_reproducible():
+    random_data = RandomData(min_length=0, max_length=100, max_mutations=50)
+
+    values = list(random_data.mutations(b""))
+
+    assert values == list(RandomData(min_length=0, max_length=100, max_mutations=50).mutations(b""))
+    assert len(values) == 50
+    assert all(0 <= len(value) <= 100 for value in values)
+    assert len(set(values)) > 1
+
+
+def test_step_lengths():
+    random_data = RandomData(min_length=2, max_length=10, step=4)
+
+    assert [len(value) for value in random_data.mutations(b"")] == [2, 6, 10]
+
+
+def test_random_value_is_generated_on_its_own():
+    random_data = RandomData(min_length=10, max_length=100000, max_mutations=1000)
+    last = random_data.random_value(999)
+
+    with mock.patch.object(random_data, "random_value", wraps=random_data.random_value) as random_value:
+        assert list(random_data.mutations_from(b"", 999)) == [last]
+    random_value.assert_called_once_with(999)
+    assert list(itertools.islice(random_data.mutations(b""), 999, None)) == [last]
+
+
+def test_get_mutations_from_start():
+    random_data = RandomData(min_length=1, max_length=4, max_mutations=5, fuzz_values=[b"a", b"b"], name="random")
+    all_mutations = list(random_data.get_mutations())
+
+    for start in range(len(all_mutations) + 1):
+        assert list(random_data.get_mutations(start=start)) == all_mutations[start:]
@@ -0,0 +1,110 @@
+import mock
+import pytest
+
+from boofuzz import *
+from boofuzz import fuzzable_block
+from boofuzz.mutation_context import MutationContext
+from boofuzz.render_cache import get_render_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_requests():
+    yield
+    blocks.REQUESTS = {}
+    blocks.CURRENT = None
+
+
+@pytest.fixture
+def request_with_references():
+    s_initialize("cache")
+    s_group("opcode", values=[b"\x01", b"\x02"])
+    s_size("body", length=2, name="size")
+    if s_block_start("body", group="opcode"):
+        s_string("abc", max_len=6, name="text")
+        s_byte(7, name="flags")
+        if s_block_start("inner", dep="flags", dep_value=b"\x07"):
+            s_bytes(b"\x00\x01", max_len=3, name="raw")
+        s_block_end()
+    s_block_end()
+    if s_block_start("framed"):
+        s_word(0x1234, name="word")
+        s_checksum("framed", algorithm="crc32", name="self_crc")
+    s_block_end()
+    s_checksum("body", algorithm="adler32", name="crc")
+    s_mirror("text", name="mirror")
+    s_repeat("inner", min_reps=0, max_reps=2, name="repeat")
+    s_static(b"\r\n")
+    return s_get("cache")
+
+
+def _render_uncached(request, mutation_context):
+    with mock.patch.object(fuzzable_block, "get_render_cache", return_value=None):
+        return request.render(mutation_context)
+
+
+def test_cached_render_matches_uncached_render(request_with_references):
+    """
+    Given: A request with Size, Checksum, Mirror, Repeat and dependent blocks
+    When: Rendering every mutation with the render cache
+    Then: Each rendering equals the uncached rendering.
+    """
+    assert request_with_references.render() == _render_uncached(request_with_references, None)
+    for mutations in request_with_references.get_mutations():
+        mutation_context = MutationContext(mutations=mutations)
+        assert request_with_references.render(mutation_context) == _render_uncached(
+            request_with_references, mutation_context
+        )
+
+
+def test_influences(request_with_references):
+    cache = get_render_cache(request_with_references)
+
+    assert cache._influences["cache.opcode"] == frozenset(["cache.opcode"])
+    assert cache._influences["cache.mirror"] == frozenset(["cache.mirror", "cache.body.text"])
+    assert "cache.body.text" in cache._influences["cache.size"]
+    assert "cache.body.text" in cache._influences["cache.crc"]
+    assert "cache.body.flags" in cache._influences["cache.body.inner"]  # dep
+    assert "cache.body.inner.raw" in cache._influences["cache.repeat"]
+    # the checksum inside the block it checksums is a reference cycle
+    assert cache._influences["cache.framed.self_crc"] is None
+    assert cache._influences["cache.framed"] is None
+    assert cache._influences["cache"] is None
+
+
+def test_unaffected_elements_are_not_rendered_again(request_with_references):
+    request_with_references.render()
+    opcode = request_with_references.names["cache.opcode"]
+
+    with mock.patch.object(type(opcode), "render", side_effect=AssertionError("rendered again")):
+        request_with_references.render(
+            MutationContext(mutations=[next(request_with_references.names["cache.body.text"].get_mutations())[0]])
+        )
+
+
+def test_s_update_invalidates(request_with_references):
+    request_with_references.render()
+
+    s_update("cache.body.text", "xyz")
+
+    assert b"xyz" in request_with_references.render()
+    assert request_with_references.render() == _render_uncached(request_with_references, None)
+
+
+def test_cache_is_rebuilt_when_elements_are_added():
+    s_initialize("growing")
+    s_byte(1, name="a")
+    assert s_get("growing").render() == b"\x01"
+
+    s_byte(2, name="b")
+
+    assert s_get("growing").render() == b"\x01\x02"
+
+
+def test_protocol_session_references_are_not_cached():
+    s_initialize("session_reference")
+    s_byte(ProtocolSessionReference(name="var", default_value=1), name="ref")
+    request = s_get("session_reference")
+    protocol_session = ProtocolSession(session_variables={"var": 5})
+
+    assert request.render() == b"\x01"
+    assert request.render(MutationContext(protocol_session=protocol_session)) == b"\x05"
@@ -0,0 +1,121 @@
+import socket
+
+import mock
+import pytest
+
+from boofuzz import *
+from boofuzz.connections import base_socket_connection
+from boofuzz.mutation import Mutation
+from boofuzz.mutation_context import MutationContext
+
+
+@pytest.fixture(autouse=True)
+def clear_requests():
+    yield
+    blocks.REQUESTS = {}
+    blocks.CURRENT = None
+
+
+@pytest.fixture
+def nested_request():
+    s_initialize("segments")
+    s_size("outer", length=4, name="size")
+    if s_block_start("outer"):
+        s_byte(1, name="flags")
+        if s_block_start("inner"):
+            s_string("abc", name="text")
+            with s_aligned(8, pattern=b"\xaa"):
+                s_bytes(b"\x01\x02\x03", max_len=11, name="raw")
+        s_block_end()
+        if s_block_start("encoded", encoder=lambda data: data[::-1]):
+            s_word(0x0102, name="word")
+        s_block_end()
+        if s_block_start("hidden", dep="flags", dep_value=b"\x02"):
+            s_static(b"never")
+        s_block_end()
+    s_block_end()
+    s_checksum("outer", name="crc")
+    return s_get("segments")
+
+
+def test_segments_concatenate_to_rendering(nested_request):
+    """
+    Given: A request with nested, aligned, encoded and dependent blocks
+    When: Rendering each mutation as segments
+    Then: The concatenated segments equal the rendering.
+    """
+    assert b"".join(nested_request.render_segments()) == nested_request.render()
+    for mutations in nested_request.get_mutations():
+        mutation_context = MutationContext(mutations=mutations)
+        assert b"".join(nested_request.render_segments(mutation_context)) == nested_request.render(mutation_context)
+
+
+def test_mutated_value_is_not_copied_into_blocks(nested_request):
+    """
+    Given: A String nested in two blocks
+    When: Rendering a long string mutation of it as segments
+    Then: The encoded mutation is a segment of its own and all other segments are small.
+    """
+    text = nested_request.names["segments.outer.inner.text"]
+    long_value = "A" * 100000
+    mutation_context = MutationContext(
+        mutations=[Mutation(value=long_value, qualified_name=text.qualified_name, index=0)]
+    )
+
+    segments = nested_request.render_segments(mutation_context)
+
+    assert [len(segment) for segment in segments].count(len(long_value)) == 1
+    assert sum(len(segment) for segment in segments) - len(long_value) < 100
+
+
+class _SocketPairConnection(base_socket_connection.BaseSocketConnection):
+    def __init__(self, sock):
+        super(_SocketPairConnection, self).__init__(send_timeout=1.0, recv_timeout=1.0)
+        self._sock = sock
+
+    def open(self):
+        pass
+
+    def recv(self, max_bytes):
+        return self._sock.recv(max_bytes)
+
+    def send(self, data):
+        return self._sock.send(data)
+
+    def send_segments(self, segments):
+        return self._send_segments(segments, max_size=8)
+
+    @property
+    def info(self):
+        return "socketpair"
+
+
+@pytest.mark.skipif(not hasattr(socket, "socketpair"), reason="requires socket.socketpair")
+def test_send_segments_truncates_and_gathers():
+    left, right = socket.socketpair()
+    try:
+        connection = _SocketPairConnection(left)
+
+        num_sent = connection.send_segments([b"abc", memoryview(b"defgh"), b"ij"])
+
+        assert num_sent == 8
+        assert right.recv(100) == b"abcdefgh"
+    finally:
+        left.close()
+        right.close()
+
+
+def test_target_sends_segments_and_logs_data():
+    connection = mock.MagicMock()
+    connection.send_segments.return_value = 6
+    logger = mock.MagicMock()
+    target = Target(connection=connection)
+    target.set_fuzz_data_logger(logger)
+
+    sent = target.send([b"abc", memoryview(b"def")])
+
+    connection.send_segments.assert_called_once_with([b"abc", mock.ANY])
+    connection.send.assert_not_called()
+    logger.log_info.assert_called_once_with("Sending 6 bytes...")
+    logger.log_send.assert_called_once_with(b"abcdef")
+    assert sent is logger.log_send.call_args[0][0]  # joined once, for the logger and the session's last_send
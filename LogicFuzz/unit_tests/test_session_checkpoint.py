@@ -0,0 +1,179 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import mock
+
+from boofuzz import blocks, s_byte, s_get, s_initialize, Session, Target
+from boofuzz.sessions.session_checkpoint import SessionCheckpoint
+
+
+def _state(index, results=None):
+    return {"total_mutant_index": index, "index_start": index, "monitor_results": results or {}}
+
+
+class TestSessionCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmp_dir, "session")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_load_without_files(self):
+        self.assertIsNone(SessionCheckpoint(self.filename).load())
+
+    def test_journal_is_replayed_before_first_snapshot(self):
+        """
+        Given: A checkpoint that has journaled records but never written a snapshot (as after a crash)
+        When: Loading the state from a new checkpoint
+        Then: The latest record is restored and monitor results of all records are merged.
+        """
+        checkpoint = SessionCheckpoint(self.filename, snapshot_cases=100, snapshot_seconds=3600)
+        checkpoint.record(_state(1, {1: ["crash 1"]}))
+        checkpoint.record(_state(2))
+        checkpoint.record(_state(3, {3: ["crash 3"]}))
+        self._wait_for_journal(checkpoint, 3)
+
+        self.assertFalse(os.path.exists(self.filename))
+        state = SessionCheckpoint(self.filename).load()
+        self.assertEqual(3, state["total_mutant_index"])
+        self.assertEqual({1: ["crash 1"], 3: ["crash 3"]}, state["monitor_results"])
+
+    def test_snapshot_after_n_records(self):
+        """
+        Given: A checkpoint with snapshot_cases 2
+        When: Recording three states
+        Then: A snapshot holds the first two, the journal only the third, and loading restores all of them.
+        """
+        checkpoint = SessionCheckpoint(self.filename, snapshot_cases=2, snapshot_seconds=3600)
+        checkpoint.record(_state(1, {1: ["crash 1"]}))
+        checkpoint.record(_state(2))
+        checkpoint.record(_state(3))
+        self._wait_for_journal(checkpoint, 1)
+
+        self.assertTrue(os.path.exists(self.filename))
+        state = SessionCheckpoint(self.filename).load()
+        self.assertEqual(3, state["total_mutant_index"])
+        self.assertEqual({1: ["crash 1"]}, state["monitor_results"])
+
+    def test_torn_journal_tail_is_ignored(self):
+        """
+        Given: A journal whose last record was only partially written
+        When: Loading the state and recording further states
+        Then: The torn record is ignored and overwritten by the next record.
+        """
+        checkpoint = SessionCheckpoint(self.filename, snapshot_cases=100, snapshot_seconds=3600)
+        checkpoint.record(_state(1))
+        checkpoint.record(_state(2))
+        self._wait_for_journal(checkpoint, 2)
+        with open(checkpoint.journal_filename, "rb+") as f:
+            f.truncate(os.path.getsize(checkpoint.journal_filename) - 3)
+
+        resumed = SessionCheckpoint(self.filename, snapshot_cases=100, snapshot_seconds=3600)
+        self.assertEqual(1, resumed.load()["total_mutant_index"])
+        resumed.record(_state(5))
+        self._wait_for_journal(resumed, 2)
+        self.assertEqual(5, SessionCheckpoint(self.filename).load()["total_mutant_index"])
+
+    def test_close_writes_snapshot_and_empties_journal(self):
+        checkpoint = SessionCheckpoint(self.filename, snapshot_cases=100, snapshot_seconds=3600)
+        checkpoint.record(_state(1, {1: ["crash 1"]}))
+        checkpoint.record(_state(2))
+        checkpoint.close()
+
+        self.assertEqual(0, os.path.getsize(checkpoint.journal_filename))
+        state = SessionCheckpoint(self.filename).load()
+        self.assertEqual(2, state["total_mutant_index"])
+        self.assertEqual({1: ["crash 1"]}, state["monitor_results"])
+
+    def test_record_after_close(self):
+        crashed = SessionCheckpoint(self.filename, snapshot_cases=100, snapshot_seconds=3600)
+        crashed.record(_state(1, {1: ["crash 1"]}))
+        self._wait_for_journal(crashed, 1)
+        checkpoint = SessionCheckpoint(self.filename, snapshot_cases=100, snapshot_seconds=3600)
+        checkpoint.load()
+
+        checkpoint.record(_state(2, {2: ["crash 2"]}))
+        checkpoint.close()
+        checkpoint.record(_state(3, {3: ["crash 3"]}))
+        self._wait_for_journal(checkpoint, 1)  # the restarted thread continues the emptied journal
+
+        state = SessionCheckpoint(self.filename).load()
+        self.assertEqual(3, state["total_mutant_index"])
+        self.assertEqual({1: ["crash 1"], 2: ["crash 2"], 3: ["crash 3"]}, state["monitor_results"])
+        checkpoint.close()
+
+    @staticmethod
+    def _wait_for_journal(checkpoint, num_records):
+        for _ in range(500):
+            try:
+                with open(checkpoint.journal_filename, "rb") as f:
+                    journal = f.read()
+            except IOError:
+                journal = b""
+            if len(list(SessionCheckpoint._iter_records(journal))) == num_records:
+                return
+            time.sleep(0.01)
+        raise AssertionError("journal did not reach {0} records".format(num_records))
+
+
+class TestSessionResume(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        s_initialize("resume")
+        s_byte(0, name="payload")
+
+    def tearDown(self):
+        blocks.REQUESTS = {}
+        blocks.CURRENT = None
+        shutil.rmtree(self.tmp_dir)
+
+    def _session(self):
+        session = Session(
+            web_port=None,
+            fuzz_loggers=[],
+            db_filename=os.path.join(self.tmp_dir, "run.db"),
+            session_filename=os.path.join(self.tmp_dir, "session"),
+            session_snapshot_cases=10,
+        )
+        session.add_target(Target(connection=mock.MagicMock()))
+        session.connect(s_get("resume"))
+        return session
+
+    def test_import_file_resumes_after_last_test_case(self):
+        """
+        Given: A Session with session_filename that fuzzed some test cases
+        When: Creating a new Session with the same session_filename
+        Then: It resumes at the last test case of the first run.
+        """
+        session = self._session()
+        session.fuzz(max_depth=1)
+        total = session.total_mutant_index
+
+        self.assertIsNone(session._checkpoint._thread)  # closed, nothing is left in the queue
+        resumed = self._session()
+
+        self.assertEqual(total, resumed._index_start)
+        self.assertEqual(total, resumed.total_mutant_index)
+
+    def test_session_filename_assigned_later(self):
+        """
+        Given: A Session without session_filename, which is assigned after a failure
+        When: Exporting to it and later to another session_filename
+        Then: Both files hold the state, including the failure found before.
+        """
+        session = Session(web_port=None, fuzz_loggers=[], db_filename=os.path.join(self.tmp_dir, "run.db"))
+        session.add_target(Target(connection=mock.MagicMock()))
+        session.connect(s_get("resume"))
+        session.monitor_results[1] = ["crash 1"]
+        for name in ("first", "second"):
+            session.session_filename = os.path.join(self.tmp_dir, name)
+            session.export_file(snapshot=True)
+
+            state = SessionCheckpoint(session.session_filename).load()
+            self.assertEqual(session.session_filename, state["session_filename"])
+            self.assertEqual({1: ["crash 1"]}, state["monitor_results"])
+        session._checkpoint.close()
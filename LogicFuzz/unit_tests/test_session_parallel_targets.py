@@ -0,0 +1,144 @@
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import threading
+import unittest
+import zlib
+
+import mock
+
+from boofuzz import (
+    blocks,
+    ifuzz_logger_backend,
+    s_block,
+    s_byte,
+    s_checksum,
+    s_get,
+    s_group,
+    s_initialize,
+    s_mirror,
+    s_string,
+    Session,
+    Target,
+)
+from boofuzz.connections import ITargetConnection
+
+
+class MockRecordingConnection(ITargetConnection):
+    def __init__(self):
+        self.sent = []
+        self.threads = set()
+
+    def close(self):
+        pass
+
+    def open(self):
+        pass
+
+    def recv(self, max_bytes):
+        return b""
+
+    def send(self, data):
+        self.sent.append(data)
+        self.threads.add(threading.current_thread().name)
+        return len(data)
+
+    @property
+    def info(self):
+        return "mock"
+
+
+class TestParallelTargets(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.logger = mock.MagicMock(spec=ifuzz_logger_backend.IFuzzLoggerBackend)
+        self.connections = [MockRecordingConnection() for _ in range(3)]
+
+        s_initialize("parallel")
+        s_group("opcode", values=[b"\x01", b"\x02", b"\x03", b"\x04"])
+        s_byte(0, name="payload")
+
+    def tearDown(self):
+        blocks.REQUESTS = {}
+        blocks.CURRENT = None
+        shutil.rmtree(self.tmp_dir)
+
+    def _session(self, request_name="parallel", **kwargs):
+        session = Session(
+            web_port=None,
+            fuzz_loggers=[self.logger],
+            db_filename=os.path.join(self.tmp_dir, "run.db"),
+            receive_data_after_fuzz=True,
+            **kwargs
+        )
+        for connection in self.connections:
+            session.add_target(Target(connection=connection))
+        session.connect(s_get(request_name))
+        return session
+
+    def test_test_cases_are_split_across_targets(self):
+        """
+        Given: A Session with three targets and parallel_targets enabled
+        When: Fuzzing one message with max_depth 1
+        Then: Every test case is sent exactly once, spread over all targets by separate worker threads.
+        """
+        session = self._session(parallel_targets=True)
+
+        session.fuzz(max_depth=1)
+
+        num_mutations = s_get("parallel").get_num_mutations()
+        self.assertEqual(num_mutations, session.num_cases_actually_fuzzed)
+        self.assertEqual(num_mutations, sum(len(c.sent) for c in self.connections))
+        self.assertEqual(num_mutations, self.logger.open_test_case.call_count)
+        self.assertEqual(num_mutations, self.logger.close_test_case.call_count)
+        for connection in self.connections:
+            self.assertGreater(len(connection.sent), 0)
+            self.assertEqual(1, len(connection.threads))
+        self.assertEqual(3, len(set.union(*(c.threads for c in self.connections))))
+
+    def test_checksum_over_mirror_renders_consistently(self):
+        """
+        Given: A Session with three parallel targets and a request with a checksum over a block with a mirror
+        When: Fuzzing the request while threads switch as often as possible
+        Then: Every payload holds the mirrored string twice and the checksum of the block.
+        """
+        s_initialize("checked")
+        s_checksum("body", algorithm="crc32", fuzzable=False, name="crc")
+        with s_block("body"):
+            s_string("abc", name="data", max_len=64)
+            s_mirror("data", name="copy")
+        session = self._session(request_name="checked", parallel_targets=True)
+
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            session.fuzz(max_depth=1)
+        finally:
+            sys.setswitchinterval(switch_interval)
+
+        payloads = [bytes(data) for c in self.connections for data in c.sent]
+        self.assertEqual(s_get("checked").get_num_mutations(), len(payloads))
+        for payload in payloads:
+            body = payload[4:]
+            self.assertEqual(body[: len(body) // 2], body[len(body) // 2 :])
+            self.assertEqual(struct.pack("<L", zlib.crc32(body)), payload[:4])
+
+    def test_first_target_only_by_default(self):
+        """
+        Given: A Session with three targets
+        When: Fuzzing without parallel_targets
+        Then: Only the first target receives test cases.
+        """
+        session = self._session()
+
+        session.fuzz(max_depth=1)
+
+        self.assertEqual(s_get("parallel").get_num_mutations(), len(self.connections[0].sent))
+        self.assertEqual([], self.connections[1].sent)
+        self.assertEqual([], self.connections[2].sent)
+
+
+if __name__ == "__main__":
+    unittest.main()
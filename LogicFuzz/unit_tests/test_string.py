@@ -203,6 +203,22 @@ class TestString(unittest.TestCase):
             ]
             self.assertEqual(0, len(list_of_duplicates))
 
+    def test_library_is_shared(self):
+        uut = self._given_string_max_len(max_len=128)
+        other = String(name="boofuzz-unit-test-other", default_value="xyz", max_len=128, encoding="utf-16-le")
+
+        self.assertIs(uut._get_library(), other._get_library())
+        self.assertIsNot(uut._get_library(), self._given_string_max_len(max_len=129)._get_library())
+        self.assertIs(uut.random_indices, other.random_indices)
+
+    def test_long_strings_are_built_on_demand(self):
+        uut = self._given_string()
+        library = uut._get_library()
+
+        self.assertTrue(all(isinstance(descriptor, tuple) for descriptor in library.long_strings))
+        self.assertEqual("\xff" * 1000000, library.build(("\xff", 1000000, None)))
+        self.assertEqual("DD\x00DD", library.build(("D", 5, 2)))
+
 
 if __name__ == "__main__":
     unittest.main()
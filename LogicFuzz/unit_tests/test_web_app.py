@@ -0,0 +1,60 @@
+import pytest
+
+from boofuzz import fuzz_logger_db
+from boofuzz.sessions import Session, SessionInfo
+from boofuzz.web import app as web_app
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    db_filename = str(tmp_path / "run.db")
+    logger = fuzz_logger_db.FuzzLoggerDb(db_filename=db_filename)
+    for index in range(1, 301):
+        node = "login" if index % 2 else "cmd"
+        name = "{0}:[{0}.field:{1}]".format(node, index)
+        logger.open_test_case("{0}: {1}".format(index, name), name=name, index=index)
+        if index % 3 == 0:
+            logger.log_fail("crash" if index % 2 else "timeout")
+        logger.close_test_case()
+    logger.close_test()
+    monkeypatch.setattr(web_app.app, "session", SessionInfo(db_filename=db_filename, pool_size=2))
+    return web_app.app.test_client()
+
+
+def test_failures_are_paginated(client):
+    first = client.get("/api/failures?limit=40").get_json()
+    second = client.get("/api/failures?limit=40&after={0}".format(first["next_after"])).get_json()
+    rest = client.get("/api/failures?limit=40&after=240").get_json()
+
+    assert [failure["index"] for failure in first["failures"]] == list(range(3, 121, 3))
+    assert first["next_after"] == 120
+    assert [failure["index"] for failure in second["failures"]] == list(range(123, 241, 3))
+    assert len(rest["failures"]) == 20 and rest["next_after"] is None
+
+
+def test_failures_are_filtered(client):
+    synopses = client.get("/api/failures/synopses?node=cmd").get_json()["synopses"]
+    timeouts = client.get("/api/failures?synopsis_hash={0}".format(synopses[0]["synopsis_hash"])).get_json()
+    elements = client.get("/api/failures?element=login.field&limit=1000").get_json()
+
+    assert [(synopsis["synopsis"], synopsis["count"]) for synopsis in synopses] == [("timeout", 50)]
+    assert [failure["index"] for failure in timeouts["failures"]] == list(range(6, 301, 6))
+    assert {failure["synopsis"] for failure in elements["failures"]} == {"crash"}
+    assert len(elements["failures"]) == 50
+
+
+def test_index_lists_first_failures_only(client):
+    page = client.get("/").get_data(as_text=True)
+
+    assert 'data-max-rows="{0}"'.format(web_app.CRASH_SUMMARY_LIMIT) in page
+    assert page.count('<span class="link">') == web_app.CRASH_SUMMARY_LIMIT
+
+
+def test_live_session_lists_failures_not_yet_in_database(tmp_path, monkeypatch):
+    session = Session(web_port=None, fuzz_loggers=[], db_filename=str(tmp_path / "live.db"))
+    session.monitor_results = {7: ["crash", "timeout"], 3: ["crash"]}
+    monkeypatch.setattr(web_app.app, "session", session)
+
+    crashes = web_app.app.test_client().get("/api/current-run").get_json()["session_info"]["crashes"]
+
+    assert [(crash["key"], crash["reasons"]) for crash in crashes] == [(3, ["crash"]), (7, ["crash", "timeout"])]
@@ -0,0 +1,108 @@
+import json
+
+import flask
+import mock
+import tornado.gen
+import tornado.tcpclient
+import tornado.testing
+
+from boofuzz import s_byte, s_get, s_initialize, Session, Target
+from boofuzz.web import event_stream
+
+
+def test_subscription_gets_changes_only():
+    bus = event_stream.EventBus()
+    bus.publish(current_index=1, current_test_case_name="a", is_paused=False)
+    subscription = bus.subscribe()
+
+    assert subscription.poll() == {
+        "session_info": {"current_index": 1, "current_test_case_name": "a", "is_paused": False, "crashes": []}
+    }
+    assert subscription.poll() is None
+
+    bus.publish(current_index=2, current_test_case_name="b")
+    bus.publish(current_index=3, is_paused=False)
+    bus.publish_failure(2, ["timeout"])
+
+    assert subscription.poll() == {
+        "session_info": {
+            "current_index": 3,
+            "current_test_case_name": "b",
+            "crashes": [{"key": 2, "reasons": ["timeout"]}],
+        }
+    }
+    bus.publish(current_index=3)
+    assert subscription.poll() is None
+    assert bus.subscribe().poll()["session_info"]["crashes"] == [{"key": 2, "reasons": ["timeout"]}]
+
+
+def test_failures_are_capped():
+    bus = event_stream.EventBus(max_failures=3)
+    for index in (5, 2, 9, 1, 7):
+        bus.publish_failure(index, ["crash"])
+
+    assert [crash["key"] for crash in bus.subscribe().poll()["session_info"]["crashes"]] == [2, 5, 9]
+    assert len(bus._failures) == 3
+    assert event_stream.EventBus().max_failures == event_stream.CRASH_SUMMARY_LIMIT
+
+
+class TestEventStreamHandler(tornado.testing.AsyncHTTPTestCase):
+    def get_app(self):
+        self.bus = event_stream.EventBus()
+        self.bus.publish(current_index=1)
+        flask_app = flask.Flask(__name__)
+        flask_app.add_url_rule("/hello", "hello", lambda: "hello")
+        return event_stream.make_application(flask_app, self.bus, interval=0.01)
+
+    @tornado.testing.gen_test
+    async def test_stream_events(self):
+        stream = await tornado.tcpclient.TCPClient().connect("127.0.0.1", self.get_http_port())
+        await stream.write(b"GET /api/events HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        headers = await stream.read_until(b"\r\n\r\n")
+        first = await stream.read_until(b"\n\n")
+        self.bus.publish(current_index=2)
+        self.bus.publish_failure(2, ["crash"])
+        second = await stream.read_until(b"\n\n")
+        stream.close()
+        await tornado.gen.sleep(0.05)  # let the handler notice
+
+        assert b"Content-Type: text/event-stream" in headers
+        assert [json.loads(event.split(b"data: ", 1)[1]) for event in (first, second)] == [
+            {"session_info": {"current_index": 1, "crashes": []}},
+            {"session_info": {"current_index": 2, "crashes": [{"key": 2, "reasons": ["crash"]}]}},
+        ]
+
+    def test_other_requests_go_to_flask(self):
+        response = self.fetch("/hello")
+
+        assert response.body == b"hello"
+
+
+def test_session_publishes_test_cases_and_failures(tmp_path):
+    s_initialize("event_stream")
+    s_byte(0, name="byte")
+    session = Session(
+        web_port=None,
+        fuzz_loggers=[],
+        db_filename=str(tmp_path / "run.db"),
+        restart_sleep_time=0,
+        post_test_case_callbacks=[lambda target, fuzz_data_logger, session, *args, **kwargs: _fail_case_3(session)],
+    )
+    session.add_target(Target(connection=mock.MagicMock()))
+    session.connect(s_get("event_stream"))
+    subscription = session.event_bus.subscribe()
+
+    session.fuzz(max_depth=1)
+
+    session_info = subscription.poll()["session_info"]
+    assert session_info["current_index"] == s_get("event_stream").get_num_mutations()
+    assert session_info["current_element"] == "event_stream"
+    assert session_info["is_paused"] is False
+    assert session_info["crashes"] == [{"key": 3, "reasons": ["failure 3"]}]
+    session.is_paused = True
+    assert subscription.poll()["session_info"] == {"is_paused": True, "crashes": []}
+
+
+def _fail_case_3(session):
+    if session.total_mutant_index == 3:
+        session._fuzz_data_logger.log_fail("failure 3")
@@ -0,0 +1,139 @@
+import collections
+import itertools
+import struct
+import threading
+
+PCAP_MAGIC = 0xA1B2C3D4
+PCAP_VERSION = (2, 4)
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_GLOBAL_HEADER = struct.Struct("<IHHiIII")
+_RECORD_HEADER = struct.Struct("<IIII")
+
+_Packet = collections.namedtuple("_Packet", "test_number ts_sec ts_usec data length")
+
+
+class PacketRingBuffer:
+    """
+    In-memory ring buffer of captured packets, each tagged with the test case it was captured in.
+
+    A capture thread appends packets while the network monitor marks test case boundaries. Once the buffer holds more
+    than max_bytes of packet data, the oldest packets are dropped. The packets of a test case can be taken out as a
+    pcap file.
+
+    Packets captured after a test case until the next one starts are tagged with the test case before, as they are
+    typically late replies to it.
+
+    libpcap hands packets over in batches, up to its read timeout after they were sent. The capture thread calls
+    end_dispatch after each batch, so wait_for_capture can wait until the packets sent so far are in the buffer.
+
+    Args:
+        linktype (int): Link-layer header type of the capture, e.g. pcapy.DLT_EN10MB.
+        snaplen (int): Maximum length of a captured packet.
+        max_bytes (int): Maximum packet data kept. Default 64 MiB.
+    """
+
+    def __init__(self, linktype, snaplen, max_bytes=DEFAULT_MAX_BYTES):
+        self.linktype = linktype
+        self.snaplen = snaplen
+        self.max_bytes = max_bytes
+        self.test_number = None
+        self.num_bytes = 0
+        self.num_dropped = 0
+        self._packets = collections.deque()
+        self._case_bytes = collections.Counter()
+        self._lock = threading.Lock()
+        self._dispatches = 0
+        self._dispatched = threading.Condition(self._lock)
+
+    def start_test_case(self, test_number):
+        """Tag the packets captured from now on with test_number."""
+        with self._lock:
+            if self._case_bytes.get(self.test_number) == 0:
+                del self._case_bytes[self.test_number]
+            self.test_number = test_number
+            self._case_bytes[test_number] = 0
+
+    def append(self, ts_sec, ts_usec, data, length=None):
+        """
+        Add a captured packet.
+
+        Args:
+            ts_sec (int): Capture timestamp, seconds.
+            ts_usec (int): Capture timestamp, microseconds.
+            data (bytes): Captured bytes.
+            length (int): Length of the packet on the wire. Default len(data).
+        """
+        with self._lock:
+            test_number = self.test_number
+            self._packets.append(_Packet(test_number, ts_sec, ts_usec, data, len(data) if length is None else length))
+            self._case_bytes[test_number] += len(data)
+            self.num_bytes += len(data)
+            while self.num_bytes > self.max_bytes:
+                dropped = self._packets.popleft()
+                self.num_bytes -= len(dropped.data)
+                self.num_dropped += 1
+                self._case_bytes[dropped.test_number] -= len(dropped.data)
+                if dropped.test_number != self.test_number and self._case_bytes[dropped.test_number] <= 0:
+                    del self._case_bytes[dropped.test_number]
+
+    def end_dispatch(self):
+        """Called by the capture thread after it handed over a batch of packets."""
+        with self._lock:
+            self._dispatches += 1
+            self._dispatched.notify_all()
+
+    def wait_for_capture(self, timeout):
+        """
+        Wait until the capture thread ends the batch it is capturing now.
+
+        Args:
+            timeout (float): Seconds to wait at most.
+
+        Returns:
+            bool: False if the batch did not end in time.
+        """
+        with self._lock:
+            dispatches = self._dispatches
+            return self._dispatched.wait_for(lambda: self._dispatches > dispatches, timeout)
+
+    def case_bytes(self, test_number):
+        """Number of bytes captured in test case test_number that are still buffered."""
+        with self._lock:
+            return self._case_bytes.get(test_number, 0)
+
+    def pcap_chunks(self, test_number):
+        """
+        Generate the pcap file of the buffered packets of test case test_number, one packet after another.
+
+        The packets are looked up at once, later ones are not included.
+        """
+        with self._lock:
+            if test_number == self.test_number:
+                # The packets of a test case are contiguous, so the current one only needs the tail of the buffer.
+                packets = list(
+                    itertools.takewhile(lambda packet: packet.test_number == test_number, reversed(self._packets))
+                )
+                packets.reverse()
+            else:
+                packets = [packet for packet in self._packets if packet.test_number == test_number]
+        return self._pcap_chunks(packets)
+
+    def write_pcap(self, test_number, filename):
+        """
+        Write the pcap file of the buffered packets of test case test_number.
+
+        Returns:
+            int: Number of packets written.
+        """
+        num_packets = 0
+        with open(filename, "wb") as f:
+            for chunk in self.pcap_chunks(test_number):
+                f.write(chunk)
+                num_packets += 1
+        return num_packets - 1
+
+    def _pcap_chunks(self, packets):
+        yield _GLOBAL_HEADER.pack(PCAP_MAGIC, PCAP_VERSION[0], PCAP_VERSION[1], 0, 0, self.snaplen, self.linktype)
+        for packet in packets:
+            yield _RECORD_HEADER.pack(packet.ts_sec, packet.ts_usec, len(packet.data), packet.length) + packet.data
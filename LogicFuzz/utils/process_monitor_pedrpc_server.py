@@ -30,7 +30,16 @@ def _split_command_if_str(command):
 
 class ProcessMonitorPedrpcServer(pedrpc.Server):
     def __init__(
-        self, host, port, crash_filename, debugger_class, proc_name=None, pid_to_ignore=None, level=1, coredump_dir=None
+        self,
+        host,
+        port,
+        crash_filename,
+        debugger_class,
+        proc_name=None,
+        pid_to_ignore=None,
+        level=1,
+        coredump_dir=None,
+        codec="pickle",
     ):
         """
         @type  host:           str
@@ -45,10 +54,12 @@ class ProcessMonitorPedrpcServer(pedrpc.Server):
         @param pid_to_ignore:  (Optional, def=None) Ignore this PID when searching for the target process
         @type  level:          int
         @param level:          (Optional, def=1) Log output level, increase for more verbosity
+        @type  codec:          str
+        @param codec:          (Optional, def="pickle") PED-RPC codec, "pickle" or "struct"
         """
 
         # initialize the PED-RPC server.
-        pedrpc.Server.__init__(self, host, port)
+        pedrpc.Server.__init__(self, host, port, codec=codec)
 
         self.crash_filename = os.path.abspath(crash_filename)
         self.debugger_class = debugger_class
@@ -7,6 +7,8 @@ from flask import Flask, redirect, render_template
 from .. import exception
 
 MAX_LOG_LINE_LEN = 1500
+CRASH_SUMMARY_LIMIT = 100  # failures listed on the index page, api/failures pages through all of them
+MAX_FAILURES_PAGE_SIZE = 1000
 
 prefix = os.environ.get("FLASK_APP_PREFIX", "")
 
@@ -65,6 +67,30 @@ def _get_log_data(test_case_id):
     return results
 
 
+@app.route(f"{prefix}/api/failures")
+def api_failures():
+    """Page of failed test cases. Pass the returned next_after as after to get the next page."""
+    args = flask.request.args
+    limit = min(args.get("limit", CRASH_SUMMARY_LIMIT, type=int), MAX_FAILURES_PAGE_SIZE)
+    failures = app.session.failures(
+        after=args.get("after", 0, type=int),
+        limit=limit,
+        node=args.get("node"),
+        element=args.get("element"),
+        synopsis_hash=args.get("synopsis_hash"),
+        since=args.get("since", type=float),
+        until=args.get("until", type=float),
+    )
+    next_after = failures[-1]["index"] if len(failures) == limit else None
+    return flask.jsonify({"failures": failures, "next_after": next_after})
+
+
+@app.route(f"{prefix}/api/failures/synopses")
+def api_failure_synopses():
+    args = flask.request.args
+    return flask.jsonify({"synopses": app.session.failure_synopses(node=args.get("node"), element=args.get("element"))})
+
+
 @app.route(f"{prefix}/api/current-run")
 def index_update():
     data = {
@@ -142,15 +168,12 @@ def index():
         "total_num_mutations": commify(int(total_num_mutations)) if total_num_mutations is not None else None,
     }
 
-    return render_template("index.html", state=state, crashes=crashes)
+    return render_template("index.html", state=state, crashes=crashes, crash_summary_limit=CRASH_SUMMARY_LIMIT)
 
 
 def _crash_summary_info():
     crashes = []
-    procmon_result_keys = list(app.session.monitor_results)
-    procmon_result_keys.sort()
-    for key in procmon_result_keys:
-        val = app.session.monitor_results[key]
+    for key, val in app.session.crash_summary(limit=CRASH_SUMMARY_LIMIT):
         status_bytes = "&nbsp;"
 
         if key in app.session.monitor_data:
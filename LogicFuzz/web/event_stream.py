@@ -0,0 +1,147 @@
+import itertools
+import json
+import operator
+
+import tornado.iostream
+import tornado.web
+from tornado import gen
+from tornado.wsgi import WSGIContainer
+
+from .app import CRASH_SUMMARY_LIMIT, prefix
+
+DEFAULT_STREAM_INTERVAL = 0.1  # seconds between two checks for changes, per connected browser
+
+
+class EventBus:
+    """In-memory state of the running session that the web interface streams to browsers.
+
+    The fuzzing thread publishes the counters of each test case and each new failure. Publishing updates a dict or
+    appends to a list, without locks and without waking anybody up, so the cost for the fuzzing thread does not depend
+    on the number of connected browsers. Each subscriber polls the bus at its own pace and gets the fields that
+    changed since its last poll.
+
+    Like the failures table of the index page, the bus keeps the first max_failures failures only.
+
+    Args:
+        max_failures (int): Failures kept. Default CRASH_SUMMARY_LIMIT.
+    """
+
+    def __init__(self, max_failures=CRASH_SUMMARY_LIMIT):
+        self.max_failures = max_failures
+        self._state = {}
+        self._failures = []
+        self._versions = itertools.count(1)
+        self.version = 0
+
+    def publish(self, **fields):
+        """Update the given session info fields, e.g. ``current_index=12``."""
+        self._state.update(fields)
+        self.version = next(self._versions)
+
+    def publish_failure(self, index, reasons):
+        """Add a failed test case, unless the bus already holds max_failures.
+
+        Args:
+            index (int): Test case index.
+            reasons (list of str): Failure descriptions.
+        """
+        if len(self._failures) >= self.max_failures:
+            return
+        self._failures.append({"key": index, "reasons": list(reasons)})
+        self.version = next(self._versions)
+
+    def subscribe(self):
+        """Subscribe to the changes of the bus.
+
+        Returns:
+            EventBusSubscription: New subscription, whose first poll returns the complete state.
+        """
+        return EventBusSubscription(self)
+
+
+class EventBusSubscription:
+    """Tracks what one subscriber of an EventBus has seen. Use :meth:`EventBus.subscribe` to create one."""
+
+    def __init__(self, event_bus):
+        self._event_bus = event_bus
+        self._version = None
+        self._state = {}
+        self._num_failures = 0
+
+    def poll(self):
+        """Return the changes since the last poll.
+
+        Returns:
+            dict: Like the response of ``api/current-run``, but ``session_info`` only holds the fields that changed and
+            its ``crashes`` only the new failures. None if nothing changed.
+        """
+        version = self._event_bus.version
+        if version == self._version:
+            return None
+        self._version = version
+        # copies of a dict and a slice of a list are taken atomically, so there is no need to lock out the publisher
+        state = dict(self._event_bus._state)
+        failures = self._event_bus._failures[self._num_failures :]
+        if self._num_failures == 0:
+            # parallel targets may publish failures out of order, list them by index like Session.crash_summary
+            failures.sort(key=operator.itemgetter("key"))
+        changed = {key: value for key, value in state.items() if key not in self._state or self._state[key] != value}
+        self._state = state
+        self._num_failures += len(failures)
+        if not changed and not failures:
+            return None
+        changed["crashes"] = failures
+        return {"session_info": changed}
+
+
+class EventStreamHandler(tornado.web.RequestHandler):
+    """Streams the changes of an EventBus as server-sent events, one JSON object per event."""
+
+    def initialize(self, event_bus, interval=DEFAULT_STREAM_INTERVAL):
+        self._event_bus = event_bus
+        self._interval = interval
+        self._closed = False
+
+    def on_connection_close(self):
+        self._closed = True
+
+    async def get(self):
+        self.set_header("Content-Type", "text/event-stream")
+        self.set_header("Cache-Control", "no-cache")
+        subscription = self._event_bus.subscribe()
+        while not self._closed:
+            changes = subscription.poll()
+            if changes is not None:
+                self.write("data: {0}\n\n".format(json.dumps(changes)))
+                try:
+                    await self.flush()
+                except tornado.iostream.StreamClosedError:
+                    break
+            await gen.sleep(self._interval)
+
+
+def make_application(flask_app, event_bus, interval=DEFAULT_STREAM_INTERVAL, executor=None):
+    """Build the tornado application of the web interface.
+
+    ``api/events`` streams the changes of event_bus, every other request is passed on to flask_app. Streaming needs a
+    tornado handler, as tornado's WSGIContainer buffers a response until it is complete.
+
+    Args:
+        flask_app (flask.Flask): Application serving the pages and the polling API.
+        event_bus (EventBus): Bus of the session.
+        interval (float): Seconds between two checks for changes. Default 0.1.
+        executor (concurrent.futures.Executor): Executor to run flask_app on. Default None (the IOLoop thread).
+
+    Returns:
+        tornado.web.Application: Application for a tornado HTTPServer.
+    """
+    if executor is not None:
+        wsgi_container = WSGIContainer(flask_app, executor=executor)
+    else:
+        wsgi_container = WSGIContainer(flask_app)
+    return tornado.web.Application(
+        [
+            (prefix + "/api/events", EventStreamHandler, {"event_bus": event_bus, "interval": interval}),
+            (r".*", tornado.web.FallbackHandler, {"fallback": wsgi_container}),
+        ]
+    )
@@ -10,19 +10,35 @@ const StringUtilities = {
     }
 };
 
+let current_run_info = {};
+
+function format_count(count) {
+    return count == null ? '' : count.toLocaleString();
+}
+
 function update_current_run_info(response) {
-    document.getElementById('current_index').textContent = response.session_info.current_index.toLocaleString();
-    document.getElementById('num_mutations').textContent = (response.session_info.num_mutations || "many").toLocaleString();
-    document.getElementById('current_index_element').textContent = response.session_info.current_index_element.toLocaleString();
-    document.getElementById('num_mutations_element').textContent = response.session_info.num_mutations_element.toLocaleString();
-    document.getElementById('current_element').textContent = response.session_info.current_element + ":";
-    document.getElementById('current_test_case_name').textContent = response.session_info.current_test_case_name;
-    document.getElementById('exec_speed').textContent = response.session_info.exec_speed.toFixed(1) + "/sec";
-    document.getElementById('run_time').textContent = response.session_info.runtime.toFixed(0) + " sec";
-
-
-    if (response.session_info.num_mutations != null) {
-        let fraction_complete_total = response.session_info.current_index / response.session_info.num_mutations;
+    // the event stream only sends the fields that changed
+    Object.assign(current_run_info, response.session_info);
+    let info = current_run_info;
+    if ('current_index' in info) {
+        document.getElementById('current_index').textContent = format_count(info.current_index);
+        document.getElementById('num_mutations').textContent = (info.num_mutations || "many").toLocaleString();
+    }
+    if ('current_index_element' in info) {
+        document.getElementById('current_index_element').textContent = format_count(info.current_index_element);
+        document.getElementById('num_mutations_element').textContent = format_count(info.num_mutations_element);
+        document.getElementById('current_element').textContent = info.current_element + ":";
+    }
+    if ('current_test_case_name' in info) {
+        document.getElementById('current_test_case_name').textContent = info.current_test_case_name;
+    }
+    if ('runtime' in info) {
+        document.getElementById('exec_speed').textContent = info.exec_speed.toFixed(1) + "/sec";
+        document.getElementById('run_time').textContent = info.runtime.toFixed(0) + " sec";
+    }
+
+    if (info.num_mutations != null) {
+        let fraction_complete_total = info.current_index / info.num_mutations;
         document.getElementById('progress_percentage_total').textContent = progress_percentage(fraction_complete_total);
         document.getElementById('progress_bar_total').textContent = progress_bars(fraction_complete_total);
     }
@@ -31,26 +47,31 @@ function update_current_run_info(response) {
         document.getElementById('progress_bar_total').textContent = "";
     }
 
-    let fraction_complete_element = response.session_info.current_index_element / response.session_info.num_mutations_element;
-    document.getElementById('progress_percentage_element').textContent = progress_percentage(fraction_complete_element);
-    document.getElementById('progress_bar_element').textContent = progress_bars(fraction_complete_element);
-
-    if (response.session_info.is_paused){
-        document.getElementById('is_paused_indicator').textContent = 'paused';
-        document.getElementById('is_paused_indicator').className = 'paused';
+    if (info.num_mutations_element != null) {
+        let fraction_complete_element = info.current_index_element / info.num_mutations_element;
+        document.getElementById('progress_percentage_element').textContent = progress_percentage(fraction_complete_element);
+        document.getElementById('progress_bar_element').textContent = progress_bars(fraction_complete_element);
     }
-    else {
-        document.getElementById('is_paused_indicator').textContent = 'running';
-        document.getElementById('is_paused_indicator').className = 'running';
 
+    if ('is_paused' in info) {
+        if (info.is_paused) {
+            document.getElementById('is_paused_indicator').textContent = 'paused';
+            document.getElementById('is_paused_indicator').className = 'paused';
+        }
+        else {
+            document.getElementById('is_paused_indicator').textContent = 'running';
+            document.getElementById('is_paused_indicator').className = 'running';
+        }
     }
 
     if (response.session_info.crashes.length > 0) {
         let failures_table = document.getElementById('crash-summary-table');
+        // the table lists the first failures only, api/failures pages through all of them
+        let max_rows = Number(failures_table.dataset.maxRows) + 1;
 
         for (let i = 0; i < response.session_info.crashes.length; i++) {
             let key = response.session_info.crashes[i].key;
-            if (!(key in failure_map))
+            if (!(key in failure_map) && failures_table.rows.length < max_rows)
             {
                 let reasons = response.session_info.crashes[i].reasons;
                 failure_map[key] = reasons;
@@ -122,6 +143,18 @@ function update_current_test_case_log(response) {
     test_cases_table.appendChild(new_entries);
 }
 
+function stream_current_run_info()
+{
+    if (!window.EventSource) {
+        continually_update_current_run_info();
+        return;
+    }
+    let events = new EventSource('api/events');
+    events.onmessage = function (event) {
+        update_current_run_info(JSON.parse(event.data));
+    };
+}
+
 function continually_update_current_run_info()
 {
     function update_repeat(response)
@@ -183,7 +216,7 @@ function progress_percentage(fraction){
 
 function start_live_update() {
     initialize_state();
-    continually_update_current_run_info();
+    stream_current_run_info();
     continually_update_current_test_case_log();
 }
 